@@ -0,0 +1,235 @@
+"""Micro-benchmarks for the page objects and the Excel reporter.
+
+Every operation is timed *repeat* times against the local fixture site
+(see :mod:`benchmarks.fixture_site`) for each job-list size. The median,
+min and max go to a JSON file. If a stored baseline exists, the run fails
+(exit code 1) when an operation's median is more than *threshold* times
+its baseline median::
+
+    python -m benchmarks.bench_page_objects --sizes 10,1000,10000
+    python -m benchmarks.bench_page_objects --save-baseline
+    python -m benchmarks.bench_page_objects --no-browser   # reporter only
+
+The large-report benchmark also stores the peak Python memory (tracemalloc)
+of one extra run as ``peak_mb``; the budget for 50,000 rows is stated in
+:class:`excel_reporter.LargeExcelReporter`::
+
+    python -m benchmarks.bench_page_objects --no-browser --sizes 50000 --repeat 1
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.fixture_site import serve_site
+from excel_reporter import ExcelReporter
+
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Slowdowns smaller than this are treated as noise, whatever the ratio.
+MIN_DELTA = 0.005
+
+
+def timed(fn, repeat, setup=None):
+    """Run *fn* *repeat* times (after *setup*, untimed) and return the durations."""
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def summary(runs):
+    return {
+        "median": statistics.median(runs),
+        "min": min(runs),
+        "max": max(runs),
+        "runs": len(runs),
+    }
+
+
+def bench_reporter(sizes, repeat):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.xlsx")
+        for size in sizes:
+            steps = [f"Step {i}" for i in range(1, size + 1)]
+            state = {}
+
+            def fresh():
+                state["report"] = ExcelReporter(path)
+
+            def filled():
+                fresh()
+                state["report"].add_steps(steps)
+
+            def pass_all():
+                for i in range(1, size + 1):
+                    state["report"].pass_step(i, "ok")
+
+            results[f"ExcelReporter.add_steps@{size}"] = summary(
+                timed(lambda: state["report"].add_steps(steps), repeat, fresh)
+            )
+            results[f"ExcelReporter.pass_step@{size}"] = summary(
+                timed(pass_all, repeat, filled)
+            )
+    return results
+
+
+def step_events(size, per_test=50):
+    """Result log events of *size* steps, in tests of *per_test* steps over 10 classes."""
+    events = []
+    for t in range(0, size, per_test):
+        test = f"tests/test_bench.py::TestClass{t // per_test % 10}::test_{t}"
+        steps = [f"Step {i}" for i in range(1, min(per_test, size - t) + 1)]
+        events.append({"event": "steps", "test": test, "steps": steps})
+        for i in range(1, len(steps) + 1):
+            events.append({
+                "event": "step", "test": test, "step": i, "status": "PASSED",
+                "details": "ok", "time": "10:00:00", "duration": 0.1, "commands": 3,
+                "command_time": 0.05, "waits": 1, "wait_polls": 2, "wait_time": 0.02,
+            })
+    return events
+
+
+def bench_large_report(sizes, repeat):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench_large.xlsx")
+        for size in sizes:
+            events = step_events(size)
+
+            def render():
+                ExcelReporter.from_events(events, path, large=True).save()
+
+            result = summary(timed(render, repeat))
+            tracemalloc.start()
+            render()
+            result["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+            tracemalloc.stop()
+            results[f"LargeExcelReporter.render@{size}"] = result
+    return results
+
+
+def bench_browser(sizes, repeat, per_element_limit):
+    from driver_factory import ChromeFactory
+    from pages.home_page import HomePage
+    from pages.open_positions_page import OpenPositionsPage
+
+    results = {}
+    factory = ChromeFactory()
+    driver = factory()
+    try:
+        with serve_site(jobs=10) as site:
+            home = HomePage(driver)
+            home.open(site.url("home"))
+            results["BasePage.find"] = summary(
+                timed(lambda: home.find(home.NAVBAR), repeat)
+            )
+            results["BasePage.click"] = summary(
+                timed(lambda: home.click(home.HERO_SECTION), repeat)
+            )
+
+        for size in sizes:
+            with serve_site(jobs=size) as site:
+                page = OpenPositionsPage(driver)
+                page.open(site.url("open_positions"))
+                page.get_visible_jobs_data()
+                results[f"OpenPositionsPage.get_visible_jobs_data@{size}"] = summary(
+                    timed(page.get_visible_jobs_data, repeat)
+                )
+                results[f"OpenPositionsPage._collect_jobs_via_js@{size}"] = summary(
+                    timed(page._collect_jobs_via_js, repeat)
+                )
+                results[f"OpenPositionsPage._wait_for_dom_settle@{size}"] = summary(
+                    timed(page._wait_for_dom_settle, repeat)
+                )
+                if size <= per_element_limit:
+                    results[f"OpenPositionsPage.get_visible_jobs_data[per-element]@{size}"] = summary(
+                        timed(lambda: page.get_visible_jobs_data(batched=False), repeat)
+                    )
+    finally:
+        driver.quit()
+        factory.cleanup()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return ``[(name, median, baseline_median, ratio)]`` for regressed operations."""
+    regressions = []
+    for name, result in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = result["median"] / base["median"] if base["median"] else float("inf")
+        if ratio > threshold and result["median"] - base["median"] > MIN_DELTA:
+            regressions.append((name, result["median"], base["median"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,100,1000,10000",
+                        help="comma-separated job list sizes (default: 10,100,1000,10000)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="fail when median > threshold x baseline (default: 1.25)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store this run as the new baseline instead of comparing")
+    parser.add_argument("--no-browser", action="store_true",
+                        help="only run the ExcelReporter benchmarks")
+    parser.add_argument("--per-element-limit", type=int, default=1000,
+                        help="largest size the per-element Selenium path is timed at")
+    parser.add_argument("--reporter-limit", type=int, default=10000,
+                        help="largest step count the ExcelReporter is timed at")
+    args = parser.parse_args(argv)
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    results = bench_reporter([s for s in sizes if s <= args.reporter_limit], args.repeat)
+    results.update(bench_large_report(sizes, args.repeat))
+    if not args.no_browser:
+        results.update(bench_browser(sizes, args.repeat, args.per_element_limit))
+
+    output = {
+        "meta": {
+            "sizes": sizes,
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(output, fh, indent=2)
+    for name, result in sorted(results.items()):
+        print(f"{name:<65} median {result['median'] * 1000:10.2f} ms")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("no baseline to compare against; run with --save-baseline first")
+        return 0
+    with open(args.baseline, encoding="utf-8") as fh:
+        regressions = compare(results, json.load(fh), args.threshold)
+    for name, median, base, ratio in regressions:
+        print(f"REGRESSION {name}: {median * 1000:.2f} ms vs {base * 1000:.2f} ms ({ratio:.2f}x)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
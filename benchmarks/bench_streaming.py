@@ -0,0 +1,117 @@
+"""Streaming vs. all-at-once job extraction on a very large listing.
+
+Serves the fixture open positions page with *jobs* cards (10,000 by
+default), lazily rendered in batches of *page_size*, with one planted bad
+location at *bad_at*. Both extraction paths then validate every record
+until the first violation:
+
+* ``full``: render every batch, read all cards with
+  ``get_visible_jobs_data``, then validate the list;
+* ``stream``: validate the records from ``iter_jobs`` as they arrive and
+  stop at the bad one.
+
+For each path, the run prints the time to the first failure, the records
+read, the peak Python memory (tracemalloc) and the page's JS heap::
+
+    python -m benchmarks.bench_streaming --jobs 20000 --bad-at 1500
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from benchmarks.fixture_site import LOCATIONS, serve_site
+
+
+def _first_violation(jobs):
+    for count, job in enumerate(jobs, 1):
+        if job["location"] not in LOCATIONS:
+            return count
+    return None
+
+
+def _js_heap(driver):
+    return driver.execute_script(
+        "return performance.memory ? performance.memory.usedJSHeapSize : null;"
+    )
+
+
+def run_full(page):
+    rendered = page.count_visible(page.JOB_ITEM)
+    while page._load_more_jobs(rendered, timeout=2):
+        rendered = page.count_visible(page.JOB_ITEM)
+    jobs = page.get_visible_jobs_data()
+    return _first_violation(jobs), len(jobs)
+
+
+def run_stream(page, chunk_size):
+    read = 0
+
+    def counted():
+        nonlocal read
+        for job in page.iter_jobs(chunk_size=chunk_size, timeout=2):
+            read += 1
+            yield job
+
+    return _first_violation(counted()), read
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    failed_at, read = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "time_to_first_failure": round(elapsed, 3),
+        "failed_at": failed_at,
+        "records_read": read,
+        "peak_python_kb": round(peak / 1024, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--bad-at", type=int, default=2500,
+                        help="index of the planted violation (default: 2500)")
+    parser.add_argument("--chunk-size", type=int, default=200)
+    parser.add_argument("--output", default=None, help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    from driver_factory import ChromeFactory
+    from pages.open_positions_page import OpenPositionsPage
+
+    factory = ChromeFactory()
+    driver = factory()
+    results = {}
+    try:
+        with serve_site(jobs=args.jobs, page_size=args.page_size, bad_at=args.bad_at) as site:
+            for name, fn in (
+                ("full", run_full),
+                ("stream", lambda page: run_stream(page, args.chunk_size)),
+            ):
+                page = OpenPositionsPage(driver)
+                page.open(site.url("open_positions"))
+                page._wait_for_dom_settle()
+                results[name] = measure(lambda: fn(page))
+                results[name]["js_heap_kb"] = round((_js_heap(driver) or 0) / 1024, 1)
+    finally:
+        driver.quit()
+        factory.cleanup()
+
+    for name, r in results.items():
+        print(
+            f"{name:>6}: first failure at #{r['failed_at']} after "
+            f"{r['time_to_first_failure']:.2f}s, {r['records_read']} record(s) read, "
+            f"peak {r['peak_python_kb']:.0f} KB Python / {r['js_heap_kb']:.0f} KB JS heap"
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
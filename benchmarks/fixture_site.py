@@ -0,0 +1,156 @@
+"""Synthetic local copies of the home, careers QA and open positions pages.
+
+The markup uses the same ids and classes as insiderone.com, so the page
+objects' locators work against it unchanged. The open positions page
+renders its cards from an embedded job list, and re-renders them a moment
+after a filter changes, just like the live site does. With *page_size*, only
+that many cards are rendered at first. The next batch is appended when the
+"Load more" button is clicked or the page is scrolled to the bottom::
+
+    with serve_site(jobs=10000, page_size=500) as site:
+        page.open(site.url("open_positions"))
+"""
+import json
+import random
+from contextlib import contextmanager
+
+from local_server import serve
+
+
+PATHS = {
+    "home": "/",
+    "careers": "/careers/quality-assurance/",
+    "open_positions": "/careers/open-positions/",
+}
+
+LOCATIONS = ["Istanbul, Turkiye", "London, United Kingdom", "New York, US", "Remote"]
+DEPARTMENTS = ["Quality Assurance", "Engineering", "Sales", "Marketing"]
+
+HOME_HTML = """<!doctype html>
+<html><head><title>Insider - Fixture Home</title></head><body>
+<nav id="navigation"><a href="/careers/quality-assurance/">Careers</a></nav>
+<section class="homepage-hero"><h1>Insider</h1></section>
+<div id="cookie-law-info-bar"><a id="wt-cli-accept-all-btn" href="#"
+  onclick="this.parentNode.style.display='none';return false;">Accept All</a></div>
+<footer>Footer</footer>
+</body></html>"""
+
+CAREERS_HTML = """<!doctype html>
+<html><head><title>Insider Careers - Quality Assurance</title></head><body>
+<section style="margin-top:1500px">
+  <a class="btn" href="/careers/open-positions/?department=qualityassurance">See all QA jobs</a>
+</section>
+</body></html>"""
+
+OPEN_POSITIONS_HTML = """<!doctype html>
+<html><head><title>Insider Open Positions</title></head><body>
+<select id="filter-by-location"><option value="All">All</option>%(locations)s</select>
+<select id="filter-by-department"><option value="All">All</option>%(departments)s</select>
+<div id="jobs-list"></div>
+<button class="load-more" style="display:none">Load more</button>
+<script>
+var JOBS = %(jobs)s;
+var RENDER_DELAY = %(delay)d;
+var PAGE_SIZE = %(page_size)d;
+var matching = [], shown = 0, loading = false;
+function card(job) {
+  return '<div class="position-list-item"><p class="position-title">' + job.position +
+    '</p><span class="position-department">' + job.department +
+    '</span><div class="position-location">' + job.location +
+    '</div><a class="btn" href="' + job.url + '" target="_blank">View Role</a></div>';
+}
+function showMore() {
+  var next = PAGE_SIZE ? Math.min(shown + PAGE_SIZE, matching.length) : matching.length;
+  document.getElementById('jobs-list').insertAdjacentHTML(
+    'beforeend', matching.slice(shown, next).map(card).join(''));
+  shown = next;
+  loading = false;
+  document.querySelector('.load-more').style.display = shown < matching.length ? '' : 'none';
+}
+function render() {
+  var loc = document.getElementById('filter-by-location').value;
+  var dept = document.getElementById('filter-by-department').value;
+  matching = JOBS.filter(function (job) {
+    return (loc === 'All' || job.location === loc) && (dept === 'All' || job.department === dept);
+  });
+  document.getElementById('jobs-list').innerHTML = '';
+  shown = 0;
+  showMore();
+}
+function requestMore() {
+  if (loading || shown >= matching.length) return;
+  loading = true;
+  setTimeout(showMore, RENDER_DELAY);
+}
+['filter-by-location', 'filter-by-department'].forEach(function (id) {
+  document.getElementById(id).addEventListener('change', function () {
+    setTimeout(render, RENDER_DELAY);
+  });
+});
+document.querySelector('.load-more').addEventListener('click', requestMore);
+window.addEventListener('scroll', function () {
+  if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 200) requestMore();
+});
+setTimeout(render, RENDER_DELAY);
+</script>
+</body></html>"""
+
+
+def make_jobs(count, seed=1, bad_at=None):
+    """*count* deterministic fake postings spread over all filter values.
+
+    With *bad_at*, the posting at that index gets a location outside
+    ``LOCATIONS``, a planted violation for validation tests.
+    """
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(count):
+        department = DEPARTMENTS[i % len(DEPARTMENTS)]
+        title = "QA Engineer" if department == "Quality Assurance" else f"{department} Specialist"
+        jobs.append({
+            "position": f"{title} {i}",
+            "department": department,
+            "location": rng.choice(LOCATIONS),
+            "url": f"https://jobs.lever.co/insiderone/{i:08d}",
+        })
+    if bad_at is not None:
+        jobs[bad_at]["location"] = "Atlantis"
+    return jobs
+
+
+def _options(values):
+    return "".join(f'<option value="{v}">{v}</option>' for v in values)
+
+
+def open_positions_html(jobs, render_delay_ms=50, page_size=0):
+    return OPEN_POSITIONS_HTML % {
+        "locations": _options(LOCATIONS),
+        "departments": _options(DEPARTMENTS),
+        "jobs": json.dumps(jobs),
+        "delay": render_delay_ms,
+        "page_size": page_size,
+    }
+
+
+class FixtureSite:
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+    def url(self, page):
+        return self.base_url + PATHS[page]
+
+
+@contextmanager
+def serve_site(jobs=100, render_delay_ms=50, page_size=0, bad_at=None):
+    """Serve the three fixture pages with *jobs* cards on the listing page.
+
+    *page_size* > 0 turns on lazy loading in batches of that size.
+    """
+    listing = open_positions_html(make_jobs(jobs, bad_at=bad_at), render_delay_ms, page_size)
+    routes = {
+        PATHS["home"]: ("text/html", HOME_HTML),
+        PATHS["careers"]: ("text/html", CAREERS_HTML),
+        PATHS["open_positions"]: ("text/html", listing),
+    }
+    with serve(routes) as base_url:
+        yield FixtureSite(base_url)
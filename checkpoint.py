@@ -0,0 +1,192 @@
+"""Checkpoint-and-resume for long step-by-step workflows.
+
+A workflow test is split into phases that end at page transitions. After
+each phase, :class:`CheckpointedFlow` saves a checkpoint to disk. The
+checkpoint holds the browser state (URL, cookies, local and session
+storage), the workflow's own state (e.g. the selected filters) and the
+step events recorded so far.
+
+When a phase fails, the flow can resume from the last good checkpoint
+instead of step 1:
+
+* in the same run, with ``--checkpoint-retries N``: the checkpoint is
+  restored into the same pooled browser and the failed phase reruns;
+* in a later run, with ``--resume``: a fresh browser gets the
+  checkpoint, the earlier step results are replayed into the report
+  (marked ``restored``), and the flow continues with the failing tail.
+
+A checkpoint is deleted once its test completes.
+"""
+import json
+import os
+import re
+
+from selenium.common.exceptions import WebDriverException
+
+from result_log import StepFailed
+
+
+def capture_browser_state(driver):
+    """URL, cookies of every domain and the current origin's storage."""
+    try:
+        cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+    except (AttributeError, WebDriverException):
+        cookies = driver.get_cookies()
+    storage = driver.execute_script("""
+        function dump(store) {
+            var out = {};
+            for (var i = 0; i < store.length; i++) out[store.key(i)] = store.getItem(store.key(i));
+            return out;
+        }
+        return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+    """)
+    return {
+        "url": driver.current_url,
+        "cookies": cookies,
+        "local_storage": storage["local"],
+        "session_storage": storage["session"],
+    }
+
+
+# Cookie fields Network.setCookies accepts.
+_COOKIE_PARAMS = (
+    "name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires",
+    "priority", "sourceScheme", "sourcePort", "partitionKey",
+)
+
+
+def _cookie_param(cookie):
+    cookie = dict(cookie)
+    if "expiry" in cookie:
+        cookie["expires"] = cookie.pop("expiry")
+    if cookie.get("session") or cookie.get("expires", 0) < 0:
+        cookie.pop("expires", None)
+    return {k: v for k, v in cookie.items() if k in _COOKIE_PARAMS}
+
+
+def restore_browser_state(driver, state):
+    """Load *state* into *driver* and finish on the checkpoint's URL."""
+    cookies = [_cookie_param(c) for c in state["cookies"]]
+    try:
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+        cookies = []
+    except (AttributeError, WebDriverException):
+        pass
+    driver.get(state["url"])
+    for cookie in cookies:
+        if "expires" in cookie:
+            cookie["expiry"] = int(cookie.pop("expires"))
+        try:
+            driver.add_cookie(cookie)
+        except WebDriverException:
+            pass  # cookie of another domain
+    driver.execute_script("""
+        var local = arguments[0], session = arguments[1];
+        Object.keys(local).forEach(function (k) { window.localStorage.setItem(k, local[k]); });
+        Object.keys(session).forEach(function (k) { window.sessionStorage.setItem(k, session[k]); });
+    """, state["local_storage"], state["session_storage"])
+    # Reload so the page starts with its cookies and storage in place.
+    driver.get(state["url"])
+
+
+class CheckpointStore:
+    """One JSON checkpoint file per test in *directory*."""
+
+    def __init__(self, directory=".checkpoints"):
+        self.directory = os.path.abspath(directory)
+
+    def _path(self, test):
+        return os.path.join(self.directory, re.sub(r"[^A-Za-z0-9_.-]+", "_", test) + ".json")
+
+    def save(self, test, step, browser, state, results):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(test)
+        checkpoint = {
+            "test": test, "step": step, "browser": browser,
+            "state": state, "results": results,
+        }
+        with open(path + ".tmp", "w", encoding="utf-8") as fh:
+            json.dump(checkpoint, fh, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+    def load(self, test):
+        try:
+            with open(self._path(test), encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+    def clear(self, test):
+        try:
+            os.remove(self._path(test))
+        except OSError:
+            pass
+
+
+class CheckpointedFlow:
+    """Runs a test's phases in order and checkpoints after each one.
+
+    *phases* are ``(last_step, callable)`` pairs. The callable runs the
+    steps up to and including ``last_step`` and reports them on *report*
+    (a :class:`~result_log.StepRecorder`). It can keep what later phases
+    need in :attr:`state`. A failure is reported on the step after the
+    last passed one, or on ``e.step`` for a
+    :class:`~result_log.StepFailed`. *restore* is called with that state
+    after a checkpoint was loaded into the browser, to redo in-page state
+    the URL does not carry.
+    """
+
+    def __init__(self, store, test, driver, report, resume=False, retries=0):
+        self.store = store
+        self.test = test
+        self.driver = driver
+        self.report = report
+        self.resume = resume
+        self.retries = retries
+        self.state = {}
+        self.resumed_from = None
+
+    def run(self, phases, restore=None):
+        checkpoint = self.store.load(self.test) if self.resume else None
+        if checkpoint is None:
+            self.store.clear(self.test)
+        else:
+            self.report.restore(checkpoint["results"])
+            self._restore(checkpoint, restore)
+            self.resumed_from = checkpoint["step"]
+
+        retries = self.retries
+        done = checkpoint["step"] if checkpoint else 0
+        index = 0
+        while index < len(phases):
+            last_step, phase = phases[index]
+            if last_step <= done:
+                index += 1
+                continue
+            try:
+                phase()
+            except Exception as e:
+                step = e.step if isinstance(e, StepFailed) else self.report.last_step + 1
+                self.report.fail_step(step, str(e)[:250])
+                checkpoint = self.store.load(self.test)
+                if retries <= 0 or checkpoint is None:
+                    raise
+                retries -= 1
+                self._restore(checkpoint, restore)
+                self.report.last_step = checkpoint["step"]
+                done = checkpoint["step"]
+                continue
+            done = last_step
+            index += 1
+            if index < len(phases):
+                self.store.save(
+                    self.test, last_step, capture_browser_state(self.driver),
+                    self.state, self.report.results,
+                )
+        self.store.clear(self.test)
+
+    def _restore(self, checkpoint, restore):
+        self.state = dict(checkpoint["state"])
+        restore_browser_state(self.driver, checkpoint["browser"])
+        if restore is not None:
+            restore(self.state)
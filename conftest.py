@@ -1,21 +1,522 @@
+import argparse
+import json
+import os
+import time
+
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
+
+from checkpoint import CheckpointStore, CheckpointedFlow
+from driver_factory import ChromeFactory
+from driver_pool import DriverPool
+from excel_reporter import ExcelReporter
+from failure_artifacts import ArtifactStore, FailureArtifacts
+from http_archive import ArchiveRecorder, HttpArchive, ReplayServer
+from instrumentation import Instrumentation, instrument
+from network_policy import NetworkPolicy, NetworkSession, drain_performance_log
+from page_metrics import PerformanceBudget, append_time_series
+from parallel_runner import run_parallel, save_durations
+from soak import SoakMonitor, run_soak
+from static_html import StaticHtml
+from result_log import (
+    JsonlSink, StepRecorder, read_events, render_junit, render_summary,
+)
+from wait_policy import WaitPolicy
+
+
+DRIVER_POOL_KEY = pytest.StashKey[DriverPool]()
+TEST_RESULTS_KEY = pytest.StashKey[dict]()
+RESULT_SINK_KEY = pytest.StashKey[JsonlSink]()
+ARCHIVE_KEY = pytest.StashKey[HttpArchive]()
+ARTIFACT_STORE_KEY = pytest.StashKey[ArtifactStore]()
+STATIC_HTML_KEY = pytest.StashKey[StaticHtml]()
+SOAK_KEY = pytest.StashKey[SoakMonitor]()
+WAIT_POLICY_KEY = pytest.StashKey[WaitPolicy]()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--pool-max-uses", type=int, default=20,
+        help="Recycle a pooled browser after this many tests (default: 20).",
+    )
+    parser.addoption(
+        "--headed", action="store_true",
+        help="Show the browser window (browsers run headless by default).",
+    )
+    parser.addoption(
+        "--cold-start", action="store_true",
+        help="Launch browsers without the fast-startup mode (see driver_factory).",
+    )
+    parser.addoption(
+        "--page-load-strategy", choices=("normal", "eager", "none"), default="normal",
+        help="WebDriver page load strategy; 'eager' returns at DOMContentLoaded.",
+    )
+    parser.addoption(
+        "--no-network-policy", action="store_true",
+        help="Load every resource, ignoring the pages' NETWORK_POLICY blocking.",
+    )
+    parser.addoption(
+        "--no-static-html", action="store_true", default=False,
+        help="Answer every page check in the browser, also those that can be "
+             "read from the server-rendered HTML.",
+    )
+    parser.addoption(
+        "--archive-mode", choices=("off", "record", "replay"), default="off",
+        help="Record every response into --http-archive, or replay the run from it.",
+    )
+    parser.addoption(
+        "--http-archive", default="http_archive",
+        help="Directory of the recorded HTTP archive (default: http_archive).",
+    )
+    parser.addoption(
+        "--workers", type=int, default=0,
+        help="Run tests in N local worker processes, each with its own browser.",
+    )
+    parser.addoption(
+        "--durations-file", default=".test_durations.json",
+        help="Per-test durations used to balance workers (default: .test_durations.json).",
+    )
+    parser.addoption(
+        "--result-log", default="test_results.jsonl",
+        help="Append-only JSONL step log; reports are rendered from it at session end.",
+    )
+    parser.addoption(
+        "--excel-report", default="test_report.xlsx",
+        help="Excel report rendered from the result log (default: test_report.xlsx).",
+    )
+    parser.addoption(
+        "--open-report", action="store_true",
+        help="Open the Excel report in the default spreadsheet app when the run ends.",
+    )
+    parser.addoption(
+        "--large-report", action="store_true", default=None,
+        help="Stream the Excel report with one sheet per test class "
+             "(automatic above 5000 steps).",
+    )
+    parser.addoption(
+        "--artifacts-dir", default="artifacts",
+        help="Where failed steps save screenshot, page source and console log.",
+    )
+    parser.addoption(
+        "--artifacts-max-mb", type=float, default=200,
+        help="Size cap of --artifacts-dir; oldest failures are deleted first (default: 200).",
+    )
+    parser.addoption(
+        "--no-performance-budgets", action="store_true",
+        help="Collect page load metrics without failing pages over their budget.",
+    )
+    parser.addoption(
+        "--page-metrics-log", default="page_metrics.jsonl",
+        help="Page load metrics of every run are appended here as a time series.",
+    )
+    parser.addoption(
+        "--checkpoint-dir", default=".checkpoints",
+        help="Where workflow tests save a checkpoint after each page transition.",
+    )
+    parser.addoption(
+        "--checkpoint-retries", type=int, default=0,
+        help="Rerun a failed workflow phase up to N times from its last checkpoint.",
+    )
+    parser.addoption(
+        "--resume", action="store_true",
+        help="Resume workflow tests from the checkpoint a failed run left behind.",
+    )
+    parser.addoption(
+        "--wait-stats", default=".wait_stats.json",
+        help="Per-wait history the adaptive timeouts are learned from.",
+    )
+    parser.addoption(
+        "--no-adaptive-waits", action="store_true",
+        help="Use the coded wait timeouts; outcomes are still recorded.",
+    )
+    parser.addoption("--steps-junit", default=None, help="Also render a JUnit XML step report.")
+    parser.addoption("--steps-summary", default=None, help="Also render a summary JSON file.")
+    parser.addoption(
+        "--soak-iterations", type=int, default=None,
+        help="Soak mode: run the selected tests this many times in one session.",
+    )
+    parser.addoption(
+        "--soak-minutes", type=float, default=None,
+        help="Soak mode: repeat the selected tests for this many minutes.",
+    )
+    parser.addoption(
+        "--soak-log", default="soak.jsonl",
+        help="JSONL time series of latency and browser memory per soak iteration.",
+    )
+    parser.addoption(
+        "--soak-max-heap-mb", type=float, default=512,
+        help="Recycle the browser when the page's JS heap exceeds this (MB).",
+    )
+    parser.addoption(
+        "--soak-max-rss-mb", type=float, default=3072,
+        help="Recycle the browser when chromedriver + Chrome RSS exceeds this (MB).",
+    )
+    parser.addoption(
+        "--soak-max-growth", type=float, default=300,
+        help="Recycle the browser when its RSS grows faster than this (MB per hour).",
+    )
+    # Internal: passed to worker processes by the parallel runner.
+    parser.addoption("--worker-id", default=None, help=argparse.SUPPRESS)
+    parser.addoption("--worker-dir", default=None, help=argparse.SUPPRESS)
+
+
+def pytest_configure(config):
+    config.stash[TEST_RESULTS_KEY] = {}
+    PerformanceBudget.enabled = not config.getoption("--no-performance-budgets")
+    if config.getoption("--archive-mode") == "record" and config.getoption("--workers") > 1:
+        raise pytest.UsageError("Record the HTTP archive in one process; drop --workers.")
+    if config.getoption("--soak-iterations") or config.getoption("--soak-minutes"):
+        if config.getoption("--workers") > 1:
+            raise pytest.UsageError("Soak mode runs in one process; drop --workers.")
+        config.stash[SOAK_KEY] = SoakMonitor(
+            config.getoption("--soak-log"),
+            limits={
+                "js_heap_mb": config.getoption("--soak-max-heap-mb"),
+                "rss_mb": config.getoption("--soak-max-rss-mb"),
+                "growth_mb_per_hour": config.getoption("--soak-max-growth"),
+            },
+        )
+
+
+def _result_log_path(config):
+    worker_id = config.getoption("--worker-id")
+    if worker_id is not None:
+        return os.path.join(config.getoption("--worker-dir"), f"events-{worker_id}.jsonl")
+    return config.getoption("--result-log")
+
+
+@pytest.fixture(scope="session")
+def result_sink(pytestconfig):
+    sink = JsonlSink(_result_log_path(pytestconfig), truncate=True)
+    pytestconfig.stash[RESULT_SINK_KEY] = sink
+
+    yield sink
+
+    sink.close()
+
+
+@pytest.fixture(scope="session")
+def artifact_store(pytestconfig):
+    store = ArtifactStore(
+        pytestconfig.getoption("--artifacts-dir"),
+        max_bytes=int(pytestconfig.getoption("--artifacts-max-mb") * 1024 * 1024),
+    )
+    pytestconfig.stash[ARTIFACT_STORE_KEY] = store
+
+    yield store
+
+    store.close()
+
+
+@pytest.fixture(scope="session")
+def http_archive(pytestconfig):
+    """The session's HTTP archive, or None when --archive-mode is off."""
+    mode = pytestconfig.getoption("--archive-mode")
+    if mode == "off":
+        yield None
+        return
+    archive = HttpArchive.load(pytestconfig.getoption("--http-archive"))
+    pytestconfig.stash[ARCHIVE_KEY] = archive
+
+    yield archive
+
+    if mode == "record":
+        archive.save()
+
+
+@pytest.fixture(scope="session")
+def replay_server(pytestconfig, http_archive):
+    if pytestconfig.getoption("--archive-mode") != "replay":
+        yield None
+        return
+    server = ReplayServer(http_archive)
+
+    yield server
+
+    server.close()
+
+
+@pytest.fixture(scope="session")
+def static_html(pytestconfig, http_archive):
+    """Backend for checks read from server-rendered HTML, or None when disabled."""
+    if pytestconfig.getoption("--no-static-html"):
+        yield None
+        return
+    backend = StaticHtml(
+        archive=http_archive,
+        replay=pytestconfig.getoption("--archive-mode") == "replay",
+    )
+    StaticHtml.active = backend
+    pytestconfig.stash[STATIC_HTML_KEY] = backend
+
+    yield backend
+
+    StaticHtml.active = None
+    backend.close()
+
+
+@pytest.fixture(scope="session")
+def network_session(pytestconfig):
+    """Request blocking switch and URL sizes for the pages' NETWORK_POLICY."""
+    session = NetworkSession(enabled=not pytestconfig.getoption("--no-network-policy"))
+    NetworkPolicy.active = session
+
+    yield session
+
+    NetworkPolicy.active = None
+    session.save_sizes()
+
+
+@pytest.fixture(scope="session")
+def wait_policy(pytestconfig):
+    """Learned wait timeouts for the page objects of browser tests."""
+    policy = WaitPolicy.load(
+        pytestconfig.getoption("--wait-stats"),
+        adaptive=not pytestconfig.getoption("--no-adaptive-waits"),
+    )
+    WaitPolicy.active = policy
+    pytestconfig.stash[WAIT_POLICY_KEY] = policy
+
+    yield policy
+
+    WaitPolicy.active = None
+    policy.save()
+
+
+@pytest.fixture(scope="session")
+def driver_pool(pytestconfig, replay_server):
+    factory = ChromeFactory(
+        fast_startup=not pytestconfig.getoption("--cold-start"),
+        headless=False if pytestconfig.getoption("--headed") else None,
+        page_load_strategy=pytestconfig.getoption("--page-load-strategy"),
+        extra_args=replay_server.chrome_arguments() if replay_server else (),
+    )
+    pool = DriverPool(factory, max_uses=pytestconfig.getoption("--pool-max-uses"))
+    pytestconfig.stash[DRIVER_POOL_KEY] = pool
+
+    yield pool
+
+    pool.close()
+    factory.cleanup()
 
 
 @pytest.fixture()
-def driver():
-    options = webdriver.ChromeOptions()
-    options.add_argument("--start-maximized")
-    options.add_argument("--disable-notifications")
-    options.add_argument("--disable-popup-blocking")
+def instrumentation():
+    """Command and wait timings for the current test."""
+    return Instrumentation()
 
-    driver = webdriver.Chrome(
-        service=ChromeService(ChromeDriverManager().install()),
-        options=options,
+
+@pytest.fixture()
+def driver(pytestconfig, driver_pool, instrumentation, http_archive, static_html,
+           wait_policy, network_session):
+    driver = driver_pool.lease()
+    recorder = None
+    if pytestconfig.getoption("--archive-mode") == "record":
+        drain_performance_log(driver)
+        recorder = ArchiveRecorder(http_archive, driver)
+    wrapped = instrument(
+        driver, instrumentation, after_command=recorder.poll if recorder else None
     )
+    if recorder is not None:
+        recorder.attach(wrapped)
+
+    yield wrapped
 
-    yield driver
+    if recorder is not None:
+        recorder.drain()
+    monitor = pytestconfig.stash.get(SOAK_KEY, None)
+    if monitor is not None and monitor.sample(driver) is not None:
+        driver_pool.retire(driver)
+    driver_pool.release(driver)
+
+
+@pytest.fixture()
+def report(request, result_sink, instrumentation):
+    """Step recorder for the current test, logging to the session result log.
 
-    driver.quit()
+    For tests that use a browser, failed steps also save failure artifacts.
+    """
+    artifacts = None
+    if "driver" in request.fixturenames:
+        artifacts = FailureArtifacts(
+            request.getfixturevalue("artifact_store"), request.getfixturevalue("driver")
+        )
+    test = request.node.nodeid
+    monitor = request.config.stash.get(SOAK_KEY, None)
+    if monitor is not None:
+        test = monitor.test_name(test)
+    return StepRecorder(
+        [result_sink], test=test, instrumentation=instrumentation, artifacts=artifacts,
+    )
+
+
+@pytest.fixture()
+def flow(request, pytestconfig, driver, report):
+    """Checkpointed phase runner for long workflow tests (see checkpoint)."""
+    return CheckpointedFlow(
+        CheckpointStore(pytestconfig.getoption("--checkpoint-dir")),
+        request.node.nodeid, driver, report,
+        resume=pytestconfig.getoption("--resume"),
+        retries=pytestconfig.getoption("--checkpoint-retries"),
+    )
+
+
+def pytest_runtestloop(session):
+    config = session.config
+    monitor = config.stash.get(SOAK_KEY, None)
+    if monitor is not None and not config.option.collectonly and session.items:
+        run_soak(
+            session, monitor, config.getoption("--soak-iterations"),
+            config.getoption("--soak-minutes"),
+        )
+        return True
+    workers = config.getoption("--workers")
+    if workers < 2 or config.getoption("--worker-id") is not None:
+        return None
+    if config.option.collectonly or not session.items:
+        return None
+    run_parallel(
+        session, workers, config.getoption("--durations-file"),
+        config.getoption("--result-log"),
+    )
+    return True
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    rep = outcome.get_result()
+    result = item.config.stash[TEST_RESULTS_KEY].setdefault(
+        item.nodeid, {"duration": 0.0, "outcome": "passed"}
+    )
+    result["duration"] += rep.duration
+    if rep.failed:
+        result["outcome"] = "failed"
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    sink = config.stash.get(RESULT_SINK_KEY, None)
+    if sink is not None:
+        sink.close()
+    ran_parallel = config.getoption("--workers") > 1
+    if config.getoption("--worker-id") is None and (sink is not None or ran_parallel):
+        _render_reports(config)
+
+    results = config.stash[TEST_RESULTS_KEY]
+    if not results:
+        return
+    worker_id = config.getoption("--worker-id")
+    if worker_id is not None:
+        path = os.path.join(config.getoption("--worker-dir"), f"results-{worker_id}.json")
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(results, fh)
+    elif SOAK_KEY not in config.stash:
+        # Soak durations add up over iterations; keep them out of sharding.
+        save_durations(
+            config.getoption("--durations-file"),
+            {nodeid: r["duration"] for nodeid, r in results.items()},
+        )
+
+
+def _render_reports(config):
+    """Build the Excel (and optional JUnit/summary) reports from the log, once."""
+    path = config.getoption("--result-log")
+    if not os.path.exists(path):
+        return
+    events = list(read_events(path))
+    if not events:
+        return
+    reporter = ExcelReporter.from_events(
+        events, config.getoption("--excel-report"), config.getoption("--large-report")
+    )
+    monitor = config.stash.get(SOAK_KEY, None)
+    if monitor is not None and monitor.samples:
+        reporter.add_soak_sheet(monitor.samples)
+    reporter.save()
+    if config.getoption("--steps-junit"):
+        render_junit(events, config.getoption("--steps-junit"))
+    if config.getoption("--steps-summary"):
+        render_summary(events, config.getoption("--steps-summary"))
+    page_metrics = [
+        entry for event in events if event["event"] == "step"
+        for entry in event.get("page_metrics", [])
+    ]
+    if page_metrics:
+        append_time_series(
+            page_metrics, config.getoption("--page-metrics-log"),
+            run_id=time.strftime("%Y%m%d-%H%M%S"),
+        )
+    if config.getoption("--open-report"):
+        reporter.open_file()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    archive = config.stash.get(ARCHIVE_KEY, None)
+    if archive is not None:
+        terminalreporter.write_sep("-", "http archive")
+        terminalreporter.write_line(
+            f"{config.getoption('--archive-mode')}: {len(archive.entries)} response(s) "
+            f"in {archive.path}, {len(archive.misses)} replay miss(es)"
+        )
+        for key in sorted(set(archive.misses)):
+            terminalreporter.write_line(f"  miss: {key}")
+        for key in sorted(set(archive.unrecorded)):
+            terminalreporter.write_line(f"  body not recorded: {key}")
+
+    policy = config.stash.get(WAIT_POLICY_KEY, None)
+    if policy is not None and policy.session["waits"]:
+        s = policy.session
+        terminalreporter.write_sep("-", "wait policy")
+        terminalreporter.write_line(
+            f"{s['waits']} wait(s), {s['timeouts']} timed out: {s['wasted']:.1f}s wasted, "
+            f"{s['saved']:.1f}s saved against the coded timeouts"
+        )
+        worst = sorted(policy.wasted_by_key.items(), key=lambda kv: -kv[1])[:3]
+        for key, seconds in worst:
+            terminalreporter.write_line(f"  {key}: {seconds:.1f}s")
+
+    monitor = config.stash.get(SOAK_KEY, None)
+    if monitor is not None and monitor.samples:
+        s = monitor.summary()
+        terminalreporter.write_sep("-", "soak")
+        terminalreporter.write_line(
+            f"{s['iterations']} iteration(s) in {s['elapsed']:.0f}s, {s['failures']} failed, "
+            f"{s['recycles']} browser recycle(s)"
+        )
+        terminalreporter.write_line(
+            f"iteration {s['seconds'][0]:.1f}s -> {s['seconds'][1]:.1f}s, "
+            f"RSS {s['rss_mb'][0]} -> {s['rss_mb'][1]} MB, "
+            f"max growth {s['max_growth_mb_per_hour']} MB/h; series in {monitor.path}"
+        )
+
+    backend = config.stash.get(STATIC_HTML_KEY, None)
+    if backend is not None and backend.fetches:
+        terminalreporter.write_sep("-", "static html")
+        terminalreporter.write_line(
+            f"{backend.fetches} page(s) checked from server HTML, "
+            f"{backend.failures} fell back to the browser"
+        )
+
+    store = config.stash.get(ARTIFACT_STORE_KEY, None)
+    if store is not None and (store.written or store.failed):
+        terminalreporter.write_sep("-", "failure artifacts")
+        terminalreporter.write_line(
+            f"{store.written} failure(s) saved to {store.directory}, "
+            f"{store.evicted} old one(s) removed to stay under the size cap"
+        )
+        for path, error in store.failed:
+            terminalreporter.write_line(f"  not saved: {os.path.basename(path)} ({error})")
+
+    pool = config.stash.get(DRIVER_POOL_KEY, None)
+    if pool is None or not pool.lease_times:
+        return
+    s = pool.stats()
+    terminalreporter.write_sep("-", "driver pool")
+    terminalreporter.write_line(
+        f"{s['leases']} lease(s), {s['created']} browser(s) created, "
+        f"{s['recycled']} recycled"
+    )
+    terminalreporter.write_line(
+        f"lease avg {s['lease_avg']:.3f}s / max {s['lease_max']:.3f}s, "
+        f"reset avg {s['reset_avg']:.3f}s / max {s['reset_max']:.3f}s"
+    )
@@ -0,0 +1,240 @@
+"""Chrome creation with a fast-startup mode.
+
+Fast startup (the default) cuts the fixed cost of every browser launch:
+
+* the chromedriver binary is resolved once through webdriver-manager and
+  cached in ``~/.cache/insider-qa/chromedriver.json`` together with its
+  SHA-256, so later launches skip the version lookup and work offline;
+* Chrome runs headless unless ``headless=False``;
+* a template user-data-dir is built once (first-run work already done) and
+  copied for each browser instead of starting from an empty profile;
+* launch flags switch off first-run UI, background networking, component
+  updates, sync and other work a test run never needs.
+
+``ChromeFactory(fast_startup=False)`` launches the way the suite originally
+did, which is what ``python -m driver_factory`` measures against::
+
+    python -m driver_factory --launches 5
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+from webdriver_manager.chrome import ChromeDriverManager
+
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "insider-qa")
+DRIVER_CACHE = os.path.join(CACHE_DIR, "chromedriver.json")
+PROFILE_TEMPLATE = os.path.join(CACHE_DIR, "profile-template")
+
+FAST_FLAGS = [
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-extensions",
+    "--disable-component-update",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-default-apps",
+    "--disable-client-side-phishing-detection",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--password-store=basic",
+    "--use-mock-keychain",
+    "--disable-dev-shm-usage",
+]
+
+# Profile files tied to a running browser; never copied from the template.
+_PROFILE_LOCKS = ("SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile")
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def resolve_driver_path(cache_path=DRIVER_CACHE):
+    """Return a verified chromedriver path, resolving it online only when needed.
+
+    The cached path is trusted only if the binary still exists and its
+    checksum matches the one recorded when it was resolved.
+    """
+    try:
+        with open(cache_path, encoding="utf-8") as fh:
+            cached = json.load(fh)
+        if os.path.exists(cached["path"]) and _sha256(cached["path"]) == cached["sha256"]:
+            return cached["path"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    path = ChromeDriverManager().install()
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with open(cache_path, "w", encoding="utf-8") as fh:
+        json.dump({"path": path, "sha256": _sha256(path)}, fh)
+    return path
+
+
+class ChromeFactory:
+    """Callable that launches a configured Chrome; used as the pool factory."""
+
+    def __init__(self, fast_startup=True, headless=None, page_load_strategy="normal",
+                 extra_args=(), profile_template=PROFILE_TEMPLATE):
+        self.fast_startup = fast_startup
+        self.headless = fast_startup if headless is None else headless
+        self.page_load_strategy = page_load_strategy
+        self.extra_args = list(extra_args)
+        self.profile_template = profile_template
+        self._driver_path = None
+        self._profiles = {}  # profile copy -> its driver, None while launching
+
+    def __call__(self):
+        options = self.options()
+        profile = None
+        if self.fast_startup:
+            profile = self._new_profile()
+            options.add_argument(f"--user-data-dir={profile}")
+        try:
+            driver = webdriver.Chrome(service=ChromeService(self.driver_path()), options=options)
+        except Exception:
+            if profile is not None:
+                self._remove_profile(profile)
+            raise
+        if profile is not None:
+            self._profiles[profile] = driver
+        return driver
+
+    def discard(self, driver):
+        """Delete the profile copy of *driver*; call after it has quit.
+
+        The pool calls this for every browser it throws away, so recycled
+        browsers do not leave their profiles behind until session end.
+        """
+        for profile, owner in list(self._profiles.items()):
+            if owner is driver:
+                self._remove_profile(profile)
+
+    def driver_path(self):
+        if not self.fast_startup:
+            return ChromeDriverManager().install()
+        if self._driver_path is None:
+            self._driver_path = resolve_driver_path()
+        return self._driver_path
+
+    def options(self):
+        options = webdriver.ChromeOptions()
+        options.page_load_strategy = self.page_load_strategy
+        # Performance log feeds the per-page request/blocked counts (network_policy);
+        # the browser log is the console dump of failure_artifacts.
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL", "browser": "ALL"})
+        if self.headless:
+            options.add_argument("--headless=new")
+            options.add_argument("--window-size=1920,1080")
+        else:
+            options.add_argument("--start-maximized")
+        options.add_argument("--disable-notifications")
+        options.add_argument("--disable-popup-blocking")
+        # Keep background tabs running at full speed for BasePage.verify_in_tabs.
+        options.add_argument("--disable-background-timer-throttling")
+        options.add_argument("--disable-renderer-backgrounding")
+        options.add_argument("--disable-backgrounding-occluded-windows")
+        if self.fast_startup:
+            for flag in FAST_FLAGS:
+                options.add_argument(flag)
+        for arg in self.extra_args:
+            options.add_argument(arg)
+        return options
+
+    def prepare_profile_template(self):
+        """Build the template profile once by launching and closing Chrome in it.
+
+        Each process builds in its own directory and renames it into place;
+        parallel workers that lose the race use the winner's template.
+        """
+        if os.path.isdir(self.profile_template):
+            return self.profile_template
+        parent = os.path.dirname(os.path.abspath(self.profile_template))
+        os.makedirs(parent, exist_ok=True)
+        building = tempfile.mkdtemp(
+            prefix=os.path.basename(self.profile_template) + ".building-", dir=parent
+        )
+        try:
+            options = self.options()
+            options.add_argument(f"--user-data-dir={building}")
+            driver = webdriver.Chrome(service=ChromeService(self.driver_path()), options=options)
+            try:
+                driver.get("about:blank")
+            finally:
+                driver.quit()
+            os.replace(building, self.profile_template)
+        except OSError:
+            if not os.path.isdir(self.profile_template):
+                raise
+        finally:
+            shutil.rmtree(building, ignore_errors=True)
+        return self.profile_template
+
+    def _new_profile(self):
+        target = tempfile.mkdtemp(prefix="chrome-profile-")
+        shutil.copytree(
+            self.prepare_profile_template(), target, dirs_exist_ok=True,
+            ignore=shutil.ignore_patterns(*_PROFILE_LOCKS),
+        )
+        self._profiles[target] = None
+        return target
+
+    def _remove_profile(self, profile):
+        self._profiles.pop(profile, None)
+        shutil.rmtree(profile, ignore_errors=True)
+
+    def cleanup(self):
+        """Delete the per-browser profile copies; call after the browsers quit."""
+        for profile in list(self._profiles):
+            self._remove_profile(profile)
+
+
+def benchmark(launches=3, headless=True):
+    """Time *launches* cold and warm browser starts (launch until about:blank)."""
+    results = {}
+    for label, fast in (("cold", False), ("warm", True)):
+        factory = ChromeFactory(fast_startup=fast, headless=headless)
+        if fast:
+            factory.prepare_profile_template()
+            factory.driver_path()
+        times = []
+        for _ in range(launches):
+            start = time.perf_counter()
+            driver = factory()
+            driver.get("about:blank")
+            times.append(time.perf_counter() - start)
+            driver.quit()
+        factory.cleanup()
+        results[label] = times
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare cold and warm Chrome launch times.")
+    parser.add_argument("--launches", type=int, default=3)
+    parser.add_argument("--headed", action="store_true", help="show the browser windows")
+    args = parser.parse_args(argv)
+
+    results = benchmark(args.launches, headless=not args.headed)
+    for label, times in results.items():
+        print(
+            f"{label:>4}: avg {sum(times) / len(times):.2f}s  "
+            f"min {min(times):.2f}s  max {max(times):.2f}s  ({len(times)} launches)"
+        )
+    cold, warm = (sum(results[k]) / len(results[k]) for k in ("cold", "warm"))
+    print(f"warm start is {cold / warm:.1f}x faster" if warm else "")
+
+
+if __name__ == "__main__":
+    main()
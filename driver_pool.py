@@ -0,0 +1,169 @@
+import time
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+from urllib3.exceptions import HTTPError
+
+
+# What a command raises when the browser or chromedriver is gone. A dead
+# chromedriver surfaces as urllib3's MaxRetryError or a refused connection,
+# not as a WebDriverException.
+_BROWSER_GONE = (WebDriverException, HTTPError, ConnectionError)
+
+# Storage.clearDataForOrigin types; cookies are cleared separately.
+_ORIGIN_STORAGE = "local_storage,indexeddb,websql,cache_storage,service_workers,file_systems"
+
+
+class DriverPool:
+    """Keeps browsers alive across tests and leases them out one at a time.
+
+    A browser is created lazily on the first lease, reset to a blank state
+    when it is released and handed to the next test. It is thrown away and
+    replaced after *max_uses* leases, or as soon as it stops responding.
+    """
+
+    def __init__(self, factory, max_uses=20):
+        self._factory = factory
+        self.max_uses = max_uses
+        self._idle = []
+        self._uses = {}
+        self.created = 0
+        self.recycled = 0
+        self.lease_times = []
+        self.reset_times = []
+
+    def lease(self):
+        """Return a ready-to-use driver, reusing an idle one when possible."""
+        start = time.perf_counter()
+        driver = None
+        while self._idle:
+            candidate = self._idle.pop()
+            if self._is_alive(candidate):
+                driver = candidate
+                break
+            self._discard(candidate)
+        if driver is None:
+            driver = self._factory()
+            self._uses[driver] = 0
+            self.created += 1
+        self.lease_times.append(time.perf_counter() - start)
+        return driver
+
+    def release(self, driver):
+        """Take a driver back, resetting it or recycling it when worn out."""
+        self._uses[driver] = self._uses.get(driver, 0) + 1
+        if self._uses[driver] >= self.max_uses:
+            self._discard(driver)
+            return
+
+        start = time.perf_counter()
+        try:
+            self.reset(driver)
+        except _BROWSER_GONE:
+            self._discard(driver)
+            return
+        self.reset_times.append(time.perf_counter() - start)
+        self._idle.append(driver)
+
+    def retire(self, driver):
+        """Have *driver* quit on release instead of going back to the pool."""
+        self._uses[driver] = self.max_uses
+
+    def reset(self, driver):
+        """Leave one blank tab, with cookies and the storage of visited origins cleared.
+
+        The test's tabs are replaced by a fresh one, which also drops their
+        session storage. Local storage, IndexedDB and the like are cleared
+        through DevTools for every origin in the tabs' history, so a site
+        left behind by a same-tab redirect is cleared too. Without DevTools
+        only each tab's current origin is cleared.
+        """
+        handles = driver.window_handles
+        if not handles:
+            raise WebDriverException("browser has no open windows")
+        origins = set()
+        for handle in handles:
+            driver.switch_to.window(handle)
+            origins.update(self._visited_origins(driver))
+            self._clear_storage(driver)
+        driver.switch_to.new_window("tab")
+        fresh = driver.current_window_handle
+        for handle in handles:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(fresh)
+        try:
+            for origin in sorted(origins):
+                driver.execute_cdp_cmd(
+                    "Storage.clearDataForOrigin",
+                    {"origin": origin, "storageTypes": _ORIGIN_STORAGE},
+                )
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except (AttributeError, WebDriverException):
+            driver.delete_all_cookies()
+
+    def close(self):
+        """Quit every idle browser; called once at the end of the session."""
+        while self._idle:
+            self._quit(self._idle.pop())
+
+    def stats(self):
+        """Summarise lease/reset latency in seconds for the session report."""
+        return {
+            "created": self.created,
+            "recycled": self.recycled,
+            "leases": len(self.lease_times),
+            "lease_avg": _mean(self.lease_times),
+            "lease_max": max(self.lease_times, default=0.0),
+            "reset_avg": _mean(self.reset_times),
+            "reset_max": max(self.reset_times, default=0.0),
+        }
+
+    @staticmethod
+    def _clear_storage(driver):
+        driver.execute_script(
+            "try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}"
+        )
+
+    @staticmethod
+    def _visited_origins(driver):
+        """Origins in the current tab's navigation history (DevTools)."""
+        try:
+            history = driver.execute_cdp_cmd("Page.getNavigationHistory", {})
+        except (AttributeError, WebDriverException):
+            return set()
+        origins = set()
+        for entry in history.get("entries", []):
+            parts = urlsplit(entry.get("url", ""))
+            if parts.scheme in ("http", "https") and parts.netloc:
+                origins.add(f"{parts.scheme}://{parts.netloc}")
+        return origins
+
+    @staticmethod
+    def _is_alive(driver):
+        try:
+            driver.window_handles
+            return True
+        except _BROWSER_GONE:
+            return False
+
+    def _discard(self, driver):
+        self._uses.pop(driver, None)
+        self.recycled += 1
+        self._quit(driver)
+        # Factories with per-browser resources (e.g. ChromeFactory's
+        # profile copies) release them now rather than at session end.
+        discard = getattr(self._factory, "discard", None)
+        if discard is not None:
+            discard(driver)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except _BROWSER_GONE:
+            pass
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else 0.0
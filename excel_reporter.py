@@ -1,13 +1,119 @@
 import os
+import re
 import subprocess
+import sys
+from copy import copy
 from datetime import datetime
 
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from openpyxl.utils import get_column_letter
+
+from instrumentation import percentile
+from result_log import collect_tests
+
+
+def open_in_default_app(path):
+    """Open *path* with the platform's default app; False if that failed.
+
+    Never raises: a headless machine without an opener only loses the
+    convenience, not the run.
+    """
+    try:
+        if sys.platform == "win32":
+            os.startfile(path)
+        elif sys.platform == "darwin":
+            subprocess.Popen(["open", path])
+        else:
+            subprocess.Popen(["xdg-open", path])
+    except OSError:
+        return False
+    return True
+
+
+# Logs with more step rows than this are rendered by LargeExcelReporter.
+LARGE_REPORT_ROWS = 5000
+
+
+def _latency_table(samples):
+    headers = ["Command", "Count", "p50 (ms)", "p95 (ms)", "Max (ms)", "Total (s)"]
+    rows = []
+    for name in sorted(samples):
+        values = samples[name]
+        rows.append([
+            name, len(values),
+            round(percentile(values, 50) * 1000, 1),
+            round(percentile(values, 95) * 1000, 1),
+            round(max(values) * 1000, 1),
+            round(sum(values), 3),
+        ])
+    return headers, rows, {}, 1
+
+
+def _network_table(entries):
+    headers = [
+        "Page", "URL", "Requests", "Transferred (KB)", "Blocked", "Blocked (KB, est.)",
+    ]
+    rows = [
+        [
+            entry["page"], entry["url"], entry["requests"],
+            round(entry["bytes"] / 1024, 1), entry["blocked"],
+            round(entry["blocked_bytes"] / 1024, 1),
+        ]
+        for entry in entries
+    ]
+    return headers, rows, {2: 55}, 2
+
+
+def _page_metrics_table(entries):
+    headers = [
+        "Page", "URL", "Time", "TTFB (ms)", "DOMContentLoaded (ms)", "Load (ms)",
+        "LCP (ms)", "CLS", "Transferred (KB)", "Requests", "Over Budget",
+    ]
+    rows = [
+        [
+            entry["page"], entry["url"], entry.get("time"), entry.get("ttfb"),
+            entry.get("dom_content_loaded"), entry.get("load"), entry.get("lcp"),
+            entry.get("cls"), round((entry.get("transferred") or 0) / 1024, 1),
+            entry.get("requests"), ", ".join(entry.get("over_budget") or []),
+        ]
+        for entry in entries
+    ]
+    return headers, rows, {2: 55, 11: 40}, 2
+
+
+def _soak_table(samples):
+    headers = [
+        "Iteration", "Time", "Duration (s)", "Failed", "JS Heap (MB)", "DOM Nodes",
+        "Listeners", "Documents", "Driver RSS (MB)", "Browser RSS (MB)",
+        "Growth (MB/h)", "Recycled",
+    ]
+    rows = [
+        [
+            s["iteration"], s["time"], s["seconds"], "yes" if s["failed"] else "",
+            s.get("js_heap_mb"), s.get("dom_nodes"), s.get("listeners"), s.get("documents"),
+            s.get("driver_rss_mb"), s.get("browser_rss_mb"), s.get("growth_mb_per_hour"),
+            s.get("recycled") or "",
+        ]
+        for s in samples
+    ]
+    return headers, rows, {12: 35}, 0
+
+
+def _collect_extras(results):
+    """Command samples, network entries and page metrics of step events."""
+    samples, network, page_metrics = {}, [], []
+    for result in results:
+        for name, values in result.get("command_samples", {}).items():
+            samples.setdefault(name, []).extend(values)
+        network.extend(result.get("network", []))
+        page_metrics.extend(result.get("page_metrics", []))
+    return samples, network, page_metrics
 
 
 class ExcelReporter:
-    
+
 
     _BLUE = "1F4E79"
     _WHITE = "FFFFFF"
@@ -21,6 +127,20 @@ class ExcelReporter:
         left=Side("thin"), right=Side("thin"),
         top=Side("thin"), bottom=Side("thin"),
     )
+    _HEADERS = [
+        "#", "Test Step", "Status", "Details", "Time",
+        "Duration (s)", "Commands", "Cmd Time (s)", "Waits / Polls", "Wait Time (s)",
+    ]
+    _COLS = len(_HEADERS)
+
+    # Style objects shared by every cell that uses them.
+    _HEADER_FONT = Font(bold=True, color=_WHITE, size=10)
+    _HEADER_FILL = PatternFill("solid", fgColor=_BLUE)
+    _HEADER_ALIGN = Alignment(horizontal="center", vertical="center")
+    _CENTER = Alignment(horizontal="center")
+    _PLAIN_FONT = Font(size=10)
+    _fonts = {}
+    _fills = {}
 
     def __init__(self, path="test_report.xlsx"):
         self.path = os.path.abspath(path)
@@ -29,40 +149,61 @@ class ExcelReporter:
         self.ws.title = "Test Report"
         self._data_start = 5
         self._step_count = 0
+        # Running status per step, so the summary never rescans the rows.
+        self._status = {}
+        self._counts = {"PASSED": 0, "FAILED": 0}
+        self._summary_row = None
+
+    @classmethod
+    def _font(cls, color, bold=False, underline=False):
+        key = (color, bold, underline)
+        if key not in cls._fonts:
+            cls._fonts[key] = Font(
+                color=color, size=10, bold=bold, underline="single" if underline else None
+            )
+        return cls._fonts[key]
+
+    @classmethod
+    def _fill(cls, color):
+        if color not in cls._fills:
+            cls._fills[color] = PatternFill("solid", fgColor=color)
+        return cls._fills[color]
+
 
-    
 
     def add_steps(self, steps: list):
-        """Register all steps as Pending and write the initial spreadsheet."""
+        """Register all steps as Pending. Call :meth:`save` to write the file."""
         ws = self.ws
-        widths = {"A": 6, "B": 55, "C": 14, "D": 65, "E": 12}
+        widths = {
+            "A": 6, "B": 55, "C": 14, "D": 65, "E": 12,
+            "F": 13, "G": 11, "H": 13, "I": 13, "J": 13,
+        }
+
 
-     
-        ws.merge_cells("A1:E1")
+        ws.merge_cells("A1:J1")
         title = ws["A1"]
         title.value = "INSIDER QA ENGINEER ASSESSMENT"
         title.font = Font(bold=True, size=14, color=self._WHITE)
-        title.fill = PatternFill("solid", fgColor=self._BLUE)
-        title.alignment = Alignment(horizontal="center", vertical="center")
+        title.fill = self._HEADER_FILL
+        title.alignment = self._HEADER_ALIGN
         ws.row_dimensions[1].height = 32
 
-        
-        ws.merge_cells("A2:E2")
+
+        ws.merge_cells("A2:J2")
         sub = ws["A2"]
         sub.value = f"Test Execution — {datetime.now().strftime('%d %B %Y, %H:%M:%S')}"
         sub.font = Font(italic=True, size=10, color="444444")
-        sub.alignment = Alignment(horizontal="center")
+        sub.alignment = self._CENTER
         ws.row_dimensions[2].height = 20
 
         ws.row_dimensions[3].height = 6
 
-      
-        headers = ["#", "Test Step", "Status", "Details", "Time"]
-        for col, h in enumerate(headers, 1):
+
+        for col, h in enumerate(self._HEADERS, 1):
             cell = ws.cell(row=4, column=col, value=h)
-            cell.font = Font(bold=True, color=self._WHITE, size=10)
-            cell.fill = PatternFill("solid", fgColor=self._BLUE)
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+            cell.font = self._HEADER_FONT
+            cell.fill = self._HEADER_FILL
+            cell.alignment = self._HEADER_ALIGN
             cell.border = self._BORDER
         ws.row_dimensions[4].height = 22
 
@@ -70,80 +211,367 @@ class ExcelReporter:
             ws.column_dimensions[letter].width = w
         ws.freeze_panes = "A5"
 
-       
+
         self._step_count = len(steps)
+        fill, font = self._fill(self._GREY_BG), self._font(self._GREY_FG)
         for i, desc in enumerate(steps, 1):
             row = self._data_start + i - 1
-            for col in range(1, 6):
+            for col in range(1, self._COLS + 1):
                 c = ws.cell(row=row, column=col)
-                c.fill = PatternFill("solid", fgColor=self._GREY_BG)
-                c.font = Font(color=self._GREY_FG, size=10)
+                c.fill = fill
+                c.font = font
                 c.border = self._BORDER
-            ws.cell(row=row, column=1, value=i).alignment = Alignment(horizontal="center")
+            ws.cell(row=row, column=1, value=i).alignment = self._CENTER
             ws.cell(row=row, column=2, value=desc)
-            ws.cell(row=row, column=3, value="Pending").alignment = Alignment(horizontal="center")
+            ws.cell(row=row, column=3, value="Pending").alignment = self._CENTER
 
         self._write_summary()
-        self.wb.save(self.path)
 
-    
 
-    def pass_step(self, step: int, details: str = ""):
-        self._set(step, "PASSED", details, self._GREEN_BG, self._GREEN_FG)
 
-    def fail_step(self, step: int, details: str = ""):
-        self._set(step, "FAILED", details, self._RED_BG, self._RED_FG)
+    def pass_step(self, step: int, details: str = "", metrics: dict = None):
+        self._set(step, "PASSED", details, self._GREEN_BG, self._GREEN_FG, metrics=metrics)
+
+    def fail_step(self, step: int, details: str = "", metrics: dict = None,
+                  artifacts: str = None):
+        """Mark *step* failed; *artifacts* is a failure artifact directory to link."""
+        self._set(step, "FAILED", details, self._RED_BG, self._RED_FG,
+                  metrics=metrics, artifacts=artifacts)
 
-    def _set(self, step, status, details, bg, fg):
+    def _set(self, step, status, details, bg, fg, when=None, metrics=None, artifacts=None):
         row = self._data_start + step - 1
         ws = self.ws
+        previous = self._status.get(step)
+        if previous in self._counts:
+            self._counts[previous] -= 1
+        self._status[step] = status
+        self._counts[status] += 1
+
         ws.cell(row=row, column=3, value=status)
-        ws.cell(row=row, column=4, value=str(details)[:250])
-        ws.cell(row=row, column=5, value=datetime.now().strftime("%H:%M:%S"))
-        for col in range(1, 6):
+        details_cell = ws.cell(row=row, column=4, value=str(details)[:250])
+        if artifacts:
+            details_cell.hyperlink = os.path.relpath(artifacts, os.path.dirname(self.path))
+        ws.cell(row=row, column=5, value=when or datetime.now().strftime("%H:%M:%S"))
+        if metrics:
+            ws.cell(row=row, column=6, value=metrics.get("duration"))
+            if "commands" in metrics:
+                ws.cell(row=row, column=7, value=metrics["commands"])
+                ws.cell(row=row, column=8, value=metrics["command_time"])
+                ws.cell(row=row, column=9, value=f"{metrics['waits']} / {metrics['wait_polls']}")
+                ws.cell(row=row, column=10, value=metrics["wait_time"])
+        fill = self._fill(bg)
+        for col in range(1, self._COLS + 1):
             c = ws.cell(row=row, column=col)
-            c.fill = PatternFill("solid", fgColor=bg)
-            c.font = Font(color=fg, size=10, bold=(col == 3))
+            c.fill = fill
+            c.font = self._font(fg, bold=(col == 3), underline=(col == 4 and bool(artifacts)))
             c.border = self._BORDER
-        ws.cell(row=row, column=1).alignment = Alignment(horizontal="center")
-        ws.cell(row=row, column=3).alignment = Alignment(horizontal="center")
+        ws.cell(row=row, column=1).alignment = self._CENTER
+        ws.cell(row=row, column=3).alignment = self._CENTER
+        for col in range(6, self._COLS + 1):
+            ws.cell(row=row, column=col).alignment = self._CENTER
         self._write_summary()
-        self.wb.save(self.path)
 
 
     def _write_summary(self):
         ws = self.ws
         r = self._data_start + self._step_count + 1
-        passed = sum(
-            1 for i in range(self._step_count)
-            if ws.cell(row=self._data_start + i, column=3).value == "PASSED"
-        )
-        failed = sum(
-            1 for i in range(self._step_count)
-            if ws.cell(row=self._data_start + i, column=3).value == "FAILED"
-        )
+        passed, failed = self._counts["PASSED"], self._counts["FAILED"]
         pending = self._step_count - passed - failed
 
-        ws.merge_cells(f"A{r}:B{r}")
-        summary = ws.cell(row=r, column=1)
-        summary.value = "SUMMARY"
-        summary.font = Font(bold=True, size=11, color=self._BLUE)
-        summary.alignment = Alignment(horizontal="right")
+        if self._summary_row != r:
+            self._summary_row = r
+            ws.merge_cells(f"A{r}:B{r}")
+            summary = ws.cell(row=r, column=1)
+            summary.value = "SUMMARY"
+            summary.font = Font(bold=True, size=11, color=self._BLUE)
+            summary.alignment = Alignment(horizontal="right")
+            ws.cell(row=r, column=3).font = self._font(self._GREEN_FG, bold=True)
+            ws.cell(row=r, column=3).alignment = self._CENTER
 
-        ws.cell(row=r, column=3, value=f"{passed} Passed").font = Font(
-            color=self._GREEN_FG, bold=True, size=10
-        )
-        ws.cell(row=r, column=3).alignment = Alignment(horizontal="center")
+        ws.cell(row=r, column=3, value=f"{passed} Passed")
         ws.cell(row=r, column=4).value = (
             f"{failed} Failed / {pending} Pending" if (failed or pending)
             else "All steps passed!"
         )
-        ws.cell(row=r, column=4).font = Font(
-            color=self._RED_FG if failed else self._GREEN_FG, bold=True, size=10
+        ws.cell(row=r, column=4).font = self._font(
+            self._RED_FG if failed else self._GREEN_FG, bold=True
         )
 
-    
+
+
+    def _add_table_sheet(self, title, table):
+        headers, rows, widths, first_centered = table
+        ws = self.wb.create_sheet(title)
+        for col, h in enumerate(headers, 1):
+            cell = ws.cell(row=1, column=col, value=h)
+            cell.font = self._HEADER_FONT
+            cell.fill = self._HEADER_FILL
+            cell.alignment = self._HEADER_ALIGN
+            cell.border = self._BORDER
+            ws.column_dimensions[get_column_letter(col)].width = widths.get(col, 16)
+        for row, cells in enumerate(rows, 2):
+            for col, value in enumerate(cells, 1):
+                c = ws.cell(row=row, column=col, value=value)
+                c.font = self._PLAIN_FONT
+                c.border = self._BORDER
+                if col > first_centered:
+                    c.alignment = self._CENTER
+        ws.freeze_panes = "A2"
+        return ws
+
+    def add_latency_sheet(self, samples: dict):
+        """Add a sheet with p50/p95/max latency per WebDriver command.
+
+        *samples* maps a command name (``find``, ``click``, ``wait`` ...) to
+        its durations in seconds.
+        """
+        return self._add_table_sheet("Command Latency", _latency_table(samples))
+
+    def add_network_sheet(self, entries: list):
+        """Add a sheet with requests loaded and blocked per page navigation."""
+        return self._add_table_sheet("Network", _network_table(entries))
+
+    def add_page_metrics_sheet(self, entries: list):
+        """Add a sheet with load timings per page navigation (see page_metrics)."""
+        ws = self._add_table_sheet("Page Load", _page_metrics_table(entries))
+        font, fill = self._font(self._RED_FG), self._fill(self._RED_BG)
+        for row, entry in enumerate(entries, 2):
+            if entry.get("over_budget"):
+                for cell in ws[row]:
+                    cell.font = font
+                    cell.fill = fill
+        return ws
+
+    def add_soak_sheet(self, samples: list):
+        """Add a sheet with latency and browser memory per soak iteration (see soak)."""
+        return self._add_table_sheet("Soak", _soak_table(samples))
+
+    def save(self):
+        self.wb.save(self.path)
+
+    @classmethod
+    def from_events(cls, events, path="test_report.xlsx", large=None):
+        """Build a report from a result log (see :mod:`result_log`).
+
+        Steps of every test in the log are listed in order. When the log
+        holds more than one test, each step is prefixed with its test name.
+        Logs with more than ``LARGE_REPORT_ROWS`` steps (or any log, with
+        ``large=True``) get a :class:`LargeExcelReporter` instead.
+        """
+        tests = collect_tests(events)
+        rows = sum(len(entry["steps"]) for entry in tests.values())
+        if large or (large is None and rows > LARGE_REPORT_ROWS):
+            return LargeExcelReporter.from_tests(tests, path)
+
+        descs, results = [], []
+        for test, entry in tests.items():
+            name = test.rpartition("::")[2]
+            for i, desc in enumerate(entry["steps"], 1):
+                descs.append(f"[{name}] {desc}" if len(tests) > 1 else desc)
+                results.append(entry["results"].get(i))
+
+        report = cls(path)
+        report.add_steps(descs)
+        for i, result in enumerate(results, 1):
+            if result is None:
+                continue
+            if result["status"] == "PASSED":
+                bg, fg = cls._GREEN_BG, cls._GREEN_FG
+            else:
+                bg, fg = cls._RED_BG, cls._RED_FG
+            report._set(
+                i, result["status"], result["details"], bg, fg, result["time"], result,
+                result.get("artifacts"),
+            )
+        samples, network, page_metrics = _collect_extras(r for r in results if r)
+        if samples:
+            report.add_latency_sheet(samples)
+        if network:
+            report.add_network_sheet(network)
+        if page_metrics:
+            report.add_page_metrics_sheet(page_metrics)
+        return report
+
+    def open_file(self):
+        """Open the final Excel report in the default spreadsheet app."""
+        return open_in_default_app(self.path)
+
+
+class LargeExcelReporter:
+    """Write-only report for runs with thousands of steps.
+
+    Rows are streamed with openpyxl's write-only mode: each sheet spills to
+    a temporary file instead of keeping a cell object per value, so memory
+    stays flat as rows grow. Cells use named styles that are registered
+    once per workbook. Pass/fail/pending counts are kept as rows are
+    written. Every test class gets its own sheet, and a "Summary" sheet
+    in front lists the counts per class.
+
+    Budget for 50,000 rows: under 30 s and under 10 MB peak Python memory
+    (about 70 MB process RSS) with openpyxl's pure-Python XML writer. The
+    lxml writer, when installed, is faster. Rows cannot be changed once
+    written, so the report is built in one pass from a finished log.
+    """
+
+    _HEADERS = ["#", "Test"] + ExcelReporter._HEADERS[1:]
+    _WIDTHS = {1: 7, 2: 40, 3: 55, 4: 12, 5: 65, 6: 10}
+    _STATUS_COLORS = {
+        "Pending": (ExcelReporter._GREY_BG, ExcelReporter._GREY_FG),
+        "PASSED": (ExcelReporter._GREEN_BG, ExcelReporter._GREEN_FG),
+        "FAILED": (ExcelReporter._RED_BG, ExcelReporter._RED_FG),
+    }
+
+    def __init__(self, path="test_report.xlsx"):
+        self.path = os.path.abspath(path)
+        self.wb = Workbook(write_only=True)
+        self._style_cache = {}
+        self._register_styles()
+        self._summary = self._new_sheet("Summary", {1: 45, 2: 10, 3: 10, 4: 10, 5: 10, 6: 10})
+        self._sheets = {}
+        self.counts = {}
+
+    def _register_styles(self):
+        header = NamedStyle("qa_header")
+        header.font = ExcelReporter._HEADER_FONT
+        header.fill = ExcelReporter._HEADER_FILL
+        header.alignment = ExcelReporter._HEADER_ALIGN
+        header.border = ExcelReporter._BORDER
+        self.wb.add_named_style(header)
+        for status, (bg, fg) in self._STATUS_COLORS.items():
+            for variant, alignment in (("", None), ("_center", ExcelReporter._CENTER)):
+                for bold in (False, True):
+                    style = NamedStyle(f"qa_{status.lower()}{variant}{'_bold' if bold else ''}")
+                    style.font = Font(color=fg, size=10, bold=bold)
+                    style.fill = PatternFill("solid", fgColor=bg)
+                    style.border = ExcelReporter._BORDER
+                    if alignment is not None:
+                        style.alignment = alignment
+                    self.wb.add_named_style(style)
+        plain = NamedStyle("qa_plain")
+        plain.font = ExcelReporter._PLAIN_FONT
+        plain.border = ExcelReporter._BORDER
+        self.wb.add_named_style(plain)
+
+    def _new_sheet(self, title, widths, headers=None):
+        ws = self.wb.create_sheet(title)
+        # Write-only sheets need their layout set before the first row.
+        for col, width in widths.items():
+            ws.column_dimensions[get_column_letter(col)].width = width
+        ws.freeze_panes = "A2"
+        if headers is not None:
+            self._append(ws, headers, lambda col: "qa_header")
+        return ws
+
+    def _append(self, ws, values, style_of, links=None):
+        row = []
+        for col, value in enumerate(values, 1):
+            cell = WriteOnlyCell(ws, value)
+            name = style_of(col)
+            if name not in self._style_cache:
+                # Resolving a named style by name scans the workbook's list.
+                cell.style = name
+                self._style_cache[name] = cell._style
+            cell._style = copy(self._style_cache[name])
+            if links and col in links:
+                cell.hyperlink = links[col]
+            row.append(cell)
+        ws.append(row)
+
+    @staticmethod
+    def _group(test):
+        """Sheet a test goes to: its class, or its module for plain functions."""
+        parts = test.split("::")
+        if len(parts) > 2:
+            return parts[-2]
+        return os.path.splitext(os.path.basename(parts[0]))[0]
+
+    def _sheet(self, group):
+        if group not in self._sheets:
+            title = re.sub(r"[\[\]:*?/\\]", "_", group)[:31]
+            taken = {ws.title for ws in self.wb.worksheets}
+            base, n = title, 2
+            while title in taken:
+                suffix = f"_{n}"
+                title, n = base[:31 - len(suffix)] + suffix, n + 1
+            self._sheets[group] = self._new_sheet(title, self._WIDTHS, self._HEADERS)
+            self.counts[group] = {"tests": 0, "PASSED": 0, "FAILED": 0, "Pending": 0}
+        return self._sheets[group]
+
+    def add_test(self, test, steps, results):
+        """Write the rows of one test to its class sheet."""
+        group = self._group(test)
+        ws = self._sheet(group)
+        counts = self.counts[group]
+        counts["tests"] += 1
+        name = test.rpartition("::")[2]
+        for i, desc in enumerate(steps, 1):
+            result = results.get(i) or {}
+            status = result.get("status", "Pending")
+            counts[status] += 1
+            metrics = [
+                result.get("duration"), result.get("commands"), result.get("command_time"),
+                f"{result['waits']} / {result['wait_polls']}" if "waits" in result else None,
+                result.get("wait_time"),
+            ]
+            values = [i, name, desc, status, result.get("details", ""), result.get("time")]
+            prefix = f"qa_{status.lower()}"
+
+            def style_of(col):
+                centered = col in (1, 4) or col > 6
+                return f"{prefix}{'_center' if centered else ''}{'_bold' if col == 4 else ''}"
+
+            links = {}
+            if result.get("artifacts"):
+                links[5] = os.path.relpath(result["artifacts"], os.path.dirname(self.path))
+            self._append(ws, values + metrics, style_of, links)
+
+    def add_table(self, title, table):
+        headers, rows, widths, first_centered = table
+        ws = self._new_sheet(title, {col: widths.get(col, 16) for col in range(1, len(headers) + 1)},
+                             headers)
+        for row in rows:
+            self._append(ws, row, lambda col: "qa_plain")
+        return ws
+
+    def add_soak_sheet(self, samples):
+        return self.add_table("Soak", _soak_table(samples))
+
+    def save(self):
+        self._append(
+            self._summary, ["Test class", "Tests", "Steps", "Passed", "Failed", "Pending"],
+            lambda col: "qa_header",
+        )
+        totals = {"tests": 0, "PASSED": 0, "FAILED": 0, "Pending": 0}
+        for group, counts in self.counts.items():
+            self._append(self._summary, self._summary_row(group, counts), lambda col: "qa_plain")
+            for key in totals:
+                totals[key] += counts[key]
+        self._append(self._summary, self._summary_row("TOTAL", totals),
+                     lambda col: "qa_failed_bold" if totals["FAILED"] else "qa_passed_bold")
+        self.wb.save(self.path)
+
+    @staticmethod
+    def _summary_row(label, counts):
+        steps = counts["PASSED"] + counts["FAILED"] + counts["Pending"]
+        return [label, counts["tests"], steps, counts["PASSED"], counts["FAILED"], counts["Pending"]]
+
+    @classmethod
+    def from_tests(cls, tests, path="test_report.xlsx"):
+        """Build the report from :func:`~result_log.collect_tests` output."""
+        report = cls(path)
+        for test, entry in tests.items():
+            report.add_test(test, entry["steps"], entry["results"])
+        samples, network, page_metrics = _collect_extras(
+            r for entry in tests.values() for r in entry["results"].values()
+        )
+        if samples:
+            report.add_table("Command Latency", _latency_table(samples))
+        if network:
+            report.add_table("Network", _network_table(network))
+        if page_metrics:
+            report.add_table("Page Load", _page_metrics_table(page_metrics))
+        return report
 
     def open_file(self):
         """Open the final Excel report in the default spreadsheet app."""
-        subprocess.Popen(["open", self.path])
+        return open_in_default_app(self.path)
@@ -0,0 +1,155 @@
+"""Failure artifacts captured on the test thread and written in the background.
+
+When a step fails, :class:`FailureArtifacts` grabs the screenshot, page
+source, browser console log and current URL from the driver. Those are
+only the WebDriver calls. The raw data goes on the queue of an
+:class:`ArtifactStore`, whose writer thread decodes and compresses it and
+writes it to disk. The test thread never waits for encoding or file I/O.
+
+Each failure gets its own directory under the store::
+
+    artifacts/20241017-101502-4711-3-test_insider_career_workflow-step12/
+        screenshot.png  page_source.html.gz  console.json.gz  url.txt
+
+The screenshot is already deflate-compressed PNG, so it is written as-is.
+The page source and console log are gzipped. The store keeps its total
+size under *max_bytes* by deleting the least recently written failure
+directories.
+"""
+import base64
+import gzip
+import json
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from collections import OrderedDict
+
+from selenium.common.exceptions import WebDriverException
+
+
+class ArtifactStore:
+    """Size-capped directory of failure artifacts with a background writer."""
+
+    def __init__(self, directory="artifacts", max_bytes=200 * 1024 * 1024):
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self.written = 0
+        self.evicted = 0
+        self.failed = []  # (path, error) of failures that could not be written
+        self._sizes = OrderedDict()
+        self._counter = 0
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        os.makedirs(self.directory, exist_ok=True)
+        self._scan()
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, label, captured: dict):
+        """Queue *captured* for writing and return its directory right away.
+
+        *captured* is the dict built by :meth:`FailureArtifacts.capture`.
+        """
+        with self._lock:
+            self._counter += 1
+            counter = self._counter
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", label)[:80]
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{counter}-{slug}"
+        path = os.path.join(self.directory, name)
+        self._queue.put((path, captured))
+        return path
+
+    def close(self):
+        """Write everything still queued, then stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            path, captured = item
+            try:
+                size = self._write(path, captured)
+            except Exception as e:
+                # Bad capture data (e.g. an undecodable screenshot) must not
+                # stop the writer; the other failures still get saved.
+                shutil.rmtree(path, ignore_errors=True)
+                self.failed.append((path, f"{type(e).__name__}: {e}"[:250]))
+                continue
+            self._sizes[path] = size
+            self.written += 1
+            self._evict()
+
+    @staticmethod
+    def _write(path, captured):
+        os.makedirs(path, exist_ok=True)
+        files = {}
+        if captured.get("screenshot"):
+            files["screenshot.png"] = base64.b64decode(captured["screenshot"])
+        if captured.get("page_source") is not None:
+            files["page_source.html.gz"] = gzip.compress(
+                captured["page_source"].encode("utf-8")
+            )
+        if captured.get("console") is not None:
+            files["console.json.gz"] = gzip.compress(
+                json.dumps(captured["console"], ensure_ascii=False).encode("utf-8")
+            )
+        files["url.txt"] = (captured.get("url") or "").encode("utf-8")
+        for filename, data in files.items():
+            with open(os.path.join(path, filename), "wb") as fh:
+                fh.write(data)
+        return sum(len(data) for data in files.values())
+
+    def _evict(self):
+        total = sum(self._sizes.values())
+        while total > self.max_bytes and len(self._sizes) > 1:
+            path, size = self._sizes.popitem(last=False)
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            self.evicted += 1
+
+    def _scan(self):
+        """Load existing failure directories, oldest first, so the cap spans runs."""
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not os.path.isdir(path):
+                continue
+            size = sum(
+                os.path.getsize(os.path.join(path, f)) for f in os.listdir(path)
+            )
+            entries.append((os.path.getmtime(path), path, size))
+        for _, path, size in sorted(entries):
+            self._sizes[path] = size
+
+
+class FailureArtifacts:
+    """Captures the state of *driver* on failure and hands it to *store*."""
+
+    def __init__(self, store: ArtifactStore, driver):
+        self.store = store
+        self.driver = driver
+
+    def capture(self):
+        """Return the raw failure state; every part is optional."""
+        captured = {}
+        for key, grab in (
+            ("url", lambda d: d.current_url),
+            ("screenshot", lambda d: d.get_screenshot_as_base64()),
+            ("page_source", lambda d: d.page_source),
+            ("console", lambda d: d.get_log("browser")),
+        ):
+            try:
+                captured[key] = grab(self.driver)
+            except (AttributeError, WebDriverException):
+                captured[key] = None
+        return captured
+
+    def save(self, label):
+        """Capture now, write later; returns the artifact directory."""
+        return self.store.submit(label, self.capture())
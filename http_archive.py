@@ -0,0 +1,283 @@
+"""Record-and-replay HTTP archive for deterministic, offline runs.
+
+Record mode (``--archive-mode record``) watches the Chrome performance log
+and stores every response of the session, body included, in an archive
+directory. The log is polled after every navigation, click and script, so
+each body is fetched with ``Network.getResponseBody`` right after its
+``Network.loadingFinished``, before Chrome evicts it. A response whose body
+can no longer be fetched is left out, so replay reports it as a miss
+instead of serving an empty body. Replay mode (``--archive-mode replay``) serves
+that archive from local HTTP and HTTPS servers. Chrome is pointed at them
+with ``--host-resolver-rules``, so the page objects keep their real URLs
+(``HomePage.URL`` etc.) and load them from disk instead of the internet.
+
+Requests are matched by method, scheme, host, path and sorted query string,
+with cache-busting parameters removed. If that fails, a request matches the
+recorded response with the same path and no query. Anything else is a miss:
+it gets a 404 and is reported at the end of the session.
+
+Record with a single process; parallel workers would overwrite each
+other's index, so ``--archive-mode record`` rejects ``--workers``.
+"""
+import base64
+import hashlib
+import json
+import os
+import ssl
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+from network_policy import drain_performance_log
+
+
+VOLATILE_PARAMS = {"_", "cb", "cachebuster", "rnd", "random", "t", "ts", "timestamp"}
+
+# Response headers that describe the original transfer, not the stored body.
+DROPPED_HEADERS = {
+    "content-encoding", "content-length", "transfer-encoding", "connection",
+    "keep-alive", "alt-svc", "strict-transport-security",
+}
+
+
+def request_key(method, url):
+    """Normalised lookup key for a request."""
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    if parts.port and parts.port != {"http": 80, "https": 443}.get(parts.scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k not in VOLATILE_PARAMS and not k.startswith("utm_")
+    )
+    key = f"{method.upper()} {parts.scheme}://{host}{parts.path or '/'}"
+    return f"{key}?{urlencode(query)}" if query else key
+
+
+class HttpArchive:
+    """Responses stored on disk: ``index.json`` plus one file per unique body."""
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.entries = {}
+        self.misses = []
+        self.unrecorded = []  # responses whose body was gone when recording
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        archive = cls(path)
+        index = os.path.join(archive.path, "index.json")
+        if os.path.exists(index):
+            with open(index, encoding="utf-8") as fh:
+                archive.entries = json.load(fh)
+        return archive
+
+    def add(self, method, url, status, headers, body: bytes):
+        os.makedirs(os.path.join(self.path, "bodies"), exist_ok=True)
+        digest = hashlib.sha1(body).hexdigest()
+        body_path = os.path.join(self.path, "bodies", digest)
+        if not os.path.exists(body_path):
+            with open(body_path, "wb") as fh:
+                fh.write(body)
+        headers = {k: v for k, v in headers.items() if k.lower() not in DROPPED_HEADERS}
+        with self._lock:
+            self.entries[request_key(method, url)] = {
+                "url": url, "status": status, "headers": headers, "body": digest,
+            }
+
+    def lookup(self, method, url, count_miss=True):
+        """Return ``(status, headers, body)`` for a request, or None on a miss.
+
+        With *count_miss* False a miss is not reported, for lookups that
+        have another entry to fall back on.
+        """
+        key = request_key(method, url)
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries.get(key.split("?", 1)[0])
+        if entry is None:
+            if count_miss:
+                with self._lock:
+                    self.misses.append(key)
+            return None
+        with open(os.path.join(self.path, "bodies", entry["body"]), "rb") as fh:
+            return entry["status"], entry["headers"], fh.read()
+
+    def save(self):
+        os.makedirs(self.path, exist_ok=True)
+        index = os.path.join(self.path, "index.json")
+        tmp = index + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(self.entries, fh, indent=1, sort_keys=True)
+        os.replace(tmp, index)
+
+
+class ArchiveRecorder:
+    """Copies the responses seen in the performance log into an archive.
+
+    *driver* is the unwrapped driver whose log is polled. The messages read
+    by :meth:`poll` are kept until :meth:`drain` hands them on, so callers
+    that read the log for other reasons still see every message.
+    """
+
+    def __init__(self, archive, driver=None):
+        self.archive = archive
+        self.driver = driver
+        self._requests = {}
+        self._responses = {}
+        self._backlog = []
+
+    @staticmethod
+    def of(driver):
+        return getattr(driver, "_archive_recorder", None)
+
+    def attach(self, driver):
+        driver._archive_recorder = self
+        return driver
+
+    def poll(self):
+        """Archive the responses finished since the last poll."""
+        messages = drain_performance_log(self.driver)
+        if messages:
+            self.consume(self.driver, messages)
+            self._backlog.extend(messages)
+        return messages
+
+    def drain(self):
+        """Poll once more and return every message read since the last drain.
+
+        Like ``drain_performance_log``, returns None without a performance log.
+        """
+        if self.poll() is None and not self._backlog:
+            return None
+        messages, self._backlog = self._backlog, []
+        return messages
+
+    def consume(self, driver, messages):
+        """Record every completed response in *messages* (performance log)."""
+        for message in messages or ():
+            method, params = message.get("method"), message.get("params", {})
+            request_id = params.get("requestId")
+            if method == "Network.requestWillBeSent":
+                redirect = params.get("redirectResponse")
+                if redirect:
+                    self.archive.add(
+                        self._requests.get(request_id, "GET"), redirect["url"],
+                        redirect["status"], redirect.get("headers", {}), b"",
+                    )
+                self._requests[request_id] = params["request"]["method"]
+            elif method == "Network.responseReceived":
+                response = params["response"]
+                self._responses[request_id] = response
+            elif method == "Network.loadingFinished" and request_id in self._responses:
+                response = self._responses.pop(request_id)
+                method = self._requests.pop(request_id, "GET")
+                body = self._body(driver, request_id)
+                if body is None:
+                    self.archive.unrecorded.append(request_key(method, response["url"]))
+                    continue
+                self.archive.add(
+                    method, response["url"], response["status"],
+                    response.get("headers", {}), body,
+                )
+
+    @staticmethod
+    def _body(driver, request_id):
+        """Response body as bytes, or None when Chrome no longer has it."""
+        try:
+            result = driver.execute_cdp_cmd(
+                "Network.getResponseBody", {"requestId": request_id}
+            )
+        except WebDriverException:
+            return None
+        if result.get("base64Encoded"):
+            return base64.b64decode(result["body"])
+        return result["body"].encode("utf-8")
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _replay(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        scheme = self.server.scheme
+        url = f"{scheme}://{self.headers.get('Host', 'localhost')}{self.path}"
+        found = self.server.archive.lookup(self.command, url)
+        if found is None:
+            status, headers, body = 404, {"Content-Type": "text/plain"}, b"not in archive"
+        else:
+            status, headers, body = found
+        self.send_response(status)
+        for name, value in headers.items():
+            for line in str(value).split("\n"):
+                self.send_header(name, line)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    do_GET = do_POST = do_HEAD = do_OPTIONS = _replay
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ReplayServer:
+    """Serves an archive over HTTP and, with a certificate, HTTPS."""
+
+    def __init__(self, archive, host="127.0.0.1", https=True):
+        self.archive = archive
+        self._servers = [self._start(host, "http")]
+        if https:
+            self._servers.append(self._start(host, "https", self._tls_context()))
+
+    @property
+    def http_port(self):
+        return self._servers[0].server_address[1]
+
+    @property
+    def https_port(self):
+        return self._servers[1].server_address[1] if len(self._servers) > 1 else None
+
+    def chrome_arguments(self):
+        """Flags that route every host to this server and accept its certificate."""
+        rules = [f"MAP *:80 127.0.0.1:{self.http_port}"]
+        if self.https_port:
+            rules.append(f"MAP *:443 127.0.0.1:{self.https_port}")
+        rules.append("EXCLUDE localhost")
+        return [f"--host-resolver-rules={','.join(rules)}", "--ignore-certificate-errors"]
+
+    def close(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+
+    def _start(self, host, scheme, context=None):
+        server = ThreadingHTTPServer((host, 0), _ReplayHandler)
+        server.daemon_threads = True
+        server.archive = self.archive
+        server.scheme = scheme
+        if context is not None:
+            server.socket = context.wrap_socket(server.socket, server_side=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def _tls_context(self):
+        cert = os.path.join(self.archive.path, "replay-cert.pem")
+        key = os.path.join(self.archive.path, "replay-key.pem")
+        if not os.path.exists(cert):
+            os.makedirs(self.archive.path, exist_ok=True)
+            subprocess.run(
+                ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+                 "-keyout", key, "-out", cert, "-days", "365", "-subj", "/CN=replay"],
+                check=True, capture_output=True,
+            )
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+        return context
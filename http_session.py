@@ -0,0 +1,23 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def build_session(pool_size=10, retries=2, backoff=0.2):
+    """``requests.Session`` that keeps up to *pool_size* connections per host alive.
+
+    Idempotent requests are retried on connection errors and 502/503/504.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(
+            total=retries, backoff_factor=backoff,
+            status_forcelist=(502, 503, 504), allowed_methods=("GET", "HEAD"),
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = "insider-qa-suite"
+    return session
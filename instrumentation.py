@@ -0,0 +1,199 @@
+"""Timing of steps, WebDriver commands and explicit waits.
+
+:func:`instrument` wraps a driver in Selenium's ``EventFiringWebDriver`` so
+every ``get``, ``find``, ``click`` and ``execute_script`` is timed, and
+:class:`InstrumentedWait` counts how many times a ``WebDriverWait`` polled.
+Both feed an :class:`Instrumentation` recorder whose per-step snapshot is
+attached to each step event by :class:`~result_log.StepRecorder`.
+"""
+import math
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.events import AbstractEventListener, EventFiringWebDriver
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+class Instrumentation:
+    """Collects command and wait timings for one test."""
+
+    def __init__(self):
+        self.samples = {}
+        self.network = []
+        self.page_metrics = []
+        self._reset_step()
+
+    @staticmethod
+    def of(driver):
+        """Return the recorder attached to *driver* by :func:`instrument`, if any."""
+        return getattr(driver, "_instrumentation", None)
+
+    def record_command(self, name, seconds):
+        self._sample(name, seconds)
+        self._commands += 1
+        self._command_time += seconds
+
+    def record_wait(self, seconds, polls, timed_out=False):
+        self._sample("wait", seconds)
+        self._waits += 1
+        self._polls += polls
+        self._wait_time += seconds
+        self._timeouts += timed_out
+
+    def record_network(self, page, url, stats):
+        entry = {"page": page, "url": url, **stats}
+        self.network.append(entry)
+        self._network.append(entry)
+
+    def record_page_metrics(self, page, url, metrics):
+        entry = {"page": page, "url": url, "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        entry.update(metrics)
+        self.page_metrics.append(entry)
+        self._page_metrics.append(entry)
+
+    def mark_step(self):
+        """Return the metrics gathered since the previous mark and start over."""
+        metrics = {
+            "commands": self._commands,
+            "command_time": round(self._command_time, 4),
+            "waits": self._waits,
+            "wait_polls": self._polls,
+            "wait_time": round(self._wait_time, 4),
+            "wait_timeouts": self._timeouts,
+            "command_samples": {
+                name: [round(s, 4) for s in values]
+                for name, values in self._step_samples.items()
+            },
+        }
+        if self._network:
+            metrics["network"] = self._network
+        if self._page_metrics:
+            metrics["page_metrics"] = self._page_metrics
+        self._reset_step()
+        return metrics
+
+    def _sample(self, name, seconds):
+        self.samples.setdefault(name, []).append(seconds)
+        self._step_samples.setdefault(name, []).append(seconds)
+
+    def _reset_step(self):
+        self._step_samples = {}
+        self._network = []
+        self._page_metrics = []
+        self._commands = 0
+        self._command_time = 0.0
+        self._waits = 0
+        self._polls = 0
+        self._wait_time = 0.0
+        self._timeouts = 0
+
+
+class _CommandListener(AbstractEventListener):
+    def __init__(self, recorder, after_command=None):
+        self._recorder = recorder
+        self._after_command = after_command
+        self._pending = None
+
+    def _start(self, name):
+        self._pending = (name, time.perf_counter())
+
+    def _stop(self):
+        if self._pending is not None:
+            name, start = self._pending
+            self._pending = None
+            self._recorder.record_command(name, time.perf_counter() - start)
+            # Finds only read the DOM; navigations, clicks and scripts may
+            # have loaded something.
+            if self._after_command is not None and name != "find":
+                self._after_command()
+
+    def before_navigate_to(self, url, driver):
+        self._start("get")
+
+    def after_navigate_to(self, url, driver):
+        self._stop()
+
+    def before_find(self, by, value, driver):
+        self._start("find")
+
+    def after_find(self, by, value, driver):
+        self._stop()
+
+    def before_click(self, element, driver):
+        self._start("click")
+
+    def after_click(self, element, driver):
+        self._stop()
+
+    def before_execute_script(self, script, driver):
+        self._start("execute_script")
+
+    def after_execute_script(self, script, driver):
+        self._stop()
+
+    def on_exception(self, exception, driver):
+        self._stop()
+
+
+def instrument(driver, recorder, after_command=None):
+    """Wrap *driver* so its commands are timed into *recorder*.
+
+    *after_command*, if given, is called after every navigation, click and
+    script, e.g. to poll the performance log while the page is current.
+    """
+    wrapped = EventFiringWebDriver(driver, _CommandListener(recorder, after_command))
+    wrapped._instrumentation = recorder
+    return wrapped
+
+
+class InstrumentedWait(WebDriverWait):
+    """``WebDriverWait`` that reports its duration and poll count.
+
+    *on_result*, if given, is called with ``(seconds, timed_out)`` after
+    every wait (see :mod:`wait_policy`).
+    """
+
+    def __init__(self, driver, timeout, recorder=None, on_result=None, **kwargs):
+        super().__init__(driver, timeout, **kwargs)
+        self._recorder = recorder
+        self._on_result = on_result
+
+    def until(self, method, message=""):
+        return self._timed(super().until, method, message)
+
+    def until_not(self, method, message=""):
+        return self._timed(super().until_not, method, message)
+
+    def _timed(self, wait, method, message):
+        if self._recorder is None and self._on_result is None:
+            return wait(method, message)
+        polls = 0
+
+        def counted(driver):
+            nonlocal polls
+            polls += 1
+            return method(driver)
+
+        start = time.perf_counter()
+        try:
+            result = wait(counted, message)
+        except TimeoutException:
+            self._report(time.perf_counter() - start, polls, timed_out=True)
+            raise
+        self._report(time.perf_counter() - start, polls, timed_out=False)
+        return result
+
+    def _report(self, seconds, polls, timed_out):
+        if self._recorder is not None:
+            self._recorder.record_wait(seconds, polls, timed_out=timed_out)
+        if self._on_result is not None:
+            self._on_result(seconds, timed_out)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of *values* (``pct`` in 0..100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
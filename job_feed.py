@@ -0,0 +1,93 @@
+"""Browser-free access to the job postings feed behind the open positions page.
+
+The open positions page renders its cards from the Lever postings API. This
+client reads the same feed over pooled HTTP connections. It applies the
+filter semantics of ``OpenPositionsPage.filter_by_location`` and
+``filter_by_department`` and returns the same ``Job`` records as
+``OpenPositionsPage.get_visible_jobs_data``, so data checks can run in
+milliseconds without a browser.
+"""
+from http_session import build_session
+from pages.open_positions_page import Job
+
+
+FEED_URL = "https://api.lever.co/v0/postings/insiderone"
+
+# Value of the page's "no filter" <option>.
+ALL = "All"
+
+
+class JobFeedClient:
+    """Fetches and filters postings from the feed at *url*."""
+
+    def __init__(self, url=FEED_URL, session=None, timeout=10):
+        self.url = url
+        self.session = session or build_session()
+        self.timeout = timeout
+        self._postings = None
+
+    def fetch(self, refresh=False):
+        """Return the raw postings, fetching them once per client."""
+        if self._postings is None or refresh:
+            response = self.session.get(
+                self.url, params={"mode": "json"}, timeout=self.timeout
+            )
+            response.raise_for_status()
+            self._postings = response.json()
+        return self._postings
+
+    def jobs(self, location=None, department=None):
+        """Return ``Job`` records matching the page's filters.
+
+        *location* matches a posting's primary location or any of its
+        additional locations, exactly as the dropdown value is written.
+        *department* must equal the posting's department. ``None`` or
+        ``"All"`` leaves a filter unset, like the page's default option.
+        A job matched through an additional location reports that location,
+        so location checks see the value that was filtered on.
+        """
+        return [
+            self._to_job(posting, location) for posting in self.fetch()
+            if self._matches(posting, location, department)
+        ]
+
+    def filter_options(self):
+        """Distinct location and department values, as the dropdowns list them."""
+        locations, departments = set(), set()
+        for posting in self.fetch():
+            categories = posting.get("categories", {})
+            locations.update(self._locations(categories))
+            if self._department(categories):
+                departments.add(self._department(categories))
+        return {"locations": sorted(locations), "departments": sorted(departments)}
+
+    @classmethod
+    def _matches(cls, posting, location, department):
+        categories = posting.get("categories", {})
+        if location not in (None, ALL) and location not in cls._locations(categories):
+            return False
+        if department not in (None, ALL) and department != cls._department(categories):
+            return False
+        return True
+
+    @staticmethod
+    def _locations(categories):
+        locations = list(categories.get("allLocations") or [])
+        if categories.get("location"):
+            locations.insert(0, categories["location"])
+        return locations
+
+    @staticmethod
+    def _department(categories):
+        return (categories.get("department") or categories.get("team") or "").strip()
+
+    @classmethod
+    def _to_job(cls, posting, location=None):
+        categories = posting.get("categories", {})
+        if location in (None, ALL):
+            location = categories.get("location") or ""
+        return Job(
+            position=posting.get("text", "").strip(),
+            department=cls._department(categories),
+            location=location.strip(),
+        )
@@ -0,0 +1,55 @@
+"""Concurrent checks of the job cards' "View Role" links over pooled HTTP.
+
+Clicking through to Lever costs a browser navigation per job. Instead,
+:meth:`OpenPositionsPage.audit_view_role_links
+<pages.open_positions_page.OpenPositionsPage.audit_view_role_links>`
+reads every visible card's href in one script call and hands the URLs to
+:func:`audit_links`. That function requests them from a small thread pool
+sharing one keep-alive session, so checking N links takes about as long as
+the slowest one.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+
+from http_session import build_session
+
+
+def check_link(session, url, timeout=10):
+    """Follow *url*'s redirects and return status, final host and latency.
+
+    Only the headers are read (``stream=True``), the body is never
+    downloaded. Connection problems come back as ``error`` instead of
+    raising.
+    """
+    start = time.perf_counter()
+    result = {"url": url, "status": None, "final_url": None, "final_host": None, "error": None}
+    try:
+        with session.get(url, timeout=timeout, allow_redirects=True, stream=True) as response:
+            result["status"] = response.status_code
+            result["final_url"] = response.url
+            result["final_host"] = urlsplit(response.url).hostname
+    except requests.RequestException as e:
+        result["error"] = f"{type(e).__name__}: {e}"[:250]
+    result["latency"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def audit_links(urls, session=None, workers=8, timeout=10):
+    """Check *urls* concurrently; results come back in the order of *urls*.
+
+    A *session* passed in is left open; one created here is closed.
+    """
+    if not urls:
+        return []
+    own_session = session is None
+    if own_session:
+        session = build_session(pool_size=workers)
+    try:
+        with ThreadPoolExecutor(max_workers=min(workers, len(urls))) as pool:
+            return list(pool.map(lambda url: check_link(session, url, timeout), urls))
+    finally:
+        if own_session:
+            session.close()
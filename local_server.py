@@ -0,0 +1,58 @@
+"""Tiny threaded HTTP server for stub feeds and local fixture pages."""
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        route = self.server.routes.get(urlsplit(self.path).path)
+        if route is None:
+            self._send(404, "text/plain", b"not found")
+            return
+        if callable(route):
+            route = route(self)
+        if len(route) == 2:
+            route = (200, *route)
+        self._send(*route)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def _send(self, status, content_type, body, headers=None):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def serve(routes, host="127.0.0.1", port=0):
+    """Serve *routes* on a background thread and yield the base URL.
+
+    *routes* maps a path to ``(content_type, body)``, ``(status,
+    content_type, body)``, ``(status, content_type, body, headers)`` or a
+    callable taking the request handler and returning one of those.
+    """
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.routes = routes
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://{host}:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
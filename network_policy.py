@@ -0,0 +1,152 @@
+"""Per-page request blocking through Chrome DevTools.
+
+A page object sets ``NETWORK_POLICY`` to a :class:`NetworkPolicy`, and
+:meth:`BasePage.open <pages.base_page.BasePage.open>` installs it with
+``Network.setBlockedURLs`` before navigating. It then reads the Chrome
+performance log to count what was loaded and what was blocked. DevTools
+only blocks by URL pattern, so resource types are mapped to the file
+extensions that carry them.
+
+Blocked requests never transfer anything, so their size is estimated from
+the sizes seen when the same URL was loaded unblocked (for example in a run
+with ``--no-network-policy``). Those sizes are kept in ``.network_sizes.json``
+by the test session's :class:`NetworkSession`, which also carries the
+``--no-network-policy`` switch.
+"""
+import json
+
+from selenium.common.exceptions import WebDriverException
+
+
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*"],
+    "font": ["*.woff*", "*.ttf*", "*.otf*", "*.eot*"],
+    "media": ["*.mp4*", "*.webm*", "*.mp3*", "*.ogg*"],
+}
+
+THIRD_PARTY_PATTERNS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*connect.facebook.*", "*hotjar.com*", "*clarity.ms*",
+    "*linkedin.com/px*", "*snap.licdn.com*", "*hs-scripts.com*", "*hs-analytics.net*",
+    "*hubspot.com*", "*intercom.io*", "*intercomcdn.com*", "*drift.com*",
+    "*zdassets.com*", "*youtube.com/embed*", "*vimeo.com*",
+]
+
+SIZES_PATH = ".network_sizes.json"
+
+
+class NetworkPolicy:
+    """URL patterns and resource types a page can load without."""
+
+    # The session's NetworkSession, installed by conftest; None blocks as
+    # coded and keeps no size table.
+    active = None
+
+    def __init__(self, block_patterns=(), block_types=()):
+        unknown = set(block_types) - set(RESOURCE_TYPE_PATTERNS)
+        if unknown:
+            raise ValueError(f"Unknown resource type(s): {', '.join(sorted(unknown))}")
+        self.block_patterns = list(block_patterns)
+        self.block_types = list(block_types)
+
+    @classmethod
+    def default(cls):
+        """Block images, fonts, media, analytics and chat widgets."""
+        return cls(THIRD_PARTY_PATTERNS, ("image", "font", "media"))
+
+    def url_patterns(self):
+        patterns = list(self.block_patterns)
+        for resource_type in self.block_types:
+            patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+        return patterns
+
+    def apply(self, driver):
+        """Install this policy on *driver*; returns False if CDP is unavailable."""
+        session = NetworkPolicy.active
+        enabled = session is None or session.enabled
+        return _set_blocked_urls(driver, self.url_patterns() if enabled else [])
+
+    @staticmethod
+    def clear(driver):
+        return _set_blocked_urls(driver, [])
+
+    @staticmethod
+    def collect(messages, sizes=None):
+        """Summarise the performance-log *messages* of one navigation.
+
+        Returns request count, transferred bytes, blocked request count
+        and the estimated bytes those blocked requests would have
+        transferred. *sizes* (URL -> bytes) is used for the estimate and
+        updated with the sizes of the loaded requests.
+        """
+        urls, blocked = {}, []
+        sizes = {} if sizes is None else sizes
+        stats = {"requests": 0, "bytes": 0, "blocked": 0, "blocked_bytes": 0}
+        for message in messages:
+            method, params = message.get("method"), message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                urls[params["requestId"]] = params["request"]["url"]
+                stats["requests"] += 1
+            elif method == "Network.loadingFinished":
+                size = int(params.get("encodedDataLength", 0))
+                stats["bytes"] += size
+                url = urls.get(params["requestId"])
+                if url and size:
+                    sizes[url] = size
+            elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                stats["blocked"] += 1
+                blocked.append(urls.get(params["requestId"]))
+        stats["blocked_bytes"] = sum(sizes.get(url, 0) for url in blocked)
+        return stats
+
+
+class NetworkSession:
+    """Blocking switch and URL size table of one test session."""
+
+    def __init__(self, enabled=True, sizes_path=SIZES_PATH):
+        # False with ``--no-network-policy``, for baseline measurements.
+        self.enabled = enabled
+        self.sizes_path = sizes_path
+        self._sizes = None
+
+    @property
+    def sizes(self):
+        if self._sizes is None:
+            try:
+                with open(self.sizes_path, encoding="utf-8") as fh:
+                    self._sizes = json.load(fh)
+            except (OSError, ValueError):
+                self._sizes = {}
+        return self._sizes
+
+    def collect(self, messages):
+        """:meth:`NetworkPolicy.collect` with this session's size table."""
+        return NetworkPolicy.collect(messages, self.sizes)
+
+    def save_sizes(self):
+        """Persist the URL size table used to estimate blocked bytes."""
+        if self._sizes:
+            with open(self.sizes_path, "w", encoding="utf-8") as fh:
+                json.dump(self._sizes, fh)
+
+
+def drain_performance_log(driver):
+    """Return the DevTools messages logged since the previous call.
+
+    Returns None when the driver has no performance log
+    (``goog:loggingPrefs`` unset or not Chrome).
+    """
+    try:
+        entries = driver.get_log("performance")
+    except (AttributeError, WebDriverException):
+        return None
+    return [json.loads(entry["message"])["message"] for entry in entries]
+
+
+def _set_blocked_urls(driver, patterns):
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        return True
+    except (AttributeError, WebDriverException):
+        return False
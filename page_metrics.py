@@ -0,0 +1,107 @@
+"""Page load performance metrics and per-page budgets.
+
+After every navigation, :meth:`BasePage.open <pages.base_page.BasePage.open>`
+reads the Navigation Timing entry and the buffered PerformanceObserver
+entries of the new document in one script call. Navigations started by a
+click or redirect ("See all QA jobs", the Lever redirect) are recorded the
+same way once the new document has fired its load event:
+
+``ttfb``, ``dom_content_loaded``, ``load``, ``lcp`` (all ms from navigation
+start), ``cls`` (unitless), ``transferred`` (bytes, document plus
+resources) and ``requests``.
+
+A page class sets ``PERFORMANCE_BUDGET`` to a :class:`PerformanceBudget`.
+Exceeding a limit raises :class:`PerformanceBudgetExceeded` from ``open()``,
+so the step that opened the page fails. Metrics a browser did not report
+(e.g. ``load`` with the eager page load strategy) are None and not checked.
+"""
+import json
+
+from selenium.common.exceptions import WebDriverException
+
+
+METRICS = ("ttfb", "dom_content_loaded", "load", "lcp", "cls", "transferred", "requests")
+
+_COLLECT_JS = """
+    var done = arguments[arguments.length - 1];
+    var lcp = null, cls = 0;
+    try {
+        new PerformanceObserver(function (list) {
+            list.getEntries().forEach(function (e) {
+                lcp = e.renderTime || e.loadTime || e.startTime;
+            });
+        }).observe({type: 'largest-contentful-paint', buffered: true});
+        new PerformanceObserver(function (list) {
+            list.getEntries().forEach(function (e) {
+                if (!e.hadRecentInput) cls += e.value;
+            });
+        }).observe({type: 'layout-shift', buffered: true});
+    } catch (e) {}
+    // Buffered entries are delivered in a later task.
+    setTimeout(function () {
+        var nav = performance.getEntriesByType('navigation')[0];
+        if (!nav) { done(null); return; }
+        var resources = performance.getEntriesByType('resource');
+        var bytes = nav.transferSize || 0;
+        resources.forEach(function (r) { bytes += r.transferSize || 0; });
+        function at(value) { return value > 0 ? Math.round(value) : null; }
+        done({
+            ttfb: at(nav.responseStart),
+            dom_content_loaded: at(nav.domContentLoadedEventEnd),
+            load: at(nav.loadEventEnd),
+            lcp: lcp === null ? null : Math.round(lcp),
+            cls: Math.round(cls * 1000) / 1000,
+            transferred: bytes,
+            requests: resources.length + 1
+        });
+    }, 0);
+"""
+
+
+class PerformanceBudgetExceeded(AssertionError):
+    """A page loaded slower (or heavier) than its ``PERFORMANCE_BUDGET``."""
+
+
+class PerformanceBudget:
+    """Upper limits for some of :data:`METRICS`, e.g. ``PerformanceBudget(load=8000)``."""
+
+    # Switched off by ``--no-performance-budgets``; metrics are still collected.
+    enabled = True
+
+    def __init__(self, **limits):
+        unknown = set(limits) - set(METRICS)
+        if unknown:
+            raise ValueError(f"Unknown metric(s): {', '.join(sorted(unknown))}")
+        self.limits = limits
+
+    def violations(self, metrics):
+        """Return ``"metric value > limit"`` for each limit *metrics* exceeds."""
+        return [
+            f"{name} {metrics[name]} > {limit}"
+            for name, limit in self.limits.items()
+            if metrics.get(name) is not None and metrics[name] > limit
+        ]
+
+    def check(self, page, url, metrics):
+        if not self.enabled:
+            return
+        violations = self.violations(metrics)
+        if violations:
+            raise PerformanceBudgetExceeded(
+                f"{page} over budget ({', '.join(violations)}): {url}"
+            )
+
+
+def collect_page_metrics(driver):
+    """Return the current document's load metrics, or None if unavailable."""
+    try:
+        return driver.execute_async_script(_COLLECT_JS)
+    except (AttributeError, WebDriverException):
+        return None
+
+
+def append_time_series(entries, path, run_id):
+    """Append one JSON line per page load to *path*, tagged with *run_id*."""
+    with open(path, "a", encoding="utf-8") as fh:
+        for entry in entries:
+            fh.write(json.dumps({"run": run_id, **entry}, ensure_ascii=False) + "\n")
@@ -1,32 +1,435 @@
+import hashlib
+import time
+
+from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import (
+    ElementClickInterceptedException, ElementNotInteractableException,
+    StaleElementReferenceException, TimeoutException, WebDriverException,
+)
+
+from instrumentation import Instrumentation, InstrumentedWait
+from http_archive import ArchiveRecorder
+from network_policy import NetworkPolicy, drain_performance_log
+from page_metrics import collect_page_metrics
+from static_html import StaticHtml
+from wait_policy import WaitPolicy
+
+
+# Shared by the batched query helpers: resolves [kind, selector] pairs
+# built by BasePage._query() against a context node, and tests visibility
+# the way a user would see it (has layout boxes and is not hidden).
+_DOM_QUERY_JS = """
+    function resolveAll(query, ctx) {
+        ctx = ctx || document;
+        if (query[0] === 'xpath') {
+            var snap = document.evaluate(query[1], ctx, null,
+                XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < snap.snapshotLength; i++) nodes.push(snap.snapshotItem(i));
+            return nodes;
+        }
+        return Array.prototype.slice.call(ctx.querySelectorAll(query[1]));
+    }
+    function isVisible(el) {
+        return el.getClientRects().length > 0
+            && getComputedStyle(el).visibility !== 'hidden';
+    }
+"""
+
+# Page-side DOM generation: a MutationObserver bumps the counter on every
+# batch of changes, and the random id changes with each new document, so
+# "id:counter" only repeats while the DOM is untouched.
+_DOM_GENERATION_JS = """function () {
+    var dom = window.__qaDomGeneration;
+    if (!dom) {
+        dom = window.__qaDomGeneration = {
+            id: Math.random().toString(36).slice(2), count: 0
+        };
+        new MutationObserver(function () { dom.count++; }).observe(
+            document.documentElement,
+            {childList: true, subtree: true, attributes: true}
+        );
+    }
+    return dom.id + ':' + dom.count;
+}"""
+
+# Load time of the current tab in seconds, from its own Navigation Timing
+# entry; null until the load event has finished.
+_TAB_LOAD_JS = """
+    var nav = performance.getEntriesByType('navigation')[0];
+    if (!nav || !nav.loadEventEnd) return null;
+    return Math.round(nav.loadEventEnd - nav.startTime) / 1000;
+"""
+
+# Calls a helper of the installed namespace, or reports it missing/stale
+# so BasePage._call() can reinstall it.
+_HELPER_CALL_JS = """
+    var qa = window.__qa;
+    if (!qa || qa.version !== arguments[0]) return {__qaMissing: true};
+    return qa.fn[arguments[1]].apply(null, arguments[2]);
+"""
+
+_HELPER_CALL_ASYNC_JS = """
+    var done = arguments[arguments.length - 1], qa = window.__qa;
+    if (!qa || qa.version !== arguments[0]) { done({__qaMissing: true}); return; }
+    qa.fn[arguments[1]].apply(null, arguments[2].concat([done]));
+"""
+
+
+class _HelperLibrary:
+    """Every page class's ``JS_HELPERS``, built into one versioned namespace.
+
+    The version is a hash of the helper sources, so changing or adding a
+    helper makes the copies installed in open documents stale.
+    """
+
+    def __init__(self):
+        self.helpers = {}
+        self._built = None
+
+    def register(self, helpers):
+        for name, source in helpers.items():
+            if self.helpers.get(name, source) != source:
+                raise ValueError(f"JS helper {name!r} is defined twice")
+        self.helpers.update(helpers)
+        self._built = None
+
+    def build(self):
+        """Return ``(version, source)`` of the install script."""
+        if self._built is None:
+            body = ",\n".join(
+                f"{name}: {source}" for name, source in sorted(self.helpers.items())
+            )
+            version = hashlib.sha1(body.encode("utf-8")).hexdigest()[:12]
+            source = (
+                "(function () {\n"
+                f"var version = '{version}';\n"
+                "if (window.__qa && window.__qa.version === version) return;\n"
+                f"{_DOM_QUERY_JS}\n"
+                f"window.__qa = {{version: version, fn: {{\n{body}\n}}}};\n"
+                "})();\n"
+            )
+            self._built = (version, source)
+        return self._built
+
+
+_LIBRARY = _HelperLibrary()
+
+# How strong a guarantee each wait condition gives about the element it
+# returns. A cached element is reused only for a condition no stronger than
+# the one it was resolved with.
+_CONDITION_STRENGTH = {
+    EC.presence_of_element_located: 0,
+    EC.visibility_of_element_located: 1,
+    EC.element_to_be_clickable: 2,
+}
+
+# DOM generation changes in a row after which a page stops caching
+# elements: its DOM keeps mutating (carousels, tickers), so every lookup
+# would pay the generation check and then wait anyway.
+ELEMENT_CACHE_MISS_LIMIT = 3
+
+
+# Errors after which a cached element is dropped and looked up again.
+_RESOLVE_AGAIN = (
+    StaleElementReferenceException, ElementNotInteractableException,
+    ElementClickInterceptedException,
+)
 
 
 class BasePage:
     """Base class for all page objects. Provides common helper methods."""
 
+    URL = None
+
+    # Locators that must be visible before the page counts as loaded;
+    # checked by verify_in_tabs().
+    READY_CHECKS = {}
+
+    # Requests this page does not need; installed by open() (see network_policy).
+    NETWORK_POLICY = None
+
+    # Load time limits checked after open() (see page_metrics).
+    PERFORMANCE_BUDGET = None
+
+    # Whether the server-rendered HTML of URL already has what the page's
+    # checks look for, so checks with static=True can skip the browser
+    # (see static_html). Pages built by JavaScript leave it False.
+    STATIC_HTML = False
+
+    # In-page helpers: name -> JS function source. The helpers of every page
+    # class are installed once per document as window.__qa and called by
+    # name through _call() (see _HelperLibrary). They can use resolveAll()
+    # and isVisible() from _DOM_QUERY_JS.
+    JS_HELPERS = {
+        "domGeneration": _DOM_GENERATION_JS,
+        "visibilityMap": """function (queries) {
+            var result = {};
+            Object.keys(queries).forEach(function (name) {
+                result[name] = resolveAll(queries[name]).some(isVisible);
+            });
+            return result;
+        }""",
+        "extract": """function (itemQuery, specs, visibleOnly, start, limit) {
+            var items = resolveAll(itemQuery), records = [], i;
+            for (i = start; i < items.length; i++) {
+                if (limit !== null && records.length >= limit) break;
+                var item = items[i];
+                if (visibleOnly && !isVisible(item)) continue;
+                var record = {};
+                Object.keys(specs).forEach(function (name) {
+                    var el = resolveAll(specs[name][0], item)[0], attr = specs[name][1];
+                    var value = el ? (attr ? (el[attr] || el.getAttribute(attr)) : el.textContent) : '';
+                    record[name] = value ? String(value).trim() : '';
+                });
+                records.push(record);
+            }
+            return [records, i];
+        }""",
+        "countVisible": """function (query) {
+            return resolveAll(query).filter(isVisible).length;
+        }""",
+        "scrollIntoView": """function (el) {
+            el.scrollIntoView({block: 'center'});
+        }""",
+    }
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _LIBRARY.register(vars(cls).get("JS_HELPERS", {}))
+
     def __init__(self, driver: WebDriver):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 15)
+        self.wait = self._wait(15)
+        # locator -> (element, DOM generation, condition); see _element().
+        self._elements = {}
+        self._generation_misses = 0
+        # URL -> StaticDocument, or None when the fetch failed; see static_document().
+        self._static = {}
+
+    def _wait(self, timeout, key=None, optional=False):
+        """Explicit wait that reports to the driver's instrumentation, if any.
+
+        With a *key* and an active :class:`~wait_policy.WaitPolicy`, the
+        timeout and poll interval come from the key's history (capped at
+        *timeout*) and the outcome is recorded. *optional* marks waits
+        whose timeout is an expected answer rather than a failure.
+        """
+        policy = WaitPolicy.active
+        if key is None or policy is None:
+            return InstrumentedWait(
+                self.driver, timeout, recorder=Instrumentation.of(self.driver)
+            )
+        key = f"{type(self).__name__}.{key}"
+        planned, poll = policy.plan(key, timeout, optional)
+        return InstrumentedWait(
+            self.driver, planned, recorder=Instrumentation.of(self.driver),
+            poll_frequency=poll,
+            on_result=lambda seconds, timed_out: policy.record(
+                key, seconds, timed_out, timeout, planned
+            ),
+        )
+
+    def _locator_name(self, locator):
+        """Name of the class attribute holding *locator*, used as the wait key."""
+        for cls in type(self).__mro__:
+            for name, value in vars(cls).items():
+                if value == locator and name.isupper():
+                    return name
+        return f"{locator[0]}={locator[1]}"
 
     def open(self, url: str):
+        if self.NETWORK_POLICY is not None:
+            self.NETWORK_POLICY.apply(self.driver)
+        else:
+            NetworkPolicy.clear(self.driver)
+        self._drain_network_log()
+        self._elements.clear()
+        self._generation_misses = 0
         self.driver.get(url)
+        messages = self._drain_network_log()
+        recorder = Instrumentation.of(self.driver)
+        if messages is not None and recorder is not None:
+            session = NetworkPolicy.active
+            stats = session.collect(messages) if session is not None \
+                else NetworkPolicy.collect(messages)
+            recorder.record_network(type(self).__name__, url, stats)
+        self._record_page_metrics(type(self).__name__, self.PERFORMANCE_BUDGET)
+
+    def _record_navigation(self, page, budget=None, timeout=15):
+        """Record the metrics of a document reached by a click or redirect.
+
+        Waits for its load event first, so ``load`` is known; if that does
+        not come within *timeout*, the metrics are recorded as they are.
+        """
+        try:
+            self._wait(timeout).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+        except TimeoutException:
+            pass
+        return self._record_page_metrics(page, budget)
+
+    def _record_page_metrics(self, page, budget=None):
+        """Collect load metrics of the current document and check *budget*."""
+        metrics = collect_page_metrics(self.driver)
+        if metrics is None:
+            return None
+        url = self.driver.current_url
+        recorder = Instrumentation.of(self.driver)
+        if recorder is not None:
+            over = budget.violations(metrics) if budget is not None else []
+            recorder.record_page_metrics(page, url, {**metrics, "over_budget": over})
+        if budget is not None:
+            budget.check(page, url, metrics)
+        return metrics
+
+    def _drain_network_log(self):
+        """Read the performance log, archiving responses when recording."""
+        archive_recorder = ArchiveRecorder.of(self.driver)
+        if archive_recorder is not None:
+            return archive_recorder.drain()
+        return drain_performance_log(self.driver)
+
+    def _call(self, name, *args):
+        """Call the in-page helper *name*; only the name and arguments are sent.
+
+        If the document has no helpers yet, or an older version of them,
+        they are installed and the call is repeated in the same script.
+        """
+        version, source = _LIBRARY.build()
+        result = self.driver.execute_script(_HELPER_CALL_JS, version, name, list(args))
+        if isinstance(result, dict) and result.get("__qaMissing"):
+            self._install_helpers(version, source)
+            result = self.driver.execute_script(
+                source + _HELPER_CALL_JS, version, name, list(args)
+            )
+        return result
+
+    def _call_async(self, name, *args):
+        """Like :meth:`_call` for helpers that take a ``done`` callback last."""
+        version, source = _LIBRARY.build()
+        result = self.driver.execute_async_script(
+            _HELPER_CALL_ASYNC_JS, version, name, list(args)
+        )
+        if isinstance(result, dict) and result.get("__qaMissing"):
+            self._install_helpers(version, source)
+            result = self.driver.execute_async_script(
+                source + _HELPER_CALL_ASYNC_JS, version, name, list(args)
+            )
+        return result
+
+    def _install_helpers(self, version, source):
+        """Have the current tab add the helpers to every new document.
+
+        Uses ``Page.addScriptToEvaluateOnNewDocument``, once per tab and
+        version; an older version's script is removed. Drivers without
+        DevTools skip this and reinstall on the first call per document.
+        The registrations live on the unwrapped driver, so they outlast
+        the per-test instrumentation wrapper of a pooled browser.
+        """
+        raw = getattr(self.driver, "wrapped_driver", self.driver)
+        try:
+            handle = self.driver.current_window_handle
+            scripts = raw.__dict__.setdefault("_qa_helper_scripts", {})
+            installed = scripts.get(handle)
+            if installed is not None and installed[0] == version:
+                return
+            if installed is not None:
+                self.driver.execute_cdp_cmd(
+                    "Page.removeScriptToEvaluateOnNewDocument", {"identifier": installed[1]}
+                )
+            added = self.driver.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument", {"source": source}
+            )
+            scripts[handle] = (version, added["identifier"])
+        except (AttributeError, WebDriverException):
+            pass
+
+    def _dom_generation(self):
+        """Current DOM generation token of the page (one short script call)."""
+        return self._call("domGeneration")
+
+    def _element(self, locator, condition):
+        """Return the element for *locator*, from the cache while the DOM is unchanged.
+
+        A cached element is reused as long as the page's DOM generation
+        still matches the one read before the element was looked up, and
+        only if it was resolved by a condition at least as strong as
+        *condition* (a merely present element is not known to be
+        clickable). Otherwise *condition* is waited for and the result
+        cached. After ``ELEMENT_CACHE_MISS_LIMIT`` generation changes in a
+        row the page mutates too often to gain anything, and caching stops
+        until the next :meth:`open`.
+        """
+        if self._generation_misses >= ELEMENT_CACHE_MISS_LIMIT:
+            return self._wait(15, key=self._locator_name(locator)).until(condition(locator))
+        generation = self._dom_generation()
+        cached = self._elements.get(locator)
+        if cached is not None:
+            if cached[1] != generation:
+                self._generation_misses += 1
+            else:
+                self._generation_misses = 0
+                strength = _CONDITION_STRENGTH.get(condition)
+                if strength is not None and _CONDITION_STRENGTH.get(cached[2], -1) >= strength:
+                    return cached[0]
+        element = self._wait(15, key=self._locator_name(locator)).until(condition(locator))
+        self._elements[locator] = (element, generation, condition)
+        return element
+
+    def _with_element(self, locator, condition, action):
+        """Run *action* on the (cached) element, looking it up again if it went stale."""
+        try:
+            return action(self._element(locator, condition))
+        except _RESOLVE_AGAIN:
+            self._elements.pop(locator, None)
+            return action(self._element(locator, condition))
 
     def find(self, locator):
-        return self.wait.until(EC.visibility_of_element_located(locator))
+        return self._element(locator, EC.visibility_of_element_located)
 
     def find_all(self, locator):
         return self.wait.until(EC.visibility_of_all_elements_located(locator))
 
-    def click(self, locator):
-        element = self.wait.until(EC.element_to_be_clickable(locator))
-        element.click()
+    def click(self, locator, scroll=False):
+        """Click *locator* once clickable; with *scroll*, scroll it into view first.
+
+        Scrolling and clicking use the same element, so the locator is
+        resolved once.
+        """
+        def _click(element):
+            if scroll:
+                self._call("scrollIntoView", element)
+            element.click()
+
+        self._with_element(locator, EC.element_to_be_clickable, _click)
 
-    def is_displayed(self, locator, timeout=10):
+    def static_document(self):
+        """Server-rendered HTML of ``URL``, fetched once; None means use the browser."""
+        backend = StaticHtml.active
+        if not self.STATIC_HTML or backend is None:
+            return None
+        if self.URL not in self._static:
+            self._static[self.URL] = backend.document(self.URL)
+        return self._static[self.URL]
+
+    def is_displayed(self, locator, timeout=10, optional=False, static=False):
+        """Wait up to *timeout* for *locator* to be visible; False if it never is.
+
+        Pass ``optional=True`` for elements that may legitimately be absent,
+        so the wait policy can learn a short timeout for them. With
+        ``static=True`` the page's server HTML is checked instead of the
+        browser, when available (see :meth:`static_document`).
+        """
+        document = self.static_document() if static else None
+        if document is not None:
+            return document.is_displayed(self._query(locator))
+        key = self._locator_name(locator)
         try:
-            WebDriverWait(self.driver, timeout).until(
+            self._wait(timeout, key=key, optional=optional).until(
                 EC.visibility_of_element_located(locator)
             )
             return True
@@ -34,14 +437,179 @@ class BasePage:
             return False
 
     def scroll_to_element(self, locator):
-        element = self.wait.until(EC.presence_of_element_located(locator))
-        self.driver.execute_script(
-            "arguments[0].scrollIntoView({block: 'center'});", element
-        )
-        return element
+        def _scroll(element):
+            self._call("scrollIntoView", element)
+            return element
+
+        return self._with_element(locator, EC.presence_of_element_located, _scroll)
 
     def get_current_url(self):
         return self.driver.current_url
 
-    def get_title(self):
+    def get_title(self, static=False):
+        document = self.static_document() if static else None
+        if document is not None:
+            return document.title
         return self.driver.title
+
+    def get_attribute(self, locator, name, static=False):
+        """*name* attribute of the element at *locator* (None if it has none)."""
+        document = self.static_document() if static else None
+        if document is not None:
+            return document.attribute(self._query(locator), name)
+        return self._with_element(
+            locator, EC.presence_of_element_located, lambda el: el.get_attribute(name)
+        )
+
+    @staticmethod
+    def _query(locator):
+        """Translate a ``(By, value)`` locator into a ``[kind, selector]`` pair for JS."""
+        by, value = locator
+        if by == By.XPATH:
+            return ["xpath", value]
+        if by == By.ID:
+            return ["css", f'[id="{value}"]']
+        if by == By.NAME:
+            return ["css", f'[name="{value}"]']
+        if by == By.CLASS_NAME:
+            return ["css", f".{value}"]
+        if by in (By.CSS_SELECTOR, By.TAG_NAME):
+            return ["css", value]
+        raise ValueError(f"Locator strategy {by!r} is not supported in batched queries")
+
+    def visibility_map(self, locators: dict):
+        """Return ``{name: visible}`` for every locator in one script call."""
+        return self._call(
+            "visibilityMap", {name: self._query(loc) for name, loc in locators.items()}
+        )
+
+    def wait_for_visibility_map(self, locators: dict, timeout=10):
+        """Poll :meth:`visibility_map` until every locator is visible.
+
+        Returns the last map, so on timeout the caller can see which
+        locators are still missing.
+        """
+        last = {}
+
+        def _all_visible(driver):
+            last.update(self.visibility_map(locators))
+            return all(last.values())
+
+        key = "visible:" + ",".join(sorted(locators))
+        try:
+            self._wait(timeout, key=key).until(_all_visible)
+        except TimeoutException:
+            pass
+        return last
+
+    def extract(self, item_locator, fields: dict, visible_only=True):
+        """Extract one record per item matching *item_locator* in one script call.
+
+        *fields* maps a record key to a locator relative to the item, whose
+        trimmed text becomes the value, or to a ``(locator, attribute)``
+        pair to read an attribute/property instead (e.g. ``"href"``).
+        Missing fields come back as empty strings.
+        """
+        return self.extract_range(item_locator, fields, visible_only=visible_only)[0]
+
+    def extract_range(self, item_locator, fields: dict, start=0, limit=None,
+                      visible_only=True):
+        """Like :meth:`extract`, from the *start*-th matching item on.
+
+        Returns ``(records, next_start)``: at most *limit* records, and the
+        item index to continue from. Long lists are read in chunks this
+        way without the script revisiting the items already read.
+        """
+        specs = {}
+        for name, spec in fields.items():
+            locator, attr = spec if isinstance(spec[0], tuple) else (spec, None)
+            specs[name] = [self._query(locator), attr]
+        records, next_start = self._call(
+            "extract", self._query(item_locator), specs, visible_only, start, limit
+        )
+        return records, next_start
+
+    def count_visible(self, locator):
+        """Number of visible elements matching *locator* (one script call)."""
+        return self._call("countVisible", self._query(locator))
+
+    def is_visible_now(self, locator):
+        """Non-blocking visibility check: one find, no waiting."""
+        try:
+            return any(el.is_displayed() for el in self.driver.find_elements(*locator))
+        except StaleElementReferenceException:
+            return False
+
+    @staticmethod
+    def verify_in_tabs(driver, pages, timeout=15, poll_interval=0.1):
+        """Load *pages* in separate tabs at once and interleave their checks.
+
+        Every page's ``URL`` is opened in its own tab without waiting for
+        the load, then the tabs are visited round-robin and each pending
+        ``READY_CHECKS`` locator is tested without blocking. Returns::
+
+            {"pages": {"HomePage": {"url", "checks", "ready_after", "load"}, ...},
+             "elapsed": s, "sequential": s, "saved": s}
+
+        ``ready_after`` counts from the start of the call, ``load`` is the
+        tab's own Navigation Timing (``loadEventEnd - startTime``).
+        ``sequential`` is the sum of the ``load`` times, i.e. roughly what
+        loading the pages one after another would have cost; it and
+        ``saved`` are None if a tab never fired its load event. The extra
+        tabs are closed and the original tab is re-selected, also when a
+        check raises.
+        """
+        origin = driver.current_window_handle
+        start = time.perf_counter()
+        tabs, results = {}, {}
+        try:
+            for page in pages:
+                driver.switch_to.new_window("tab")
+                tabs[driver.current_window_handle] = page
+                driver.execute_script("window.location.href = arguments[0];", page.URL)
+                results[type(page).__name__] = {
+                    "url": page.URL,
+                    "checks": {name: False for name in page.READY_CHECKS},
+                    "ready_after": None,
+                    "load": None,
+                }
+
+            pending = {handle: dict(page.READY_CHECKS) for handle, page in tabs.items()}
+            while pending and time.perf_counter() - start < timeout:
+                for handle in list(pending):
+                    page = tabs[handle]
+                    result = results[type(page).__name__]
+                    driver.switch_to.window(handle)
+                    for name, locator in list(pending[handle].items()):
+                        if page.is_visible_now(locator):
+                            result["checks"][name] = True
+                            del pending[handle][name]
+                    if not pending[handle]:
+                        result["ready_after"] = round(time.perf_counter() - start, 3)
+                        del pending[handle]
+                if pending:
+                    time.sleep(poll_interval)
+            elapsed = time.perf_counter() - start
+
+            for handle, page in tabs.items():
+                driver.switch_to.window(handle)
+                results[type(page).__name__]["load"] = driver.execute_script(_TAB_LOAD_JS)
+        finally:
+            for handle in tabs:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(origin)
+
+        loads = [r["load"] for r in results.values()]
+        sequential = sum(loads) if None not in loads else None
+        return {
+            "pages": results,
+            "elapsed": round(elapsed, 3),
+            "sequential": round(sequential, 3) if sequential is not None else None,
+            "saved": round(sequential - elapsed, 3) if sequential is not None else None,
+        }
+
+
+# Subclasses register their helpers in __init_subclass__; BasePage's own
+# can only be added once the class exists.
+_LIBRARY.register(BasePage.JS_HELPERS)
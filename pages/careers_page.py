@@ -1,5 +1,9 @@
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from network_policy import NetworkPolicy
+from page_metrics import PerformanceBudget
 from pages.base_page import BasePage
+from pages.open_positions_page import OpenPositionsPage
 
 
 class CareersPage(BasePage):
@@ -13,9 +17,22 @@ class CareersPage(BasePage):
         "//a[contains(@href,'open-positions') and normalize-space()='See all QA jobs']",
     )
 
+    READY_CHECKS = {"see_all_qa_jobs": SEE_ALL_QA_JOBS_BTN}
+
+    NETWORK_POLICY = NetworkPolicy.default()
+
+    PERFORMANCE_BUDGET = PerformanceBudget(ttfb=3000, load=15000, lcp=8000)
+
+    STATIC_HTML = True
+
     def open_careers_qa_page(self):
         self.open(self.URL)
 
+    def get_see_all_qa_jobs_href(self, static=False):
+        return self.get_attribute(self.SEE_ALL_QA_JOBS_BTN, "href", static=static)
+
     def click_see_all_qa_jobs(self):
-        self.scroll_to_element(self.SEE_ALL_QA_JOBS_BTN)
-        self.click(self.SEE_ALL_QA_JOBS_BTN)
+        """Click through to the open positions page and record its load metrics."""
+        self.click(self.SEE_ALL_QA_JOBS_BTN, scroll=True)
+        self._wait(15, key="open_positions_url").until(EC.url_contains("open-positions"))
+        self._record_navigation("OpenPositionsPage", OpenPositionsPage.PERFORMANCE_BUDGET)
@@ -1,4 +1,6 @@
 from selenium.webdriver.common.by import By
+from network_policy import NetworkPolicy
+from page_metrics import PerformanceBudget
 from pages.base_page import BasePage
 
 
@@ -17,24 +19,36 @@ class HomePage(BasePage):
     HERO_SECTION = (By.CSS_SELECTOR, ".homepage-hero")
     FOOTER = (By.CSS_SELECTOR, "footer")
 
+    READY_CHECKS = {"navbar": NAVBAR, "hero": HERO_SECTION, "footer": FOOTER}
+
+    NETWORK_POLICY = NetworkPolicy.default()
+
+    PERFORMANCE_BUDGET = PerformanceBudget(ttfb=3000, load=15000, lcp=8000)
+
+    STATIC_HTML = True
+
     def open_home_page(self):
         self.open(self.URL)
 
     def accept_cookies(self):
-        if self.is_displayed(self.COOKIE_ACCEPT_BTN, timeout=5):
+        if self.is_displayed(self.COOKIE_ACCEPT_BTN, timeout=5, optional=True):
             self.click(self.COOKIE_ACCEPT_BTN)
 
     def is_home_page_opened(self):
         return "insider" in self.get_current_url().lower()
 
-    def is_navbar_displayed(self):
-        return self.is_displayed(self.NAVBAR)
+    def is_navbar_displayed(self, static=False):
+        return self.is_displayed(self.NAVBAR, static=static)
 
     def is_hero_section_displayed(self):
         return self.is_displayed(self.HERO_SECTION)
 
-    def is_footer_displayed(self):
-        return self.is_displayed(self.FOOTER)
+    def is_footer_displayed(self, static=False):
+        return self.is_displayed(self.FOOTER, static=static)
+
+    def get_main_blocks_visibility(self, timeout=10):
+        """Visibility of navbar, hero and footer, checked together in one wait."""
+        return self.wait_for_visibility_map(self.READY_CHECKS, timeout=timeout)
 
-    def get_page_title(self):
-        return self.get_title()
+    def get_page_title(self, static=False):
+        return self.get_title(static=static)
@@ -1,13 +1,46 @@
-import time
-
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import (
+    JavascriptException, StaleElementReferenceException, TimeoutException,
+)
 
+from link_audit import audit_links
+from network_policy import NetworkPolicy
+from page_metrics import PerformanceBudget
 from pages.base_page import BasePage
 
 
+class Job:
+    """One job listing as shown on the open positions page.
+
+    Supports ``job["position"]`` style access so it can stand in for the
+    plain dicts the per-element Selenium path returns.
+    """
+
+    __slots__ = ("position", "department", "location")
+
+    def __init__(self, position="", department="", location=""):
+        self.position = position
+        self.department = department
+        self.location = location
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __eq__(self, other):
+        if isinstance(other, Job):
+            return self.as_dict() == other.as_dict()
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Job({self.position!r}, {self.department!r}, {self.location!r})"
+
+    def as_dict(self):
+        return {key: getattr(self, key) for key in self.__slots__}
+
+
 class OpenPositionsPage(BasePage):
     """Page Object for the Open Positions listing page with filters."""
 
@@ -26,18 +59,121 @@ class OpenPositionsPage(BasePage):
     JOB_DEPARTMENT = (By.CSS_SELECTOR, "span.position-department")
     JOB_LOCATION = (By.CSS_SELECTOR, "div.position-location")
 
-   
+    # Record schema for the batched extraction path (see BasePage.extract).
+    JOB_FIELDS = {
+        "position": JOB_POSITION,
+        "department": JOB_DEPARTMENT,
+        "location": JOB_LOCATION,
+    }
+
+    # Shown by long listings that render their cards in batches.
+    LOAD_MORE_BTN = (
+        By.XPATH,
+        "//*[self::button or self::a][normalize-space()='Load more']",
+    )
+
     VIEW_ROLE_BTN = (
         By.XPATH,
         ".//a[contains(@class,'btn') and normalize-space()='View Role']",
     )
 
+    READY_CHECKS = {
+        "location_filter": LOCATION_FILTER,
+        "department_filter": DEPARTMENT_FILTER,
+        "jobs_list": JOBS_LIST,
+    }
+
+    # The default policy, as on the other pages. It blocks no first-party
+    # scripts and not the Lever postings feed, which the job cards are
+    # rendered from.
+    NETWORK_POLICY = NetworkPolicy.default()
+
+    PERFORMANCE_BUDGET = PerformanceBudget(ttfb=3000, load=20000, lcp=10000)
+
+    # Checked for the Lever application form reached through "View Role".
+    LEVER_PERFORMANCE_BUDGET = PerformanceBudget(ttfb=3000, load=15000)
+
+    # Installed into the page once (see BasePage.JS_HELPERS), since filter
+    # changes, settles and job reads run in tight loops.
+    JS_HELPERS = {
+        "select": """function (elementId, value) {
+            var sel = document.getElementById(elementId);
+            sel.value = value;
+            sel.dispatchEvent(new Event('change', {bubbles: true}));
+        }""",
+        "filterOptions": """function (filters) {
+            var result = {};
+            Object.keys(filters).forEach(function (name) {
+                var options = {};
+                Array.prototype.forEach.call(document.getElementById(filters[name]).options, function (o) {
+                    if (o.value && o.value !== 'All') options[o.value] = o.textContent.trim();
+                });
+                result[name] = options;
+            });
+            return result;
+        }""",
+        "settle": """function (targetId, quietSeconds, limitSeconds, selectId, value, done) {
+            var quiet = quietSeconds * 1000, limit = limitSeconds * 1000;
+            var target = document.getElementById(targetId) || document.body;
+            var quietTimer, hardTimer, observer;
+            function finish(settled) {
+                observer.disconnect();
+                clearTimeout(quietTimer);
+                clearTimeout(hardTimer);
+                done(settled);
+            }
+            function restart() {
+                clearTimeout(quietTimer);
+                quietTimer = setTimeout(function () { finish(true); }, quiet);
+            }
+            observer = new MutationObserver(restart);
+            observer.observe(target, {
+                childList: true, subtree: true, attributes: true, characterData: true
+            });
+            hardTimer = setTimeout(function () { finish(false); }, limit);
+            if (selectId) {
+                var sel = document.getElementById(selectId);
+                sel.value = value;
+                sel.dispatchEvent(new Event('change', {bubbles: true}));
+            }
+            restart();
+        }""",
+        "clickViewRole": """function (itemSelector, index) {
+            var items = document.querySelectorAll(itemSelector);
+            var visibleIndex = 0;
+            for (var i = 0; i < items.length; i++) {
+                if (items[i].offsetParent !== null) {
+                    if (visibleIndex === index) {
+                        var btn = items[i].querySelector("a.btn");
+                        btn.scrollIntoView({block: 'center'});
+                        btn.click();
+                        return;
+                    }
+                    visibleIndex++;
+                }
+            }
+        }""",
+        "scrollToEnd": """function () {
+            window.scrollTo(0, document.body.scrollHeight);
+        }""",
+    }
+
+    def __init__(self, driver):
+        super().__init__(driver)
+        # (location, department) -> jobs, filled by filter_matrix().
+        self._filter_results = {}
+
+    def open(self, url: str):
+        # A new load may list other jobs than the memoized combinations.
+        self._filter_results.clear()
+        super().open(url)
+
     def _wait_for_page_ready(self):
         """Wait for the open positions page to fully initialise."""
-        WebDriverWait(self.driver, 20).until(
+        self._wait(20, key="LOCATION_FILTER").until(
             EC.presence_of_element_located(self.LOCATION_FILTER)
         )
-        WebDriverWait(self.driver, 20).until(
+        self._wait(20, key="location_options").until(
             lambda d: len(
                 d.find_element(*self.LOCATION_FILTER)
                 .find_elements(By.TAG_NAME, "option")
@@ -47,37 +183,80 @@ class OpenPositionsPage(BasePage):
 
     def _js_select(self, element_id, value):
         """Set a <select> value via JS and dispatch a bubbling change event."""
-        self.driver.execute_script("""
-            var sel = document.getElementById(arguments[0]);
-            sel.value = arguments[1];
-            sel.dispatchEvent(new Event('change', {bubbles: true}));
-        """, element_id, value)
+        self._call("select", element_id, value)
+
+    def filter_options(self):
+        """Return the values each filter offers, except "All".
+
+        ``{"location": {value: label}, "department": {value: label}}``,
+        read from both <select> elements in one script call.
+        """
+        self._wait_for_page_ready()
+        return self._call("filterOptions", {
+            "location": self.LOCATION_FILTER[1], "department": self.DEPARTMENT_FILTER[1],
+        })
+
+    def filter_matrix(self, locations=None, departments=None):
+        """Collect the jobs of every location × department combination in place.
+
+        The page must already be open. *locations* and *departments* are
+        option values and default to everything :meth:`filter_options`
+        offers. Location is the outer loop, so it is switched only when it
+        changes. Both changes go through :meth:`_wait_for_dom_settle`, so
+        each combination costs one settle (plus one per location) instead
+        of a full home → careers → open positions run. Results are memoized
+        per page object until the next :meth:`open`, so repeated or
+        overlapping matrices only visit combinations not seen before.
+        Returns ``{(location, department): [Job, ...]}``.
+        """
+        if locations is None or departments is None:
+            options = self.filter_options()
+            locations = list(options["location"]) if locations is None else locations
+            departments = list(options["department"]) if departments is None else departments
+        else:
+            self._wait_for_page_ready()
+
+        current_location = None
+        for location in locations:
+            for department in departments:
+                key = (location, department)
+                if key in self._filter_results:
+                    continue
+                if location != current_location:
+                    self._wait_for_dom_settle(select=(self.LOCATION_FILTER[1], location))
+                    current_location = location
+                self._wait_for_dom_settle(select=(self.DEPARTMENT_FILTER[1], department))
+                self._filter_results[key] = self._collect_jobs_via_js()
+        return {
+            (location, department): self._filter_results[(location, department)]
+            for location in locations for department in departments
+        }
 
     def filter_by_location(self, location: str):
         """Select a location from the filter dropdown."""
         self._wait_for_page_ready()
-        self._js_select("filter-by-location", location)
-
-        self._wait_for_dom_settle()
+        self._wait_for_dom_settle(select=("filter-by-location", location))
 
     def filter_by_department(self, department: str):
         """Select a department from the filter dropdown."""
-        self._js_select("filter-by-department", department)
-
-    def _wait_for_dom_settle(self, interval=0.5, checks=3):
-        """Wait until the count of visible job items stabilises across *checks* polls."""
-        previous = -1
-        stable = 0
-        while stable < checks:
-            current = len(
-                [el for el in self.driver.find_elements(*self.JOB_ITEM) if el.is_displayed()]
-            )
-            stable = stable + 1 if current == previous else 1
-            previous = current
-            time.sleep(interval)
+        self._wait_for_dom_settle(select=("filter-by-department", department))
+
+    def _wait_for_dom_settle(self, quiet=0.5, timeout=10, select=None):
+        """Wait until the job list stops mutating for *quiet* seconds.
+
+        A MutationObserver on ``#jobs-list`` runs inside one async script
+        call, which resolves once no mutation has happened for the quiet
+        window, or after *timeout* seconds at the latest. When *select* is
+        an ``(element_id, value)`` pair, that <select> is changed after the
+        observer is attached, so the filter's own re-render is awaited too.
+        Returns True if the list settled, False on the hard timeout.
+        """
+        element_id, value = select or (None, None)
+        return self._call_async("settle", self.JOBS_LIST[1], quiet, timeout, element_id, value)
 
     def wait_for_jobs_to_load(self, expected_location="Istanbul"):
         """Wait until visible jobs are filtered and all contain the expected location."""
+        self._wait_for_dom_settle()
 
         def _filtered_correctly(driver):
             data = self._collect_jobs_via_js()
@@ -85,43 +264,82 @@ class OpenPositionsPage(BasePage):
                 return False
             return all(expected_location in job["location"] for job in data)
 
-        WebDriverWait(self.driver, 20).until(_filtered_correctly)
+        self._wait(20, key="jobs_filtered").until(_filtered_correctly)
 
     def _collect_jobs_via_js(self):
         """Fast JS helper to read visible job data without stale-element risk."""
-        return self.driver.execute_script("""
-            var items = document.querySelectorAll('.position-list-item');
-            var results = [];
-            items.forEach(function(item) {
-                if (item.offsetParent !== null) {
-                    var title = item.querySelector('p.position-title');
-                    var dept  = item.querySelector('span.position-department');
-                    var loc   = item.querySelector('div.position-location');
-                    results.push({
-                        position:   title ? title.textContent.trim() : '',
-                        department: dept  ? dept.textContent.trim()  : '',
-                        location:   loc   ? loc.textContent.trim()   : ''
-                    });
-                }
-            });
-            return results;
-        """)
+        return [Job(**record) for record in self.extract(self.JOB_ITEM, self.JOB_FIELDS)]
+
+    def iter_jobs(self, chunk_size=200, load_more=None, timeout=5):
+        """Yield the visible ``Job`` records, reading them in chunks as they render.
+
+        Each chunk is one :meth:`extract_range` call over the next
+        *chunk_size* visible cards, continuing from where the previous chunk
+        stopped, so a consumer can stop at the first bad record without the
+        rest being read or held in memory. When the rendered cards run out,
+        the next batch is requested (see :meth:`_load_more_jobs`) if
+        *load_more* is set; by default only while a "Load more" control is
+        shown. Iteration ends when no new cards appear within *timeout*
+        seconds.
+        """
+        start = rendered = 0
+        while True:
+            chunk, start = self.extract_range(
+                self.JOB_ITEM, self.JOB_FIELDS, start=start, limit=chunk_size
+            )
+            for record in chunk:
+                yield Job(**record)
+            rendered += len(chunk)
+            if len(chunk) == chunk_size:
+                continue
+            more = load_more
+            if more is None:
+                more = self.is_visible_now(self.LOAD_MORE_BTN)
+            if not more or not self._load_more_jobs(rendered, timeout):
+                return
+
+    def _load_more_jobs(self, rendered, timeout=5):
+        """Ask the page for more cards; True once more than *rendered* are visible.
+
+        Clicks a visible "Load more" control, or else scrolls to the end of
+        the page for infinite-scroll listings.
+        """
+        if self.is_visible_now(self.LOAD_MORE_BTN):
+            self.click(self.LOAD_MORE_BTN)
+        else:
+            self._call("scrollToEnd")
+        try:
+            self._wait(timeout, key="load_more", optional=True).until(
+                lambda d: self.count_visible(self.JOB_ITEM) > rendered
+            )
+            return True
+        except TimeoutException:
+            return False
 
     def get_visible_job_items(self):
         """Return visible job card WebElements using explicit wait + find_elements."""
-        WebDriverWait(self.driver, 15).until(
+        self._wait(15, key="visible_job_items").until(
             lambda d: any(el.is_displayed() for el in d.find_elements(*self.JOB_ITEM))
         )
         all_items = self.driver.find_elements(*self.JOB_ITEM)
         return [item for item in all_items if item.is_displayed()]
 
-    def get_visible_jobs_data(self):
+    def get_visible_jobs_data(self, batched=True):
         """Collect position, department, location from each visible job card.
 
-        Uses Selenium relative locators (card -> child element) for POM
-        compliance. Falls back to a single JS call if a stale reference
-        occurs (dynamic DOM).
+        By default all cards are read in a single script call (one round
+        trip regardless of the number of jobs) and returned as ``Job``
+        records. With ``batched=False``, or if the script fails, the
+        per-element Selenium path is used: relative locators per card,
+        falling back to the JS helper if a stale reference occurs.
         """
+        if batched:
+            try:
+                return self._wait(15, key="jobs_data").until(
+                    lambda d: self._collect_jobs_via_js()
+                )
+            except JavascriptException:
+                pass
         try:
             cards = self.get_visible_job_items()
             results = []
@@ -145,35 +363,39 @@ class OpenPositionsPage(BasePage):
         stale-element issues when the DOM re-renders between find and click.
         """
         self._handles_before_click = self.driver.window_handles[:]
-        self.driver.execute_script("""
-            var items = document.querySelectorAll('.position-list-item');
-            var visibleIndex = 0;
-            for (var i = 0; i < items.length; i++) {
-                if (items[i].offsetParent !== null) {
-                    if (visibleIndex === arguments[0]) {
-                        var btn = items[i].querySelector(
-                            "a.btn"
-                        );
-                        btn.scrollIntoView({block: 'center'});
-                        btn.click();
-                        return;
-                    }
-                    visibleIndex++;
-                }
-            }
-        """, index)
+        self._call("clickViewRole", self.JOB_ITEM[1], index)
+
+    def audit_view_role_links(self, session=None, workers=8, timeout=10):
+        """Check the "View Role" link of every visible job card over HTTP.
+
+        All hrefs are read in one script call, then resolved concurrently
+        by :func:`link_audit.audit_links`. Returns one dict per card: the
+        ``job`` plus ``url``, ``status``, ``final_url``, ``final_host``,
+        ``latency`` and ``error``.
+        """
+        cards = self.extract(
+            self.JOB_ITEM, {**self.JOB_FIELDS, "href": (self.VIEW_ROLE_BTN, "href")}
+        )
+        results = audit_links(
+            [card.pop("href") for card in cards], session=session,
+            workers=workers, timeout=timeout,
+        )
+        return [
+            {"job": Job(**card), **result} for card, result in zip(cards, results)
+        ]
 
     def navigate_to_lever_page(self):
         """Handle redirect to Lever regardless of new-tab or same-tab behaviour."""
         try:
-            WebDriverWait(self.driver, 5).until(
+            self._wait(5, key="new_tab", optional=True).until(
                 lambda d: len(d.window_handles) > len(self._handles_before_click)
             )
             self.driver.switch_to.window(self.driver.window_handles[-1])
         except Exception:
             pass  # same tab – no switch needed
 
-        WebDriverWait(self.driver, 15).until(EC.url_contains("lever.co"))
+        self._wait(15, key="lever_url").until(EC.url_contains("lever.co"))
+        self._record_navigation("LeverPage", self.LEVER_PERFORMANCE_BUDGET)
 
     def is_lever_page(self):
         """Check that the current URL belongs to Lever application form."""
@@ -0,0 +1,147 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from result_log import merge_logs
+
+
+DEFAULT_DURATION = 60.0
+
+
+def load_durations(path):
+    """Read ``{nodeid: seconds}`` recorded by earlier runs (empty if none)."""
+    return _read_json(path)
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_durations(path, durations):
+    """Merge *durations* into the file at *path*, newest values winning."""
+    merged = load_durations(path)
+    merged.update(durations)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(merged, fh, indent=2, sort_keys=True)
+
+
+def shard(nodeids, durations, workers):
+    """Split *nodeids* into *workers* buckets with similar total duration.
+
+    Longest-processing-time-first: tests are sorted by their last known
+    duration and each one goes to the currently lightest bucket. Tests
+    without history are assumed to take the average known duration.
+    """
+    known = [durations[n] for n in nodeids if n in durations]
+    fallback = sum(known) / len(known) if known else DEFAULT_DURATION
+    weighted = sorted(
+        nodeids, key=lambda n: durations.get(n, fallback), reverse=True
+    )
+
+    buckets = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    for nodeid in weighted:
+        i = loads.index(min(loads))
+        buckets[i].append(nodeid)
+        loads[i] += durations.get(nodeid, fallback)
+    return buckets
+
+
+def forwarded_args(config):
+    """The command line of this run, minus what the parent handles itself.
+
+    ``--workers`` and the positional test paths are dropped: each worker
+    gets its shard's node ids instead. Everything else, e.g.
+    ``--archive-mode replay`` or ``--headed``, applies in the workers too.
+    """
+    args = list(config.invocation_params.args)
+    positional = list(config.args)
+    forwarded = []
+    skip_value = False
+    for arg in args:
+        if skip_value:
+            skip_value = False
+        elif arg == "--workers":
+            skip_value = True
+        elif arg.startswith("--workers="):
+            pass
+        elif arg in positional:
+            positional.remove(arg)
+        else:
+            forwarded.append(arg)
+    return forwarded
+
+
+def run_parallel(session, workers, durations_path, log_path):
+    """Run the collected items in *workers* pytest subprocesses.
+
+    Each worker gets its own browser, writes its own result event log and
+    a JSON file with per-test outcome and duration. The worker logs are
+    concatenated into *log_path* and the speedup over the summed (serial)
+    duration is printed. Workers run with the parent's options (see
+    :func:`forwarded_args`), each with its own pytest cache directory.
+    """
+    config = session.config
+    tr = config.pluginmanager.get_plugin("terminalreporter")
+    nodeids = [item.nodeid for item in session.items]
+    shards = [s for s in shard(nodeids, load_durations(durations_path), workers) if s]
+    work_dir = tempfile.mkdtemp(prefix="pytest-workers-")
+    try:
+        _run_workers(session, tr, nodeids, shards, work_dir, durations_path, log_path)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _run_workers(session, tr, nodeids, shards, work_dir, durations_path, log_path):
+    config = session.config
+    options = forwarded_args(config)
+    start = time.perf_counter()
+    procs = []
+    for i, ids in enumerate(shards):
+        log = open(os.path.join(work_dir, f"worker-{i}.log"), "w", encoding="utf-8")
+        cmd = [
+            sys.executable, "-m", "pytest", *options,
+            "-o", f"cache_dir={os.path.join(work_dir, f'cache-{i}')}",
+            "--worker-id", str(i), "--worker-dir", work_dir, *ids,
+        ]
+        procs.append((i, log, subprocess.Popen(
+            cmd, cwd=str(config.rootpath), stdout=log, stderr=subprocess.STDOUT,
+        )))
+    for _, log, proc in procs:
+        proc.wait()
+        log.close()
+    wall = time.perf_counter() - start
+
+    results = {}
+    for i, _, proc in procs:
+        results.update(_read_json(os.path.join(work_dir, f"results-{i}.json")))
+        if proc.returncode not in (0, 5):
+            with open(os.path.join(work_dir, f"worker-{i}.log"), encoding="utf-8") as fh:
+                tr.write_sep("-", f"worker {i} output")
+                tr.write(fh.read())
+
+    save_durations(durations_path, {n: r["duration"] for n, r in results.items()})
+    session.testsfailed = sum(1 for r in results.values() if r["outcome"] == "failed")
+    session.testsfailed += len(set(nodeids) - set(results))
+
+    merge_logs(
+        [os.path.join(work_dir, f"events-{i}.jsonl") for i, _, _ in procs
+         if os.path.exists(os.path.join(work_dir, f"events-{i}.jsonl"))],
+        log_path,
+    )
+
+    serial = sum(r["duration"] for r in results.values())
+    tr.write_sep("-", "parallel run")
+    tr.write_line(
+        f"{len(results)} test(s) on {len(shards)} worker(s): "
+        f"serial {serial:.1f}s, parallel {wall:.1f}s, "
+        f"speedup {serial / wall if wall else 0:.2f}x"
+    )
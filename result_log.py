@@ -0,0 +1,234 @@
+"""Append-only step event log and the report renderers that read it.
+
+Tests record step results through a :class:`StepRecorder`, which forwards
+each event to one or more sinks. :class:`JsonlSink` appends one JSON line
+per event, so a run can be tailed while it executes and the log survives a
+crash. The Excel, JUnit XML and summary JSON reports are rendered once from
+the log at session end, or on demand::
+
+    python -m result_log test_results.jsonl --excel test_report.xlsx \\
+        --junit junit.xml --summary summary.json
+"""
+import argparse
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from xml.etree import ElementTree as ET
+
+
+class ResultSink(ABC):
+    """Receives step events as plain dicts. Subclasses implement ``emit``."""
+
+    @abstractmethod
+    def emit(self, event: dict):
+        """Handle one step event."""
+
+    def close(self):
+        pass
+
+
+class JsonlSink(ResultSink):
+    """Appends every event as one JSON line and flushes it immediately."""
+
+    def __init__(self, path, truncate=False):
+        self.path = os.path.abspath(path)
+        self._fh = open(self.path, "w" if truncate else "a", encoding="utf-8")
+
+    def emit(self, event: dict):
+        self._fh.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self._fh.flush()
+
+    def close(self):
+        self._fh.close()
+
+
+class StepFailed(AssertionError):
+    """Assertion failure of a specific step, for phases that check several at once."""
+
+    def __init__(self, step, message):
+        super().__init__(message)
+        self.step = step
+
+
+class StepRecorder:
+    """Records the steps of one test and hands the events to *sinks*.
+
+    Mirrors the ``add_steps``/``pass_step``/``fail_step`` API of
+    :class:`~excel_reporter.ExcelReporter`, but never touches a workbook.
+    A step's duration runs from the previous step event to this one; with
+    an :class:`~instrumentation.Instrumentation` recorder the step event
+    also carries its WebDriver command and wait timings. With a
+    :class:`~failure_artifacts.FailureArtifacts` capturer, a failed step
+    also saves the browser state and logs the artifact directory.
+    """
+
+    def __init__(self, sinks, test="test", instrumentation=None, artifacts=None):
+        self.sinks = list(sinks)
+        self.test = test
+        self.instrumentation = instrumentation
+        self.artifacts = artifacts
+        # Step events so far (for checkpoints) and the highest step reported.
+        self.results = []
+        self.last_step = 0
+        self._last = time.perf_counter()
+
+    def add_steps(self, steps: list):
+        self._emit({"event": "steps", "steps": list(steps)})
+        self._last = time.perf_counter()
+        if self.instrumentation is not None:
+            self.instrumentation.mark_step()
+
+    def pass_step(self, step: int, details: str = ""):
+        self._emit_step(step, "PASSED", details)
+        self.last_step = step
+
+    def fail_step(self, step: int, details: str = ""):
+        extra = {}
+        if self.artifacts is not None:
+            label = f"{self.test.rpartition('::')[2]}-step{step}"
+            extra["artifacts"] = self.artifacts.save(label)
+        self._emit_step(step, "FAILED", details, **extra)
+
+    def _emit_step(self, step, status, details, **extra):
+        now = time.perf_counter()
+        event = {
+            "event": "step",
+            "step": step,
+            "status": status,
+            "details": str(details)[:250],
+            "time": datetime.now().strftime("%H:%M:%S"),
+            "duration": round(now - self._last, 4),
+        }
+        self._last = now
+        if self.instrumentation is not None:
+            event.update(self.instrumentation.mark_step())
+        event.update(extra)
+        self._emit(event)
+        self.results.append(event)
+
+    def restore(self, results):
+        """Replay step events of an earlier run (see :mod:`checkpoint`)."""
+        for event in results:
+            event = {**event, "restored": True}
+            self._emit({k: v for k, v in event.items() if k not in ("test", "ts")})
+            self.results.append(event)
+            if event["status"] == "PASSED":
+                self.last_step = max(self.last_step, event["step"])
+        self._last = time.perf_counter()
+
+    def _emit(self, event):
+        event = {"test": self.test, "ts": time.time(), **event}
+        for sink in self.sinks:
+            sink.emit(event)
+
+
+def read_events(path):
+    """Yield events from a JSONL log, skipping a half-written last line."""
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def merge_logs(paths, path):
+    """Concatenate several logs (e.g. one per worker) into *path*."""
+    with open(path, "w", encoding="utf-8") as out:
+        for src in paths:
+            with open(src, encoding="utf-8") as fh:
+                out.writelines(line for line in fh if line.endswith("\n"))
+
+
+def collect_tests(events):
+    """Fold events into ``{test: {"steps": [...], "results": {step: event}}}``."""
+    tests = {}
+    for event in events:
+        entry = tests.setdefault(event["test"], {"steps": [], "results": {}})
+        if event["event"] == "steps":
+            entry["steps"] = event["steps"]
+        elif event["event"] == "step":
+            entry["results"][event["step"]] = event
+    return tests
+
+
+def render_excel(events, path="test_report.xlsx", large=None):
+    from excel_reporter import ExcelReporter
+
+    reporter = ExcelReporter.from_events(events, path, large)
+    reporter.save()
+    return reporter
+
+
+def render_junit(events, path="junit.xml"):
+    tests = collect_tests(events)
+    suite = ET.Element("testsuite", name="insider-qa", tests=str(len(tests)))
+    failures = 0
+    for test, entry in tests.items():
+        classname, _, name = test.rpartition("::")
+        case = ET.SubElement(suite, "testcase", classname=classname, name=name)
+        failed = [r for r in entry["results"].values() if r["status"] == "FAILED"]
+        if failed:
+            failures += 1
+            first = failed[0]
+            ET.SubElement(
+                case, "failure", message=f"Step {first['step']}: {first['details']}"
+            )
+        lines = []
+        for i, desc in enumerate(entry["steps"], 1):
+            status = entry["results"].get(i, {}).get("status", "Pending")
+            lines.append(f"{i:>3} {status:<8} {desc}")
+        ET.SubElement(case, "system-out").text = "\n".join(lines)
+    suite.set("failures", str(failures))
+    ET.ElementTree(suite).write(path, encoding="utf-8", xml_declaration=True)
+
+
+def summarize(events):
+    tests = collect_tests(events)
+    summary = {"tests": len(tests), "passed": 0, "failed": 0, "pending": 0, "per_test": {}}
+    for test, entry in tests.items():
+        statuses = [
+            entry["results"].get(i, {}).get("status", "Pending")
+            for i in range(1, len(entry["steps"]) + 1)
+        ]
+        counts = {
+            "passed": statuses.count("PASSED"),
+            "failed": statuses.count("FAILED"),
+            "pending": statuses.count("Pending"),
+        }
+        for key, value in counts.items():
+            summary[key] += value
+        summary["per_test"][test] = counts
+    return summary
+
+
+def render_summary(events, path="summary.json"):
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(summarize(events), fh, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log", help="JSONL event log written during the run")
+    parser.add_argument("--excel", help="write the styled Excel report here")
+    parser.add_argument("--large", action="store_true", default=None,
+                        help="stream the Excel report with one sheet per test class")
+    parser.add_argument("--junit", help="write a JUnit XML report here")
+    parser.add_argument("--summary", help="write a summary JSON file here")
+    args = parser.parse_args(argv)
+
+    events = list(read_events(args.log))
+    if args.excel:
+        render_excel(events, args.excel, args.large)
+    if args.junit:
+        render_junit(events, args.junit)
+    if args.summary:
+        render_summary(events, args.summary)
+    if not (args.excel or args.junit or args.summary):
+        print(json.dumps(summarize(events), indent=2))
+
+
+if __name__ == "__main__":
+    main()
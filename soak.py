@@ -0,0 +1,215 @@
+"""Soak runs: the selected tests repeated for hours with browser memory tracked.
+
+``--soak-iterations N`` or ``--soak-minutes M`` runs the selected tests
+over and over in one session, e.g. the career workflow as a synthetic
+monitor. Browsers come from the driver pool as usual. Each time a test
+releases its browser, :class:`SoakMonitor` samples:
+
+* ``js_heap_mb``, ``dom_nodes``, ``listeners`` and ``documents`` from
+  DevTools ``Performance.getMetrics`` (the page the test ended on);
+* ``driver_rss_mb`` (chromedriver) and ``browser_rss_mb`` (every Chrome
+  process below it), read from ``ps``.
+
+The memory trend (``growth_mb_per_hour``) is a least-squares fit over the
+last ``TREND_WINDOW`` samples of the current browser, keyed on its
+chromedriver pid, so the window restarts whenever the pool replaces the
+browser: after a soak recycle, ``--pool-max-uses`` or a crash. The browser is
+recycled, i.e. quit and replaced by the pool, when the JS heap, the RSS
+or that trend crosses its limit. Each iteration's latency and last sample
+go to a JSONL time series (``--soak-log``) as soon as it finishes. They
+also go to the "Soak" sheet of the Excel report. Step results are logged
+per iteration, as ``<nodeid> [soak N]``.
+"""
+import json
+import subprocess
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+
+# Performance.getMetrics name -> sample key.
+BROWSER_METRICS = {
+    "JSHeapUsedSize": "js_heap_mb",
+    "Nodes": "dom_nodes",
+    "JSEventListeners": "listeners",
+    "Documents": "documents",
+}
+
+TREND_WINDOW = 10
+MIN_TREND_SAMPLES = 5
+
+DEFAULT_LIMITS = {"js_heap_mb": 512, "rss_mb": 3072, "growth_mb_per_hour": 300}
+
+
+def browser_metrics(driver):
+    """Heap size and DOM counters of the current page; empty when unavailable."""
+    try:
+        driver.execute_cdp_cmd("Performance.enable", {})
+        raw = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+    except (AttributeError, WebDriverException):
+        return {}
+    values = {metric["name"]: metric["value"] for metric in raw}
+    sample = {key: values.get(name) for name, key in BROWSER_METRICS.items()}
+    if sample["js_heap_mb"] is not None:
+        sample["js_heap_mb"] = round(sample["js_heap_mb"] / 2**20, 1)
+    return sample
+
+
+def process_rss(pid):
+    """RSS in MB of process *pid* and of all its descendants, from one ``ps`` call."""
+    try:
+        out = subprocess.run(
+            ["ps", "-A", "-o", "pid=,ppid=,rss="],
+            capture_output=True, text=True, check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return {}
+    rss, children = {}, {}
+    for line in out.splitlines():
+        child, parent, kb = (int(field) for field in line.split())
+        rss[child] = kb
+        children.setdefault(parent, []).append(child)
+    if pid not in rss:
+        return {}
+    descendants, stack = 0, list(children.get(pid, []))
+    while stack:
+        child = stack.pop()
+        descendants += rss[child]
+        stack.extend(children.get(child, []))
+    return {
+        "driver_rss_mb": round(rss[pid] / 1024, 1),
+        "browser_rss_mb": round(descendants / 1024, 1),
+    }
+
+
+def slope_per_hour(points):
+    """Least-squares slope of ``(seconds, value)`` *points*, per hour."""
+    n = len(points)
+    mean_t = sum(t for t, _ in points) / n
+    mean_v = sum(v for _, v in points) / n
+    var = sum((t - mean_t) ** 2 for t, _ in points)
+    if var == 0:
+        return 0.0
+    cov = sum((t - mean_t) * (v - mean_v) for t, v in points)
+    return cov / var * 3600
+
+
+class SoakMonitor:
+    """Per-iteration samples, leak trend and recycle decisions of a soak run."""
+
+    def __init__(self, path="soak.jsonl", limits=None, window=TREND_WINDOW):
+        self.path = path
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.window = window
+        self.samples = []
+        self.recycles = 0
+        self.failures = 0
+        self._start = time.monotonic()
+        self.iteration = None
+        self._current = None
+        self._memory = []  # (seconds, total RSS) of the current browser
+        self._pid = None  # chromedriver pid of the browser in _memory
+
+    def begin(self, iteration):
+        self.iteration = iteration
+        self._current = {"iteration": iteration, "time": time.strftime("%H:%M:%S")}
+
+    def test_name(self, nodeid):
+        """*nodeid* tagged with the current iteration, for the step results."""
+        if self.iteration is None:
+            return nodeid
+        return f"{nodeid} [soak {self.iteration}]"
+
+    def sample(self, driver):
+        """Sample *driver* (unwrapped) before release; return a recycle reason or None."""
+        sample = browser_metrics(driver)
+        try:
+            pid = driver.service.process.pid
+        except AttributeError:
+            pid = None
+        if pid is not None:
+            sample.update(process_rss(pid))
+        if pid != self._pid:
+            # Another browser: its memory does not continue the old trend.
+            self._pid, self._memory = pid, []
+        growth = None
+        if "browser_rss_mb" in sample:
+            rss = sample["browser_rss_mb"] + sample["driver_rss_mb"]
+            sample["rss_mb"] = round(rss, 1)
+            self._memory = (self._memory + [(time.monotonic() - self._start, rss)])[-self.window:]
+            if len(self._memory) >= MIN_TREND_SAMPLES:
+                growth = round(slope_per_hour(self._memory), 1)
+        sample["growth_mb_per_hour"] = growth
+
+        reason = self.recycle_reason(sample)
+        sample["recycled"] = reason
+        if reason is not None:
+            self.recycles += 1
+            self._memory = []
+        if self._current is not None:
+            self._current.update(sample)
+        return reason
+
+    def recycle_reason(self, sample):
+        """Which limit *sample* crosses, e.g. ``"rss_mb 3210 > 3072"``, or None."""
+        for key, limit in self.limits.items():
+            value = sample.get(key)
+            if value is not None and value > limit:
+                return f"{key} {value} > {limit}"
+        return None
+
+    def end(self, seconds, failed):
+        """Close the iteration and append it to the time series file."""
+        record = {**self._current, "seconds": round(seconds, 3), "failed": failed}
+        self.failures += failed
+        self.samples.append(record)
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(record) + "\n")
+        self._current = None
+        return record
+
+    def summary(self):
+        """Iteration count, failures, recycles and first/last latency and memory."""
+        first, last = self.samples[0], self.samples[-1]
+        growth = [s["growth_mb_per_hour"] for s in self.samples
+                  if s.get("growth_mb_per_hour") is not None]
+        return {
+            "iterations": len(self.samples),
+            "failures": self.failures,
+            "recycles": self.recycles,
+            "elapsed": round(time.monotonic() - self._start, 1),
+            "seconds": (first["seconds"], last["seconds"]),
+            "rss_mb": (first.get("rss_mb"), last.get("rss_mb")),
+            "max_growth_mb_per_hour": max(growth, default=None),
+        }
+
+
+def run_soak(session, monitor, iterations=None, minutes=None):
+    """Run the collected items repeatedly until *iterations* or *minutes* is reached.
+
+    Session-scoped fixtures, and with them the driver pool, stay up between
+    iterations; function-scoped ones are set up and torn down per run.
+    """
+    items = session.items
+    deadline = time.monotonic() + minutes * 60 if minutes else None
+    iteration = 0
+    while True:
+        iteration += 1
+        monitor.begin(iteration)
+        failed_before = session.testsfailed
+        start = time.perf_counter()
+        for i, item in enumerate(items):
+            nextitem = items[(i + 1) % len(items)]
+            if nextitem is item:
+                # Keep everything above the test; the item itself is re-run.
+                nextitem = item.parent
+            item.ihook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+            if session.shouldfail or session.shouldstop:
+                break
+        monitor.end(time.perf_counter() - start, session.testsfailed > failed_before)
+        if session.shouldfail or session.shouldstop:
+            return
+        if iterations and iteration >= iterations:
+            return
+        if deadline is not None and time.monotonic() >= deadline:
+            return
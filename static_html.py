@@ -0,0 +1,157 @@
+"""Page checks answered from server-rendered HTML, without the browser.
+
+Some checks only ask whether the markup the server sent contains
+something, e.g. the home page navbar or the href of "See all QA jobs".
+For those, :class:`StaticHtml` fetches the page over pooled HTTP. It
+parses the page with lxml and evaluates the page object's own
+``(By, selector)`` locators against it: XPath as-is, CSS through
+cssselect. That costs one HTTP request instead of a navigation, script
+execution and explicit waits.
+
+A page class opts in with ``STATIC_HTML = True``, and a check with
+``static=True`` (see ``BasePage.is_displayed``). The checks fall back to
+the browser when the page has not opted in, when lxml/cssselect are not
+installed (they are optional), or when the fetch fails. Pages built by
+JavaScript, like the open positions list, keep using the browser.
+
+"Displayed" here means present in the markup and not hidden by the
+``hidden`` attribute, an inline ``display: none`` / ``visibility: hidden``
+style, ``<input type="hidden">`` or a ``<head>``, ``<template>``,
+``<noscript>``, ``<script>`` or ``<style>`` ancestor. Stylesheets are not
+applied.
+
+In ``--archive-mode replay`` documents come from the archive. In
+``record`` mode the fetched documents are added to it under the pseudo
+method ``STATIC``, so they never replace what the browser recorded for
+the same URL. Replay prefers the ``STATIC`` entry and falls back to the
+browser's ``GET``.
+"""
+import re
+import threading
+
+import requests
+
+from http_session import build_session
+
+try:
+    from cssselect import HTMLTranslator
+    from lxml import html as lxml_html
+except ImportError:  # optional: checks fall back to the browser
+    HTMLTranslator = lxml_html = None
+
+
+_HIDDEN_STYLE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.I)
+_NOT_RENDERED = {"head", "template", "noscript", "script", "style"}
+
+# Archive method of the documents fetched here; see the module docstring.
+ARCHIVE_METHOD = "STATIC"
+
+
+class StaticDocument:
+    """Parsed HTML of one URL, queried with ``[kind, selector]`` pairs.
+
+    The pairs are what ``BasePage._query`` builds from a locator.
+    """
+
+    _translator = HTMLTranslator() if HTMLTranslator is not None else None
+    _xpaths = {}
+
+    def __init__(self, html, url):
+        self.url = url  # after redirects
+        self.root = lxml_html.document_fromstring(html)
+        # Like the DOM's el.href, links come back absolute.
+        self.root.make_links_absolute(url)
+
+    def find_all(self, query):
+        kind, selector = query
+        if kind == "css":
+            if selector not in self._xpaths:
+                self._xpaths[selector] = self._translator.css_to_xpath(selector)
+            selector = self._xpaths[selector]
+        # <template> content is not part of the browser's DOM.
+        return [
+            node for node in self.root.xpath(selector)
+            if isinstance(node.tag, str) and not node.xpath("ancestor::template")
+        ]
+
+    def is_displayed(self, query):
+        return any(self._rendered(node) for node in self.find_all(query))
+
+    def attribute(self, query, name):
+        """*name* attribute of the first match, or None."""
+        nodes = self.find_all(query)
+        return nodes[0].get(name) if nodes else None
+
+    @property
+    def title(self):
+        nodes = self.root.xpath("//title")
+        return " ".join(nodes[0].text_content().split()) if nodes else ""
+
+    @staticmethod
+    def _rendered(node):
+        if node.tag == "input" and (node.get("type") or "").lower() == "hidden":
+            return False
+        while node is not None:
+            if node.tag in _NOT_RENDERED or node.get("hidden") is not None:
+                return False
+            if _HIDDEN_STYLE.search(node.get("style") or ""):
+                return False
+            node = node.getparent()
+        return True
+
+
+class StaticHtml:
+    """Fetches and parses pages for static checks; one per session."""
+
+    # The session's backend, installed by conftest; None sends every check
+    # to the browser.
+    active = None
+
+    def __init__(self, session=None, archive=None, replay=False, timeout=10):
+        self.session = session or build_session()
+        self.archive = archive
+        self.replay = replay
+        self.timeout = timeout
+        self.fetches = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def available():
+        return lxml_html is not None and HTMLTranslator is not None
+
+    def document(self, url):
+        """Return the parsed page at *url*, or None to use the browser instead."""
+        if not self.available():
+            return None
+        fetched = self._fetch(url)
+        with self._lock:
+            self.fetches += 1
+            if fetched is None:
+                self.failures += 1
+        return StaticDocument(*fetched) if fetched is not None else None
+
+    def _fetch(self, url):
+        """``(body, final URL)``, or None when the page could not be fetched."""
+        if self.replay:
+            found = self.archive.lookup(ARCHIVE_METHOD, url, count_miss=False)
+            if found is None:
+                found = self.archive.lookup("GET", url)
+            if found is None or found[0] != 200:
+                return None
+            return found[2], url
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException:
+            return None
+        if response.status_code != 200:
+            return None
+        if self.archive is not None:
+            self.archive.add(
+                ARCHIVE_METHOD, url, response.status_code, dict(response.headers),
+                response.content,
+            )
+        return response.content, response.url
+
+    def close(self):
+        self.session.close()
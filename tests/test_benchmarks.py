@@ -0,0 +1,31 @@
+import requests
+
+from benchmarks.bench_page_objects import compare
+from benchmarks.fixture_site import LOCATIONS, make_jobs, serve_site
+
+
+def test_compare_flags_only_real_regressions():
+    baseline = {"a": {"median": 0.100}, "b": {"median": 0.001}, "c": {"median": 0.100}}
+    results = {"a": {"median": 0.140}, "b": {"median": 0.003}, "c": {"median": 0.110}}
+
+    assert [name for name, *_ in compare(results, baseline, 1.25)] == ["a"]
+
+
+def test_fixture_site_serves_requested_job_count():
+    jobs = make_jobs(40)
+    assert len({job["department"] for job in jobs}) == 4
+
+    with serve_site(jobs=40) as site:
+        html = requests.get(site.url("open_positions")).text
+    assert html.count("jobs.lever.co/insiderone/") == 40
+    assert 'id="filter-by-location"' in html
+
+
+def test_fixture_site_lazy_listing_plants_one_violation():
+    jobs = make_jobs(10000, bad_at=2500)
+    assert [i for i, job in enumerate(jobs) if job["location"] not in LOCATIONS] == [2500]
+
+    with serve_site(jobs=10000, page_size=500) as site:
+        html = requests.get(site.url("open_positions")).text
+    assert "var PAGE_SIZE = 500;" in html
+    assert html.count("jobs.lever.co/insiderone/") == 10000
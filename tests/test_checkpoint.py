@@ -0,0 +1,100 @@
+import pytest
+
+from checkpoint import CheckpointStore, CheckpointedFlow
+from result_log import JsonlSink, StepFailed, StepRecorder, collect_tests, read_events
+
+
+class FakeDriver:
+    def __init__(self):
+        self.current_url = "about:blank"
+        self.cookies = []
+        self.visited = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == "Network.getAllCookies":
+            return {"cookies": self.cookies}
+        self.cookies = params["cookies"]
+        return {}
+
+    def get(self, url):
+        self.current_url = url
+        self.visited.append(url)
+
+    def execute_script(self, script, *args):
+        return {"local": {}, "session": {}}
+
+
+def _flow(tmp_path, driver, phases_run, fail_at=(), resume=False, retries=0):
+    sink = JsonlSink(tmp_path / "events.jsonl")
+    report = StepRecorder([sink], test="t.py::test_flow")
+    report.add_steps(["home", "careers", "filter", "lever"])
+    flow = CheckpointedFlow(
+        CheckpointStore(tmp_path / "checkpoints"), "t.py::test_flow", driver, report,
+        resume=resume, retries=retries,
+    )
+    failures = list(fail_at)
+
+    def phase(step, url):
+        def run():
+            phases_run.append(step)
+            driver.get(url)
+            if step in failures:
+                failures.remove(step)
+                raise AssertionError(f"step {step} flaked")
+            flow.state["last"] = step
+            report.pass_step(step, url)
+        return run
+
+    phases = [(n, phase(n, f"https://site/{n}")) for n in (1, 2, 3, 4)]
+    restored = []
+    try:
+        flow.run(phases, restore=lambda state: restored.append(dict(state)))
+    finally:
+        sink.close()
+    return flow, restored
+
+
+def test_failed_phase_is_retried_from_the_last_checkpoint(tmp_path):
+    driver, phases_run = FakeDriver(), []
+    driver.cookies = [{"name": "consent", "value": "yes", "domain": "site", "size": 10}]
+
+    flow, restored = _flow(tmp_path, driver, phases_run, fail_at=[3], retries=1)
+
+    assert phases_run == [1, 2, 3, 3, 4]
+    assert restored == [{"last": 2}]
+    assert driver.cookies == [{"name": "consent", "value": "yes", "domain": "site"}]
+    assert flow.store.load("t.py::test_flow") is None
+    results = collect_tests(read_events(tmp_path / "events.jsonl"))["t.py::test_flow"]["results"]
+    assert [results[i]["status"] for i in (1, 2, 3, 4)] == ["PASSED"] * 4
+
+
+def test_resume_runs_only_the_failing_tail(tmp_path):
+    with pytest.raises(AssertionError):
+        _flow(tmp_path, FakeDriver(), [], fail_at=[4])
+
+    driver, phases_run = FakeDriver(), []
+    flow, restored = _flow(tmp_path, driver, phases_run, resume=True)
+
+    assert phases_run == [4]
+    assert flow.resumed_from == 3
+    assert driver.visited[0] == "https://site/3"
+    events = list(read_events(tmp_path / "events.jsonl"))
+    assert [e["step"] for e in events if e.get("restored")] == [1, 2, 3]
+    assert collect_tests(events)["t.py::test_flow"]["results"][4]["status"] == "PASSED"
+
+
+def test_step_failed_is_reported_on_its_own_step(tmp_path):
+    sink = JsonlSink(tmp_path / "events.jsonl")
+    report = StepRecorder([sink], test="t::a")
+    report.add_steps(["list", "positions", "departments"])
+    flow = CheckpointedFlow(CheckpointStore(tmp_path), "t::a", FakeDriver(), report)
+
+    def checks():
+        report.pass_step(1, "listed")
+        raise StepFailed(3, "Job #7 department 'Sales' invalid.")
+
+    with pytest.raises(StepFailed):
+        flow.run([(3, checks)])
+    sink.close()
+    results = collect_tests(read_events(tmp_path / "events.jsonl"))["t::a"]["results"]
+    assert sorted(results) == [1, 3] and results[3]["status"] == "FAILED"
@@ -0,0 +1,96 @@
+import os
+
+import driver_factory
+from driver_factory import ChromeFactory, resolve_driver_path
+from driver_pool import DriverPool
+
+
+class FakeManager:
+    installs = 0
+
+    def __init__(self, path):
+        self.path = path
+
+    def install(self):
+        FakeManager.installs += 1
+        return self.path
+
+
+def test_driver_path_is_resolved_once_and_verified(tmp_path, monkeypatch):
+    binary = tmp_path / "chromedriver"
+    binary.write_bytes(b"v1")
+    cache = tmp_path / "cache.json"
+    FakeManager.installs = 0
+    monkeypatch.setattr(driver_factory, "ChromeDriverManager", lambda: FakeManager(str(binary)))
+
+    assert resolve_driver_path(cache) == str(binary)
+    assert resolve_driver_path(cache) == str(binary)
+    assert FakeManager.installs == 1
+
+    binary.write_bytes(b"tampered")
+    resolve_driver_path(cache)
+    assert FakeManager.installs == 2
+
+
+def test_fast_startup_is_headless_with_tuned_flags():
+    fast = ChromeFactory().options().arguments
+    cold = ChromeFactory(fast_startup=False).options().arguments
+
+    assert "--headless=new" in fast and "--no-first-run" in fast
+    assert "--start-maximized" in cold and "--no-first-run" not in cold
+    assert "--headless=new" not in ChromeFactory(headless=False).options().arguments
+
+
+def test_profile_template_race_uses_the_winners_template(tmp_path, monkeypatch):
+    template = tmp_path / "template"
+
+    class RacingChrome:
+        """Builds a profile while another worker finishes the template first."""
+
+        def __init__(self, service, options):
+            profile = next(a.split("=", 1)[1] for a in options.arguments
+                           if a.startswith("--user-data-dir="))
+            (tmp_path / profile / "Default").mkdir(parents=True)
+            (template / "Default").mkdir(parents=True)
+
+        def get(self, url):
+            pass
+
+        def quit(self):
+            pass
+
+    factory = ChromeFactory(profile_template=str(template))
+    monkeypatch.setattr(factory, "driver_path", lambda: "chromedriver")
+    monkeypatch.setattr(driver_factory, "ChromeService", lambda path: None)
+    monkeypatch.setattr(driver_factory.webdriver, "Chrome", RacingChrome)
+
+    assert factory.prepare_profile_template() == str(template)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["template"]
+
+
+def test_discarded_browser_leaves_no_profile_copy(tmp_path, monkeypatch):
+    template = tmp_path / "template"
+    (template / "Default").mkdir(parents=True)
+
+    class Chrome:
+        def __init__(self, service, options):
+            self.profile = next(a.split("=", 1)[1] for a in options.arguments
+                                if a.startswith("--user-data-dir="))
+
+        def quit(self):
+            pass
+
+    factory = ChromeFactory(profile_template=str(template))
+    monkeypatch.setattr(factory, "driver_path", lambda: "chromedriver")
+    monkeypatch.setattr(driver_factory, "ChromeService", lambda path: None)
+    monkeypatch.setattr(driver_factory.webdriver, "Chrome", Chrome)
+
+    pool = DriverPool(factory, max_uses=1)
+    first = pool.lease()
+    pool.release(first)
+    second = pool.lease()
+
+    assert not os.path.exists(first.profile)
+    assert os.path.isdir(second.profile)
+    factory.cleanup()
+    assert not os.path.exists(second.profile)
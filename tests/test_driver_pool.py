@@ -0,0 +1,122 @@
+from selenium.common.exceptions import WebDriverException
+from urllib3.exceptions import MaxRetryError
+
+from driver_pool import DriverPool
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def window(self, handle):
+        self._driver.current = handle
+
+    def new_window(self, kind):
+        self._driver.opened += 1
+        handle = f"tab{self._driver.opened}"
+        self._driver.window_handles_list.append(handle)
+        self._driver.current = handle
+
+
+class FakeDriver:
+    """Minimal stand-in for a WebDriver that records reset calls."""
+
+    def __init__(self):
+        self.window_handles_list = ["main"]
+        self.current = "main"
+        self.alive = True
+        self.quit_called = False
+        self.opened = 0
+        self.history = {"main": ["https://insiderone.com/careers/", "https://jobs.lever.co/x"]}
+        self.cdp = []
+        self.switch_to = FakeSwitchTo(self)
+
+    @property
+    def current_window_handle(self):
+        return self.current
+
+    @property
+    def window_handles(self):
+        if not self.alive:
+            raise WebDriverException("session deleted")
+        return list(self.window_handles_list)
+
+    def execute_script(self, script, *args):
+        if not self.alive:
+            raise WebDriverException("session deleted")
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((cmd, params.get("origin")))
+        if cmd == "Page.getNavigationHistory":
+            urls = ["about:blank"] + self.history.get(self.current, [])
+            return {"entries": [{"url": url} for url in urls]}
+        return {}
+
+    def close(self):
+        self.window_handles_list.remove(self.current)
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_pool_reuses_and_resets_browser():
+    pool = DriverPool(FakeDriver, max_uses=5)
+    first = pool.lease()
+    first.window_handles_list.append("popup")
+    pool.release(first)
+
+    second = pool.lease()
+    assert second is first
+    assert first.window_handles_list == ["tab1"] and first.current == "tab1"
+    cleared = [origin for cmd, origin in first.cdp if cmd == "Storage.clearDataForOrigin"]
+    # The origin left behind by the same-tab redirect is cleared too.
+    assert cleared == ["https://insiderone.com", "https://jobs.lever.co"]
+    assert pool.created == 1
+    assert len(pool.reset_times) == 1
+
+
+def test_pool_recycles_after_max_uses():
+    pool = DriverPool(FakeDriver, max_uses=2)
+    driver = pool.lease()
+    pool.release(driver)
+    pool.release(pool.lease())
+
+    assert driver.quit_called
+    assert pool.lease() is not driver
+    assert pool.created == 2
+    assert pool.recycled == 1
+
+
+def test_pool_replaces_crashed_browser():
+    pool = DriverPool(FakeDriver)
+    driver = pool.lease()
+    driver.alive = False
+    pool.release(driver)
+
+    assert driver.quit_called
+    assert pool.lease() is not driver
+    assert pool.stats()["recycled"] == 1
+
+
+def test_pool_replaces_browser_whose_chromedriver_died():
+    class DeadDriver(FakeDriver):
+        @property
+        def window_handles(self):
+            if not self.alive:
+                raise MaxRetryError(None, "/session/1/window/handles")
+            return list(self.window_handles_list)
+
+        def quit(self):
+            self.quit_called = True
+            raise ConnectionRefusedError("chromedriver is gone")
+
+    pool = DriverPool(DeadDriver)
+    driver = pool.lease()
+    driver.alive = False
+    pool.release(driver)
+    assert driver.quit_called and pool.recycled == 1
+
+    idle = pool.lease()
+    pool.release(idle)
+    idle.alive = False
+    assert pool.lease() is not idle and pool.recycled == 2
@@ -0,0 +1,73 @@
+import base64
+import gzip
+import json
+
+from openpyxl import load_workbook
+from selenium.common.exceptions import WebDriverException
+
+from failure_artifacts import ArtifactStore, FailureArtifacts
+from result_log import JsonlSink, StepRecorder, read_events, render_excel
+
+
+class FakeDriver:
+    current_url = "https://insiderone.com/careers/open-positions/"
+    page_source = "<html><body>" + "job " * 2000 + "</body></html>"
+
+    def get_screenshot_as_base64(self):
+        return base64.b64encode(b"\x89PNG fake").decode()
+
+    def get_log(self, kind):
+        raise WebDriverException("no browser log")
+
+
+def test_failed_step_saves_artifacts_in_background_and_links_them(tmp_path):
+    store = ArtifactStore(tmp_path / "artifacts")
+    log = tmp_path / "events.jsonl"
+    sink = JsonlSink(log)
+    report = StepRecorder(
+        [sink], test="t.py::test_a", artifacts=FailureArtifacts(store, FakeDriver())
+    )
+    report.add_steps(["Open page"])
+    report.fail_step(1, "boom")
+    sink.close()
+    store.close()
+
+    event = list(read_events(log))[-1]
+    folder = tmp_path / "artifacts" / event["artifacts"].rsplit("/", 1)[-1]
+    assert (folder / "screenshot.png").read_bytes() == b"\x89PNG fake"
+    assert (folder / "url.txt").read_text() == FakeDriver.current_url
+    assert gzip.decompress((folder / "page_source.html.gz").read_bytes()).decode() \
+        == FakeDriver.page_source
+    assert not (folder / "console.json.gz").exists()
+
+    render_excel(list(read_events(log)), tmp_path / "report.xlsx")
+    cell = load_workbook(tmp_path / "report.xlsx")["Test Report"]["D5"]
+    assert cell.hyperlink.target == f"artifacts/{folder.name}"
+
+
+def test_store_evicts_oldest_failures_over_the_cap(tmp_path):
+    store = ArtifactStore(tmp_path, max_bytes=1000)
+    paths = [
+        store.submit(f"fail{i}", {"url": "u", "console": [{"message": "x" * 50}],
+                                  "page_source": json.dumps(list(range(i, i + 300)))})
+        for i in range(5)
+    ]
+    store.close()
+
+    remaining = sorted(p.name for p in tmp_path.iterdir())
+    assert 0 < store.evicted == 5 - len(remaining)
+    assert remaining == sorted(p.rsplit("/", 1)[-1] for p in paths[-len(remaining):])
+    assert sum(f.stat().st_size for d in tmp_path.iterdir() for f in d.iterdir()) <= 1000
+
+
+def test_writer_survives_bad_capture_data(tmp_path):
+    store = ArtifactStore(tmp_path)
+    bad_screenshot = store.submit("bad1", {"url": "u", "screenshot": "not base64!"})
+    bad_source = store.submit("bad2", {"url": "u", "page_source": "\ud800"})
+    good = store.submit("good", {"url": "u", "page_source": "<html></html>"})
+    store.close()
+
+    assert [p.name for p in tmp_path.iterdir()] == [good.rsplit("/", 1)[-1]]
+    assert store.written == 1
+    assert [path for path, _ in store.failed] == [bad_screenshot, bad_source]
+    assert store.failed[0][1].startswith("Error") and "UnicodeEncodeError" in store.failed[1][1]
@@ -0,0 +1,115 @@
+import json
+import shutil
+
+import pytest
+import requests
+import urllib3
+from selenium.common.exceptions import WebDriverException
+
+from http_archive import ArchiveRecorder, HttpArchive, ReplayServer, request_key
+
+
+def test_request_key_drops_cache_busters_and_sorts_query():
+    assert request_key("get", "https://Insiderone.com:443/a?b=2&_=123&a=1&utm_source=x") == (
+        "GET https://insiderone.com/a?a=1&b=2"
+    )
+    assert request_key("GET", "http://localhost:8080") == "GET http://localhost:8080/"
+
+
+def test_archive_round_trip_and_fallback_match(tmp_path):
+    archive = HttpArchive(tmp_path / "har")
+    archive.add("GET", "https://site/page?v=1", 200, {"Content-Type": "text/html"}, b"<p>1</p>")
+    archive.add("GET", "https://site/list", 200, {"Content-Type": "text/html"}, b"<ul></ul>")
+    archive.save()
+
+    loaded = HttpArchive.load(tmp_path / "har")
+    assert loaded.lookup("GET", "https://site/page?v=1")[2] == b"<p>1</p>"
+    assert loaded.lookup("GET", "https://site/list?page=2")[2] == b"<ul></ul>"
+    # Another query of a path recorded only with a query is not guessed.
+    assert loaded.lookup("GET", "https://site/page?v=2") is None
+    assert loaded.lookup("GET", "https://site/other") is None
+    assert loaded.misses == ["GET https://site/page?v=2", "GET https://site/other"]
+
+
+def test_recorder_stores_bodies_from_performance_log(tmp_path):
+    class FakeDriver:
+        def execute_cdp_cmd(self, cmd, params):
+            return {"body": "aGVsbG8=", "base64Encoded": True}
+
+    archive = HttpArchive(tmp_path / "har")
+    ArchiveRecorder(archive).consume(FakeDriver(), [
+        {"method": "Network.requestWillBeSent",
+         "params": {"requestId": "1", "request": {"url": "https://site/", "method": "GET"}}},
+        {"method": "Network.responseReceived",
+         "params": {"requestId": "1", "response": {
+             "url": "https://site/", "status": 200,
+             "headers": {"Content-Type": "text/plain", "Content-Encoding": "gzip"}}}},
+        {"method": "Network.loadingFinished", "params": {"requestId": "1"}},
+    ])
+
+    status, headers, body = archive.lookup("GET", "https://site/")
+    assert (status, body) == (200, b"hello")
+    assert "Content-Encoding" not in headers
+
+
+def test_recorder_polls_log_and_skips_evicted_bodies(tmp_path):
+    class FakeDriver:
+        def __init__(self):
+            self.log = []
+
+        def get_log(self, kind):
+            entries, self.log = self.log, []
+            return [{"message": json.dumps({"message": m})} for m in entries]
+
+        def execute_cdp_cmd(self, cmd, params):
+            if params["requestId"] == "gone":
+                raise WebDriverException("No resource with given identifier found")
+            return {"body": "kept", "base64Encoded": False}
+
+    def finished(request_id, url):
+        return [
+            {"method": "Network.requestWillBeSent", "params": {
+                "requestId": request_id, "request": {"url": url, "method": "GET"}}},
+            {"method": "Network.responseReceived", "params": {
+                "requestId": request_id, "response": {"url": url, "status": 200}}},
+            {"method": "Network.loadingFinished", "params": {"requestId": request_id}},
+        ]
+
+    driver = FakeDriver()
+    archive = HttpArchive(tmp_path / "har")
+    recorder = ArchiveRecorder(archive, driver)
+    driver.log = finished("1", "https://site/a")
+    recorder.poll()
+    assert archive.lookup("GET", "https://site/a")[2] == b"kept"
+
+    driver.log = finished("gone", "https://site/b")
+    messages = recorder.drain()
+    # The page still sees every message read by the polls.
+    assert len(messages) == 6 and recorder.drain() == []
+    assert archive.lookup("GET", "https://site/b") is None
+    assert archive.unrecorded == ["GET https://site/b"]
+
+
+@pytest.mark.parametrize("https", [False, True])
+def test_replay_server_serves_archive_by_host_header(tmp_path, https):
+    if https and shutil.which("openssl") is None:
+        pytest.skip("openssl is needed to create the replay certificate")
+    archive = HttpArchive(tmp_path / "har")
+    scheme = "https" if https else "http"
+    archive.add("GET", f"{scheme}://insiderone.com/careers/", 200,
+                {"Content-Type": "text/html"}, b"careers")
+    server = ReplayServer(archive, https=https)
+    port = server.https_port if https else server.http_port
+    urllib3.disable_warnings()
+    try:
+        hit = requests.get(f"{scheme}://127.0.0.1:{port}/careers/",
+                           headers={"Host": "insiderone.com"}, verify=False)
+        miss = requests.get(f"{scheme}://127.0.0.1:{port}/nope",
+                            headers={"Host": "insiderone.com"}, verify=False)
+    finally:
+        server.close()
+
+    assert (hit.status_code, hit.text) == (200, "careers")
+    assert miss.status_code == 404
+    assert archive.misses == [f"GET {scheme}://insiderone.com/nope"]
+    assert any(arg.startswith("--host-resolver-rules=MAP *:80") for arg in server.chrome_arguments())
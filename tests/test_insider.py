@@ -1,9 +1,11 @@
 import pytest
 
+from job_feed import JobFeedClient
+from pages.base_page import BasePage
 from pages.home_page import HomePage
 from pages.careers_page import CareersPage
 from pages.open_positions_page import OpenPositionsPage
-from excel_reporter import ExcelReporter
+from result_log import StepFailed
 
 
 STEPS = [
@@ -23,6 +25,7 @@ STEPS = [
     "Verify all Position fields contain 'Quality Assurance' or 'QA'",
     "Verify all Department fields contain 'Quality Assurance'",
     "Verify all Location fields contain 'Istanbul'",
+    "Verify every 'View Role' link resolves to Lever (HTTP audit)",
     "Click 'View Role' on first job listing",
     "Verify redirect to Lever application form (lever.co)",
 ]
@@ -39,117 +42,369 @@ class TestInsiderQA:
            Location: Istanbul, Turkey and Department: Quality Assurance,
            then verify that the jobs list is present.
         3. Validate each job's Position, Department and Location fields.
-        4. Click "View Role" and verify redirection to Lever application form.
+        4. Check every "View Role" link over HTTP, then click the first one
+           and verify redirection to Lever application form.
     """
 
     @pytest.fixture(autouse=True)
-    def setup(self, driver):
+    def setup(self, driver, report, flow):
         self.driver = driver
         self.home_page = HomePage(driver)
         self.careers_page = CareersPage(driver)
         self.open_positions_page = OpenPositionsPage(driver)
-        self.report = ExcelReporter()
+        self.report = report
         self.report.add_steps(STEPS)
-        yield
-        self.report.open_file()
+        self.flow = flow
 
     def test_insider_career_workflow(self):
+        # Each phase ends at a page transition; a checkpoint is saved after
+        # every one, so a retry or --resume restarts at the failing phase.
+        self.flow.run(
+            [
+                (7, self._home_page_checks),
+                (9, self._open_qa_positions),
+                (11, self._apply_filters),
+                (17, self._check_listings),
+                (19, self._open_lever_form),
+            ],
+            restore=self._restore_filters,
+        )
+
+    def _restore_filters(self, state):
+        """Re-select the checkpoint's filters; they live in page state, not the URL."""
+        if "location" in state:
+            self.open_positions_page.filter_by_location(state["location"])
+        if "department" in state:
+            self.open_positions_page.filter_by_department(state["department"])
+
+    # ── Step 1: Visit Insider home page, verify main blocks ──────
+    def _home_page_checks(self):
+        self.home_page.open_home_page()
+        self.report.pass_step(1, "Navigated to insiderone.com")
+
+        self.home_page.accept_cookies()
+        self.report.pass_step(2, "Cookie banner handled")
+
+        assert self.home_page.is_home_page_opened(), \
+            "Insider home page did not open correctly."
+        self.report.pass_step(3, f"URL: {self.driver.current_url}")
+
+        page_title = self.home_page.get_page_title()
+        assert "Insider" in page_title, \
+            f"Page title '{page_title}' does not contain 'Insider'."
+        self.report.pass_step(4, f"Title: {page_title}")
+
+        blocks = self.home_page.get_main_blocks_visibility()
+        assert blocks["navbar"], \
+            "Navigation bar is not visible on the home page."
+        self.report.pass_step(5, "Navbar element found and visible")
+
+        assert blocks["hero"], \
+            "Hero section is not visible on the home page."
+        self.report.pass_step(6, "Hero section element found and visible")
+
+        assert blocks["footer"], \
+            "Footer section is not visible on the home page."
+        self.report.pass_step(7, "Footer element found and visible")
+
+    # ── Step 2: Go to QA careers, click "See all QA jobs", filter ─
+    def _open_qa_positions(self):
+        self.careers_page.open_careers_qa_page()
+        self.report.pass_step(8, f"URL: {self.driver.current_url}")
+
+        self.careers_page.click_see_all_qa_jobs()
+        self.report.pass_step(9, "Clicked 'See all QA jobs' link")
+
+    def _apply_filters(self):
+        self.open_positions_page.filter_by_location("Istanbul, Turkiye")
+        self.flow.state["location"] = "Istanbul, Turkiye"
+        self.report.pass_step(10, "Selected 'Istanbul, Turkiye' from dropdown")
+
+        self.open_positions_page.filter_by_department("Quality Assurance")
+        self.flow.state["department"] = "Quality Assurance"
+        self.report.pass_step(11, "Selected 'Quality Assurance' from dropdown")
+
+    def _check_listings(self):
+        self.open_positions_page.wait_for_jobs_to_load()
+        self.report.pass_step(12, "All visible jobs contain 'Istanbul'")
+
+        # ── Step 3: Verify Position, Department and Location ─────
+        # Records are streamed in chunks and checked as they arrive, so the
+        # first bad listing fails its step without reading the rest.
+        checks = {
+            # Some listings use "QA" instead of the full phrase.
+            14: ("position", lambda v: "Quality Assurance" in v or "QA" in v),
+            15: ("department", lambda v: "Quality Assurance" in v),
+            16: ("location", lambda v: "Istanbul" in v),
+        }
+        positions, locations, count = [], [], 0
+        for count, job in enumerate(self.open_positions_page.iter_jobs(), 1):
+            if count == 1:
+                self.report.pass_step(13, "Job listings present")
+            for step, (field, valid) in checks.items():
+                if not valid(job[field]):
+                    raise StepFailed(step, f"Job #{count} {field} '{job[field]}' invalid.")
+            positions.append(job["position"])
+            locations.append(job["location"])
+        assert count > 0, \
+            "No QA job listings found after filtering."
+        self.report.pass_step(14, f"{count} job(s): {', '.join(positions)}"[:250])
+        self.report.pass_step(15, "All departments = 'Quality Assurance'")
+        self.report.pass_step(16, ", ".join(locations)[:250])
+
+        # ── Step 4: "View Role" links → Lever application form ───
+        audit = self.open_positions_page.audit_view_role_links()
+        for entry in audit:
+            assert entry["status"] == 200 and "lever.co" in (entry["final_host"] or ""), \
+                f"'{entry['job']['position']}' link {entry['url']} -> " \
+                f"{entry['status'] or entry['error']} {entry['final_host'] or ''}"
+        slowest = max((entry["latency"] for entry in audit), default=0)
+        self.report.pass_step(
+            17, f"{len(audit)} link(s) reach lever.co, slowest {slowest:.2f}s"
+        )
+
+    def _open_lever_form(self):
+        self.open_positions_page.click_view_role(index=0)
+        self.report.pass_step(18, "Clicked 'View Role' on first listing")
+
+        self.open_positions_page.navigate_to_lever_page()
+        assert self.open_positions_page.is_lever_page(), \
+            f"Not on Lever. URL: {self.driver.current_url}"
+        self.report.pass_step(19, f"URL: {self.driver.current_url}")
+
+
+CONCURRENT_STEPS = [
+    "Load home, careers QA and open positions pages in parallel tabs",
+    "Verify home page navbar, hero and footer are visible",
+    "Verify 'See all QA jobs' link is visible on careers QA page",
+    "Verify filters and job list are present on open positions page",
+]
+
+
+class TestInsiderPagesConcurrent:
+    """
+    Readiness checks of the three workflow pages, loaded in parallel tabs
+    of one browser instead of one after another.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup(self, driver, report):
+        self.driver = driver
+        self.pages = [HomePage(driver), CareersPage(driver), OpenPositionsPage(driver)]
+        self.report = report
+        self.report.add_steps(CONCURRENT_STEPS)
+
+    def test_pages_ready_in_parallel_tabs(self):
         step = 0
         try:
-            # ── Step 1: Visit Insider home page, verify main blocks ──
             step = 1
-            self.home_page.open_home_page()
-            self.report.pass_step(1, "Navigated to insiderone.com")
+            outcome = BasePage.verify_in_tabs(self.driver, self.pages)
+            details = f"Ready in {outcome['elapsed']:.1f}s"
+            if outcome["saved"] is not None:
+                details += (
+                    f" vs {outcome['sequential']:.1f}s sequential — "
+                    f"saved {outcome['saved']:.1f}s"
+                )
+            self.report.pass_step(1, details)
 
-            step = 2
-            self.home_page.accept_cookies()
-            self.report.pass_step(2, "Cookie banner handled")
+            for step, page in enumerate(self.pages, 2):
+                result = outcome["pages"][type(page).__name__]
+                missing = [name for name, ok in result["checks"].items() if not ok]
+                assert not missing, \
+                    f"{type(page).__name__} not ready, missing: {', '.join(missing)}"
+                self.report.pass_step(
+                    step, f"Ready after {result['ready_after']:.2f}s: {result['url']}"
+                )
 
-            step = 3
-            assert self.home_page.is_home_page_opened(), \
-                "Insider home page did not open correctly."
-            self.report.pass_step(3, f"URL: {self.driver.current_url}")
+        except Exception as e:
+            if step > 0:
+                self.report.fail_step(step, str(e)[:250])
+            raise
 
-            step = 4
-            page_title = self.home_page.get_page_title()
-            assert "Insider" in page_title, \
-                f"Page title '{page_title}' does not contain 'Insider'."
-            self.report.pass_step(4, f"Title: {page_title}")
 
-            step = 5
-            assert self.home_page.is_navbar_displayed(), \
-                "Navigation bar is not visible on the home page."
-            self.report.pass_step(5, "Navbar element found and visible")
-
-            step = 6
-            assert self.home_page.is_hero_section_displayed(), \
-                "Hero section is not visible on the home page."
-            self.report.pass_step(6, "Hero section element found and visible")
-
-            step = 7
-            assert self.home_page.is_footer_displayed(), \
-                "Footer section is not visible on the home page."
-            self.report.pass_step(7, "Footer element found and visible")
-
-            # ── Step 2: Go to QA careers, click "See all QA jobs", filter ─
-            step = 8
-            self.careers_page.open_careers_qa_page()
-            self.report.pass_step(8, f"URL: {self.driver.current_url}")
-
-            step = 9
-            self.careers_page.click_see_all_qa_jobs()
-            self.report.pass_step(9, "Clicked 'See all QA jobs' link")
-
-            step = 10
-            self.open_positions_page.filter_by_location("Istanbul, Turkiye")
-            self.report.pass_step(10, "Selected 'Istanbul, Turkiye' from dropdown")
-
-            step = 11
-            self.open_positions_page.filter_by_department("Quality Assurance")
-            self.report.pass_step(11, "Selected 'Quality Assurance' from dropdown")
-
-            step = 12
-            self.open_positions_page.wait_for_jobs_to_load()
-            self.report.pass_step(12, "All visible jobs contain 'Istanbul'")
-
-            step = 13
-            jobs_data = self.open_positions_page.get_visible_jobs_data()
-            assert len(jobs_data) > 0, \
-                "No QA job listings found after filtering."
-            self.report.pass_step(13, f"{len(jobs_data)} job listing(s) found")
-
-            # ── Step 3: Verify Position, Department and Location ─────
-            step = 14
+FEED_STEPS = [
+    "Fetch QA postings in Istanbul, Turkiye from the job feed",
+    "Verify at least one job listing is present",
+    "Verify all Position fields contain 'Quality Assurance' or 'QA'",
+    "Verify all Department fields contain 'Quality Assurance'",
+    "Verify all Location fields contain 'Istanbul'",
+]
+
+
+class TestInsiderJobFeed:
+    """
+    Data checks of steps 13–16 run straight against the postings feed the
+    open positions page renders, without a browser.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup(self, report):
+        self.feed = JobFeedClient()
+        self.report = report
+        self.report.add_steps(FEED_STEPS)
+
+    def test_qa_jobs_in_istanbul_from_feed(self):
+        step = 0
+        try:
+            step = 1
+            jobs_data = self.feed.jobs(
+                location="Istanbul, Turkiye", department="Quality Assurance"
+            )
+            self.report.pass_step(1, f"Feed: {self.feed.url}")
+
+            step = 2
+            assert len(jobs_data) > 0, "No QA job listings found in the feed."
+            self.report.pass_step(2, f"{len(jobs_data)} job listing(s) found")
+
+            step = 3
             for i, job in enumerate(jobs_data):
-                # Some listings use "QA" instead of the full phrase.
                 assert "Quality Assurance" in job["position"] or "QA" in job["position"], \
                     f"Job #{i+1} position '{job['position']}' invalid."
-            positions = ", ".join(j["position"] for j in jobs_data)
-            self.report.pass_step(14, positions[:250])
+            self.report.pass_step(3, ", ".join(j["position"] for j in jobs_data)[:250])
 
-            step = 15
+            step = 4
             for i, job in enumerate(jobs_data):
                 assert "Quality Assurance" in job["department"], \
                     f"Job #{i+1} department '{job['department']}' invalid."
-            self.report.pass_step(15, "All departments = 'Quality Assurance'")
+            self.report.pass_step(4, "All departments = 'Quality Assurance'")
 
-            step = 16
+            step = 5
             for i, job in enumerate(jobs_data):
                 assert "Istanbul" in job["location"], \
                     f"Job #{i+1} location '{job['location']}' invalid."
-            locations = ", ".join(j["location"] for j in jobs_data)
-            self.report.pass_step(16, locations[:250])
-
-            # ── Step 4: Click "View Role" → Lever application form ───
-            step = 17
-            self.open_positions_page.click_view_role(index=0)
-            self.report.pass_step(17, "Clicked 'View Role' on first listing")
-
-            step = 18
-            self.open_positions_page.navigate_to_lever_page()
-            assert self.open_positions_page.is_lever_page(), \
-                f"Not on Lever. URL: {self.driver.current_url}"
-            self.report.pass_step(18, f"URL: {self.driver.current_url}")
+            self.report.pass_step(5, ", ".join(j["location"] for j in jobs_data)[:250])
+
+        except Exception as e:
+            if step > 0:
+                self.report.fail_step(step, str(e)[:250])
+            raise
+
+
+STATIC_STEPS = [
+    "Read home and careers QA pages from server-rendered HTML",
+    "Verify page title contains 'Insider'",
+    "Verify navigation bar and footer are in the home page",
+    "Verify 'See all QA jobs' links to open positions",
+]
+
+
+class TestInsiderStaticChecks:
+    """
+    Home and careers checks that need no JavaScript, answered from the
+    server-rendered HTML. Falls back to the browser when that is not
+    available (see static_html).
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup(self, request, static_html, report):
+        self.request = request
+        self.home_page = HomePage(None)
+        self.careers_page = CareersPage(None)
+        self.report = report
+        self.report.add_steps(STATIC_STEPS)
+
+    def _use_browser(self):
+        driver = self.request.getfixturevalue("driver")
+        self.home_page = HomePage(driver)
+        self.careers_page = CareersPage(driver)
+        self.home_page.open_home_page()
+
+    def test_home_and_careers_markup(self):
+        step = 0
+        try:
+            step = 1
+            static = all(
+                page.static_document() is not None
+                for page in (self.home_page, self.careers_page)
+            )
+            if not static:
+                self._use_browser()
+            self.report.pass_step(1, "Server HTML" if static else "Browser (fallback)")
+
+            step = 2
+            page_title = self.home_page.get_page_title(static=static)
+            assert "Insider" in page_title, \
+                f"Page title '{page_title}' does not contain 'Insider'."
+            self.report.pass_step(2, f"Title: {page_title}")
+
+            step = 3
+            assert self.home_page.is_navbar_displayed(static=static), \
+                "Navigation bar is missing from the home page."
+            assert self.home_page.is_footer_displayed(static=static), \
+                "Footer is missing from the home page."
+            self.report.pass_step(3, "Navbar and footer present")
+
+            step = 4
+            if not static:
+                self.careers_page.open_careers_qa_page()
+            href = self.careers_page.get_see_all_qa_jobs_href(static=static)
+            assert href and "open-positions" in href, \
+                f"'See all QA jobs' href '{href}' does not point to open positions."
+            self.report.pass_step(4, f"href: {href}")
+
+        except Exception as e:
+            if step > 0:
+                self.report.fail_step(step, str(e)[:250])
+            raise
+
+
+MATRIX_STEPS = [
+    "Open the open positions page",
+    "Read the location and department filter options",
+    "Collect jobs for every location × department combination",
+    "Verify every listed job matches its combination's filters",
+]
+
+
+class TestInsiderFilterMatrix:
+    """
+    Every location × department combination checked on one loaded open
+    positions page, switching the filters in place.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup(self, driver, report):
+        self.driver = driver
+        self.open_positions_page = OpenPositionsPage(driver)
+        self.report = report
+        self.report.add_steps(MATRIX_STEPS)
+
+    def test_filter_combinations(self):
+        step = 0
+        try:
+            step = 1
+            self.open_positions_page.open(OpenPositionsPage.URL)
+            self.report.pass_step(1, self.open_positions_page.get_current_url())
+
+            step = 2
+            options = self.open_positions_page.filter_options()
+            assert options["location"] and options["department"], \
+                "Filters offer no options."
+            self.report.pass_step(
+                2,
+                f"{len(options['location'])} location(s), "
+                f"{len(options['department'])} department(s)",
+            )
+
+            step = 3
+            matrix = self.open_positions_page.filter_matrix()
+            non_empty = sum(1 for jobs in matrix.values() if jobs)
+            self.report.pass_step(
+                3, f"{len(matrix)} combination(s), {non_empty} with job listings"
+            )
+
+            step = 4
+            for (location, department), jobs in matrix.items():
+                location_label = options["location"][location]
+                department_label = options["department"][department]
+                for job in jobs:
+                    assert location_label in job["location"], \
+                        f"[{location_label} / {department_label}] " \
+                        f"location '{job['location']}' invalid."
+                    assert department_label in job["department"], \
+                        f"[{location_label} / {department_label}] " \
+                        f"department '{job['department']}' invalid."
+            self.report.pass_step(4, "All listed jobs match their filters")
 
         except Exception as e:
             if step > 0:
@@ -0,0 +1,53 @@
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from excel_reporter import ExcelReporter
+from instrumentation import Instrumentation, InstrumentedWait, percentile
+from result_log import JsonlSink, StepRecorder, read_events
+
+
+def test_wait_reports_duration_and_polls():
+    recorder = Instrumentation()
+    calls = iter([False, False, True])
+    wait = InstrumentedWait(object(), 2, recorder=recorder, poll_frequency=0.01)
+
+    assert wait.until(lambda d: next(calls))
+    metrics = recorder.mark_step()
+    assert (metrics["waits"], metrics["wait_polls"], metrics["wait_timeouts"]) == (1, 3, 0)
+
+
+def test_wait_timeout_is_recorded():
+    recorder = Instrumentation()
+    wait = InstrumentedWait(object(), 0.05, recorder=recorder, poll_frequency=0.01)
+
+    with pytest.raises(TimeoutException):
+        wait.until(lambda d: False)
+    assert recorder.mark_step()["wait_timeouts"] == 1
+
+
+def test_step_metrics_reach_excel_columns_and_latency_sheet(tmp_path):
+    recorder = Instrumentation()
+    sink = JsonlSink(tmp_path / "events.jsonl")
+    report = StepRecorder([sink], test="t::test", instrumentation=recorder)
+    report.add_steps(["Open page", "Click"])
+    recorder.record_command("get", 0.5)
+    report.pass_step(1)
+    recorder.record_command("find", 0.02)
+    recorder.record_command("click", 0.04)
+    report.pass_step(2)
+    sink.close()
+
+    excel = ExcelReporter.from_events(list(read_events(tmp_path / "events.jsonl")), tmp_path / "r.xlsx")
+
+    assert excel.ws.cell(row=5, column=7).value == 1
+    assert excel.ws.cell(row=6, column=7).value == 2
+    latency = excel.wb["Command Latency"]
+    assert [latency.cell(row=r, column=1).value for r in (2, 3, 4)] == ["click", "find", "get"]
+    assert latency.cell(row=4, column=3).value == 500.0
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile([], 95) == 0.0
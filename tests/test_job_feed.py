@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from job_feed import JobFeedClient
+from local_server import serve
+from pages.open_positions_page import Job
+
+
+POSTINGS = [
+    {
+        "text": "Senior QA Engineer",
+        "categories": {
+            "location": "Istanbul, Turkiye", "department": "Quality Assurance",
+            "allLocations": ["Istanbul, Turkiye"],
+        },
+    },
+    {
+        "text": "Software QA Tester",
+        "categories": {
+            "location": "Remote", "department": "Quality Assurance",
+            "allLocations": ["Remote", "Istanbul, Turkiye"],
+        },
+    },
+    {
+        "text": "Backend Engineer",
+        "categories": {"location": "Istanbul, Turkiye", "team": "Engineering"},
+    },
+]
+
+
+@pytest.fixture(scope="module")
+def feed_url():
+    routes = {"/v0/postings/insiderone": ("application/json", json.dumps(POSTINGS))}
+    with serve(routes) as base:
+        yield f"{base}/v0/postings/insiderone"
+
+
+def test_filters_match_page_semantics(feed_url):
+    client = JobFeedClient(feed_url)
+
+    jobs = client.jobs(location="Istanbul, Turkiye", department="Quality Assurance")
+
+    assert jobs == [
+        Job("Senior QA Engineer", "Quality Assurance", "Istanbul, Turkiye"),
+        Job("Software QA Tester", "Quality Assurance", "Istanbul, Turkiye"),
+    ]
+    assert all("Istanbul" in job["location"] for job in jobs)
+    assert client.jobs(location="All")[1]["location"] == "Remote"
+    assert client.jobs(department="Engineering")[0]["position"] == "Backend Engineer"
+
+
+def test_feed_is_fetched_once_per_client(feed_url, monkeypatch):
+    client = JobFeedClient(feed_url)
+    calls = []
+    original = client.session.get
+    monkeypatch.setattr(
+        client.session, "get", lambda *a, **kw: calls.append(a) or original(*a, **kw)
+    )
+
+    client.jobs(location="Remote")
+    client.jobs(department="Quality Assurance")
+
+    assert len(calls) == 1
+
+
+def test_filter_options_list_dropdown_values(feed_url):
+    options = JobFeedClient(feed_url).filter_options()
+
+    assert options["locations"] == ["Istanbul, Turkiye", "Remote"]
+    assert options["departments"] == ["Engineering", "Quality Assurance"]
@@ -0,0 +1,66 @@
+import threading
+
+import requests
+
+from link_audit import audit_links
+from local_server import serve
+
+
+def test_links_are_checked_concurrently_and_follow_redirects():
+    barrier = threading.Barrier(3, timeout=5)
+    lock = threading.Lock()
+    in_flight = {"now": 0, "peak": 0}
+
+    def slow_posting(handler):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        # Sequential requests would never get all three here at once.
+        barrier.wait()
+        with lock:
+            in_flight["now"] -= 1
+        return ("text/html", "<h1>Apply</h1>")
+
+    routes = {
+        "/apply": slow_posting,
+        "/gone": (404, "text/plain", "not found"),
+    }
+    with serve(routes) as base:
+        routes["/jobs/1"] = (302, "text/plain", "", {"Location": f"{base}/apply"})
+        urls = [f"{base}/jobs/1", f"{base}/apply", f"{base}/apply", f"{base}/gone"]
+        results = audit_links(urls, workers=4)
+
+    assert [r["url"] for r in results] == urls
+    assert [r["status"] for r in results] == [200, 200, 200, 404]
+    assert results[0]["final_url"] == f"{base}/apply"
+    assert results[0]["final_host"] == "127.0.0.1"
+    assert in_flight["peak"] == 3
+
+
+def test_connection_errors_are_reported_not_raised():
+    with serve({}) as base:
+        pass
+    [result] = audit_links([f"{base}/jobs/1"], timeout=1)
+
+    assert result["status"] is None
+    assert result["error"].startswith("ConnectionError")
+
+
+def test_only_sessions_created_by_the_audit_are_closed(monkeypatch):
+    closed = []
+
+    class Session:
+        def __init__(self, name):
+            self.name = name
+
+        def get(self, url, **kwargs):
+            raise requests.ConnectionError("offline")
+
+        def close(self):
+            closed.append(self.name)
+
+    monkeypatch.setattr("link_audit.build_session", lambda pool_size: Session("own"))
+    audit_links(["https://jobs.lever.co/1"])
+    audit_links(["https://jobs.lever.co/1"], session=Session("caller's"))
+
+    assert closed == ["own"]
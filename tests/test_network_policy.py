@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from network_policy import NetworkPolicy, NetworkSession, drain_performance_log
+
+
+def _entry(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+class FakeDriver:
+    def __init__(self, entries):
+        self.entries = entries
+
+    def get_log(self, kind):
+        entries, self.entries = self.entries, []
+        return entries
+
+
+def test_policy_expands_resource_types_to_url_patterns():
+    policy = NetworkPolicy(["*hotjar.com*"], ("font",))
+
+    assert "*hotjar.com*" in policy.url_patterns()
+    assert "*.woff*" in policy.url_patterns()
+    with pytest.raises(ValueError):
+        NetworkPolicy(block_types=("stylesheet",))
+
+
+def test_collect_counts_loaded_and_blocked_requests(tmp_path):
+    sizes_path = tmp_path / "sizes.json"
+    sizes_path.write_text(json.dumps({"https://cdn/x.png": 2048}))
+    session = NetworkSession(sizes_path=sizes_path)
+    driver = FakeDriver([
+        _entry("Network.requestWillBeSent", requestId="1", request={"url": "https://site/"}),
+        _entry("Network.loadingFinished", requestId="1", encodedDataLength=1000),
+        _entry("Network.requestWillBeSent", requestId="2", request={"url": "https://cdn/x.png"}),
+        _entry("Network.loadingFailed", requestId="2", blockedReason="inspector"),
+    ])
+
+    stats = session.collect(drain_performance_log(driver))
+
+    assert stats == {"requests": 2, "bytes": 1000, "blocked": 1, "blocked_bytes": 2048}
+    assert drain_performance_log(driver) == []
+    session.save_sizes()
+    assert json.loads(sizes_path.read_text()) == {
+        "https://cdn/x.png": 2048, "https://site/": 1000,
+    }
+    # Without a session nothing is estimated or kept.
+    assert NetworkPolicy.collect([])["blocked_bytes"] == 0
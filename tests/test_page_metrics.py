@@ -0,0 +1,67 @@
+import json
+
+import pytest
+from openpyxl import load_workbook
+
+from page_metrics import PerformanceBudget, PerformanceBudgetExceeded, append_time_series
+from pages.base_page import BasePage
+from result_log import render_excel
+
+
+METRICS = {
+    "ttfb": 420, "dom_content_loaded": 1800, "load": 5200, "lcp": None,
+    "cls": 0.02, "transferred": 2048, "requests": 12,
+}
+
+
+def test_budget_fails_only_on_reported_metrics_over_the_limit(monkeypatch):
+    budget = PerformanceBudget(ttfb=300, load=8000, lcp=2500)
+
+    assert budget.violations(METRICS) == ["ttfb 420 > 300"]
+    with pytest.raises(PerformanceBudgetExceeded, match="HomePage over budget"):
+        budget.check("HomePage", "https://insiderone.com/", METRICS)
+    monkeypatch.setattr(PerformanceBudget, "enabled", False)
+    budget.check("HomePage", "https://insiderone.com/", METRICS)
+    with pytest.raises(ValueError):
+        PerformanceBudget(fcp=1000)
+
+
+def test_page_load_sheet_and_time_series(tmp_path):
+    entry = {"page": "HomePage", "url": "https://insiderone.com/", "time": "t",
+             "over_budget": ["ttfb 420 > 300"], **METRICS}
+    events = [
+        {"test": "t::a", "event": "steps", "steps": ["Open home page"]},
+        {"test": "t::a", "event": "step", "step": 1, "status": "PASSED",
+         "details": "", "time": "10:00:00", "duration": 1.0, "page_metrics": [entry]},
+    ]
+    render_excel(events, tmp_path / "report.xlsx")
+    ws = load_workbook(tmp_path / "report.xlsx")["Page Load"]
+    assert [c.value for c in ws[2]][3:7] == [420, 1800, 5200, None]
+    assert ws["K2"].value == "ttfb 420 > 300"
+
+    series = tmp_path / "page_metrics.jsonl"
+    append_time_series([entry], series, run_id="r1")
+    append_time_series([entry], series, run_id="r2")
+    runs = [json.loads(line)["run"] for line in series.read_text().splitlines()]
+    assert runs == ["r1", "r2"]
+
+
+def test_click_navigation_metrics_wait_for_the_load_event():
+    class LoadingDriver:
+        current_url = "https://insiderone.com/careers/open-positions/"
+
+        def __init__(self):
+            self.states = ["loading", "interactive", "complete"]
+            self.collected_in = None
+
+        def execute_script(self, script):
+            return self.states.pop(0) if len(self.states) > 1 else self.states[0]
+
+        def execute_async_script(self, script):
+            self.collected_in = self.states[0]
+            return METRICS
+
+    driver = LoadingDriver()
+    page = BasePage(driver)
+    assert page._record_navigation("OpenPositionsPage", timeout=2) == METRICS
+    assert driver.collected_in == "complete"
@@ -0,0 +1,307 @@
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+
+from pages.base_page import ELEMENT_CACHE_MISS_LIMIT, BasePage
+from pages.careers_page import CareersPage
+from pages.open_positions_page import Job, OpenPositionsPage
+
+
+def test_job_record_supports_dict_style_access():
+    job = Job("QA Engineer", "Quality Assurance", "Istanbul, Turkiye")
+
+    assert job["position"] == "QA Engineer"
+    assert job == Job(**job.as_dict())
+    with pytest.raises(KeyError):
+        job["salary"]
+    with pytest.raises(AttributeError):
+        job.salary = 1
+
+
+def test_query_translates_locators_for_batched_js():
+    assert BasePage._query((By.ID, "jobs-list")) == ["css", '[id="jobs-list"]']
+    assert BasePage._query(OpenPositionsPage.VIEW_ROLE_BTN)[0] == "xpath"
+    assert BasePage._query((By.CLASS_NAME, "btn")) == ["css", ".btn"]
+    with pytest.raises(ValueError):
+        BasePage._query((By.LINK_TEXT, "View Role"))
+
+
+class FakeElement:
+    def __init__(self, driver):
+        self.driver = driver
+        self.clicks = 0
+
+    def get_attribute(self, name):
+        return "https://insiderone.com/"
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        if self not in self.driver.attached:
+            raise StaleElementReferenceException("detached")
+        self.clicks += 1
+
+
+class FakeDriver:
+    def __init__(self):
+        self.generation = "doc:0"
+        self.lookups = 0
+        self.scripts = 0
+        self.attached = []
+
+    def execute_script(self, script, *args):
+        self.scripts += 1
+        return self.generation
+
+    def find_element(self, by, value):
+        self.lookups += 1
+        element = FakeElement(self)
+        self.attached = [element]
+        return element
+
+
+def test_element_cache_follows_dom_generation_and_recovers_from_stale():
+    driver = FakeDriver()
+    page = BasePage(driver)
+    locator = (By.ID, "navigation")
+
+    first = page.find(locator)
+    assert page.find(locator) is first and driver.lookups == 1
+
+    driver.generation = "doc:1"
+    assert page.find(locator) is not first and driver.lookups == 2
+
+    # Visible is not clickable: the first click waits for clickability.
+    page.click(locator)
+    page.click(locator)
+    assert driver.lookups == 3 and driver.attached[0].clicks == 2
+
+    driver.attached = []
+    page.click(locator)
+    assert driver.lookups == 4 and driver.attached[0].clicks == 1
+
+
+def test_see_all_qa_jobs_resolves_the_link_once():
+    class CareersDriver(FakeDriver):
+        current_url = "https://insiderone.com/careers/open-positions/"
+
+        def execute_script(self, script, *args):
+            if "readyState" in script:
+                return "complete"
+            return super().execute_script(script, *args)
+
+        def execute_async_script(self, script, *args):
+            return None
+
+    driver = CareersDriver()
+    CareersPage(driver).click_see_all_qa_jobs()
+
+    assert driver.lookups == 1 and driver.attached[0].clicks == 1
+    # The generation check and the scroll into view.
+    assert driver.scripts == 2
+
+
+def test_present_element_is_not_reused_for_clicks():
+    driver = FakeDriver()
+    page = BasePage(driver)
+    locator = (By.ID, "navigation")
+
+    assert page.get_attribute(locator, "href") == "https://insiderone.com/"
+    page.click(locator)
+    assert driver.lookups == 2
+    assert page.get_attribute(locator, "href") and driver.lookups == 2
+
+
+def test_element_cache_stops_on_a_continuously_mutating_page():
+    driver = FakeDriver()
+    page = BasePage(driver)
+    locator = (By.ID, "navigation")
+
+    page.find(locator)
+    for count in range(1, ELEMENT_CACHE_MISS_LIMIT + 1):
+        driver.generation = f"doc:{count}"
+        page.find(locator)
+    scripts = driver.scripts
+    page.find(locator)
+    # No generation check any more, just the lookup.
+    assert driver.scripts == scripts and driver.lookups == ELEMENT_CACHE_MISS_LIMIT + 2
+
+
+class HelperDriver:
+    """Emulates window.__qa per document and DevTools script registration."""
+
+    def __init__(self):
+        self.installed = None
+        self.scripts = []
+        self.cdp = []
+        self.current_window_handle = "tab-1"
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        version, name, call_args = args
+        if script.startswith("(function () {"):
+            self.installed = version
+        if self.installed != version:
+            return {"__qaMissing": True}
+        return [name, call_args]
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append(cmd)
+        return {"identifier": str(len(self.cdp))}
+
+
+def test_helpers_installed_once_and_called_by_name():
+    driver = HelperDriver()
+    page = BasePage(driver)
+
+    assert page._call("countVisible", ["css", ".a"]) == ["countVisible", [["css", ".a"]]]
+    assert len(driver.scripts) == 2 and "window.__qa = {" in driver.scripts[1]
+    assert driver.cdp == ["Page.addScriptToEvaluateOnNewDocument"]
+
+    page._call("countVisible", ["css", ".b"])
+    assert len(driver.scripts) == 3 and "window.__qa = {" not in driver.scripts[2]
+
+    # New document without the helpers (e.g. another tab): reinstalled, but
+    # the tab's new-document script is only registered once per version.
+    driver.installed = None
+    page._call("countVisible", ["css", ".c"])
+    assert len(driver.scripts) == 5 and driver.cdp == ["Page.addScriptToEvaluateOnNewDocument"]
+
+
+def test_helper_library_versions_follow_sources():
+    from pages.base_page import _HelperLibrary
+
+    library = _HelperLibrary()
+    library.register({"one": "function () { return 1; }"})
+    version, source = library.build()
+    assert f"var version = '{version}';" in source
+
+    library.register({"two": "function () { return 2; }"})
+    assert library.build()[0] != version
+    with pytest.raises(ValueError):
+        library.register({"one": "function () { return 3; }"})
+
+
+def test_iter_jobs_continues_each_chunk_where_the_last_one_stopped():
+    cards = [{"position": f"QA {i}", "department": "QA", "location": "Remote"}
+             for i in range(10)]
+    visited, calls = [], []
+
+    class ListingPage(OpenPositionsPage):
+        def _call(self, name, *args):
+            calls.append(name)
+            _, _, _, start, limit = args
+            chunk = cards[start:start + limit]
+            visited.extend(range(start, start + len(chunk)))
+            return [chunk, start + len(chunk)]
+
+    class NoLoadMoreDriver:
+        def find_elements(self, by, value):
+            return []
+
+    jobs = list(ListingPage(NoLoadMoreDriver()).iter_jobs(chunk_size=4))
+
+    assert [job["position"] for job in jobs] == [c["position"] for c in cards]
+    # Every card is visited once, and no "Load more" wait without the control.
+    assert visited == list(range(10)) and calls == ["extract"] * 3
+
+
+class TabDriver:
+    """Opens tabs, reports a fixed load time per tab and records closes."""
+
+    def __init__(self, loads, fail_on=None):
+        self.loads = loads
+        self.fail_on = fail_on
+        self.handles = ["origin"]
+        self.current_window_handle = "origin"
+        self.closed = []
+        self.switch_to = self
+
+    def new_window(self, kind):
+        self.handles.append(f"tab{len(self.handles)}")
+        self.current_window_handle = self.handles[-1]
+
+    def window(self, handle):
+        self.current_window_handle = handle
+
+    def close(self):
+        self.closed.append(self.current_window_handle)
+
+    def execute_script(self, script, *args):
+        if args and args[0] == self.fail_on:
+            raise StaleElementReferenceException("navigation failed")
+        return self.loads.get(self.current_window_handle)
+
+    def find_elements(self, by, value):
+        return [type("Shown", (), {"is_displayed": lambda self: True})()]
+
+
+def _tab_pages(driver, *urls):
+    pages = []
+    for i, url in enumerate(urls):
+        page_class = type(f"Page{i}", (BasePage,), {
+            "URL": url, "READY_CHECKS": {"body": (By.TAG_NAME, "body")},
+        })
+        pages.append(page_class(driver))
+    return pages
+
+
+def test_verify_in_tabs_sums_each_tabs_own_load_time():
+    driver = TabDriver({"tab1": 2.0, "tab2": 3.5})
+    outcome = BasePage.verify_in_tabs(driver, _tab_pages(driver, "https://a/", "https://b/"))
+
+    assert outcome["pages"]["Page1"]["load"] == 3.5
+    assert outcome["sequential"] == 5.5
+    assert outcome["saved"] == round(5.5 - outcome["elapsed"], 3)
+    assert driver.closed == ["tab1", "tab2"] and driver.current_window_handle == "origin"
+
+    driver = TabDriver({"tab1": 2.0})
+    assert BasePage.verify_in_tabs(
+        driver, _tab_pages(driver, "https://a/", "https://b/")
+    )["saved"] is None
+
+
+def test_verify_in_tabs_closes_tabs_when_a_check_raises():
+    driver = TabDriver({}, fail_on="https://b/")
+    with pytest.raises(StaleElementReferenceException):
+        BasePage.verify_in_tabs(driver, _tab_pages(driver, "https://a/", "https://b/"))
+
+    assert driver.closed == ["tab1", "tab2"] and driver.current_window_handle == "origin"
+
+
+def test_filter_matrix_settles_location_changes_and_open_clears_the_memo():
+    calls = []
+
+    class MatrixPage(OpenPositionsPage):
+        def _wait_for_page_ready(self):
+            pass
+
+        def _wait_for_dom_settle(self, quiet=0.5, timeout=10, select=None):
+            calls.append(select)
+            return True
+
+        def _collect_jobs_via_js(self):
+            return [Job("QA", *[value for _, value in calls[-2:]])]
+
+    class NavigatingDriver:
+        def get(self, url):
+            pass
+
+    page = MatrixPage(NavigatingDriver())
+    matrix = page.filter_matrix(["Istanbul", "Remote"], ["QA"])
+
+    assert calls == [
+        ("filter-by-location", "Istanbul"), ("filter-by-department", "QA"),
+        ("filter-by-location", "Remote"), ("filter-by-department", "QA"),
+    ]
+    assert matrix[("Remote", "QA")] == [Job("QA", "Remote", "QA")]
+    page.filter_matrix(["Istanbul"], ["QA"])
+    assert len(calls) == 4
+
+    page.open(OpenPositionsPage.URL)
+    page.filter_matrix(["Istanbul"], ["QA"])
+    assert len(calls) == 6
@@ -0,0 +1,65 @@
+import os
+from types import SimpleNamespace
+
+import parallel_runner
+from parallel_runner import run_parallel, shard
+
+
+def test_shard_balances_longest_first():
+    durations = {"a": 10.0, "b": 7.0, "c": 5.0, "d": 3.0, "e": 2.0}
+    buckets = shard(list(durations), durations, 2)
+
+    loads = [sum(durations[n] for n in b) for b in buckets]
+    assert sorted(loads) == [13.0, 14.0]
+    assert buckets[0][0] == "a"
+
+
+def test_shard_uses_average_for_unknown_tests():
+    durations = {"a": 4.0, "b": 4.0}
+    buckets = shard(["a", "b", "new"], durations, 3)
+
+    assert sorted(len(b) for b in buckets) == [1, 1, 1]
+
+
+
+def test_workers_get_the_parent_options_and_their_shard(tmp_path, monkeypatch):
+    commands = []
+
+    class FakeWorker:
+        returncode = 0
+
+        def __init__(self, cmd, cwd, stdout, stderr):
+            commands.append(cmd)
+
+        def wait(self):
+            pass
+
+    monkeypatch.setattr(parallel_runner.subprocess, "Popen", FakeWorker)
+    terminal = SimpleNamespace(write_sep=lambda *a: None, write_line=lambda *a: None)
+    config = SimpleNamespace(
+        invocation_params=SimpleNamespace(args=(
+            "-q", "--workers", "2", "--archive-mode", "replay", "tests/test_insider.py",
+            "--headed", "--workers=2",
+        )),
+        args=["tests/test_insider.py"],
+        rootpath=tmp_path,
+        pluginmanager=SimpleNamespace(get_plugin=lambda name: terminal),
+    )
+    session = SimpleNamespace(config=config, items=[
+        SimpleNamespace(nodeid="tests/test_insider.py::A::test_a"),
+        SimpleNamespace(nodeid="tests/test_insider.py::B::test_b"),
+    ])
+
+    run_parallel(session, 2, tmp_path / "durations.json", tmp_path / "events.jsonl")
+
+    assert len(commands) == 2
+    for i, cmd in enumerate(commands):
+        options = cmd[3:cmd.index("-o")]
+        assert options == ["-q", "--archive-mode", "replay", "--headed"]
+        assert cmd[cmd.index("--worker-id") + 1] == str(i)
+    assert sorted(cmd[-1] for cmd in commands) == [
+        "tests/test_insider.py::A::test_a", "tests/test_insider.py::B::test_b",
+    ]
+    # The shared work directory is gone once the logs are merged.
+    assert not os.path.exists(commands[0][commands[0].index("--worker-dir") + 1])
+    assert session.testsfailed == 2  # neither fake worker wrote results
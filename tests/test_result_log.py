@@ -0,0 +1,120 @@
+import json
+from xml.etree import ElementTree as ET
+
+import pytest
+from openpyxl import load_workbook
+
+import excel_reporter
+from result_log import (
+    JsonlSink, ResultSink, StepRecorder, merge_logs, read_events, render_excel,
+    render_junit, summarize,
+)
+
+
+STEPS = ["Open page", "Check title", "Check footer"]
+
+
+def _record(path, test, fail_at=None):
+    sink = JsonlSink(path)
+    report = StepRecorder([sink], test=test)
+    report.add_steps(STEPS)
+    for step in range(1, len(STEPS) + 1):
+        if step == fail_at:
+            report.fail_step(step, "boom")
+            break
+        report.pass_step(step, "ok")
+    sink.close()
+
+
+def test_events_are_appended_one_line_each(tmp_path):
+    log = tmp_path / "events.jsonl"
+    _record(log, "tests/test_a.py::test_a")
+
+    lines = log.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 4
+    assert json.loads(lines[0])["event"] == "steps"
+    assert json.loads(lines[-1])["status"] == "PASSED"
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    log = tmp_path / "events.jsonl"
+    _record(log, "t::a")
+    with open(log, "a", encoding="utf-8") as fh:
+        fh.write('{"event": "st')
+
+    assert len(list(read_events(log))) == 4
+
+
+def test_excel_rendered_from_merged_logs(tmp_path):
+    _record(tmp_path / "w0.jsonl", "t.py::test_one")
+    _record(tmp_path / "w1.jsonl", "t.py::test_two", fail_at=2)
+    merge_logs([tmp_path / "w0.jsonl", tmp_path / "w1.jsonl"], tmp_path / "all.jsonl")
+
+    report = render_excel(list(read_events(tmp_path / "all.jsonl")), tmp_path / "r.xlsx")
+
+    ws = report.ws
+    assert ws.cell(row=5, column=2).value == "[test_one] Open page"
+    assert ws.cell(row=9, column=3).value == "FAILED"
+    assert ws.cell(row=10, column=3).value == "Pending"
+    assert (tmp_path / "r.xlsx").exists()
+
+
+def test_step_counters_follow_status_changes(tmp_path):
+    from excel_reporter import ExcelReporter
+
+    report = ExcelReporter(tmp_path / "r.xlsx")
+    report.add_steps(STEPS)
+    report.fail_step(1, "boom")
+    report.pass_step(1, "retried")
+    report.pass_step(2, "ok")
+
+    assert report.ws.cell(row=9, column=3).value == "2 Passed"
+    assert report.ws.cell(row=9, column=4).value == "0 Failed / 1 Pending"
+
+
+def test_large_report_has_one_sheet_per_class(tmp_path):
+    log = tmp_path / "events.jsonl"
+    _record(log, "tests/test_a.py::TestOne::test_x")
+    _record(log, "tests/test_a.py::TestOne::test_y", fail_at=2)
+    _record(log, "tests/test_b.py::test_plain")
+
+    render_excel(list(read_events(log)), tmp_path / "r.xlsx", large=True)
+
+    wb = load_workbook(tmp_path / "r.xlsx")
+    assert wb.sheetnames == ["Summary", "TestOne", "test_b"]
+    rows = list(wb["TestOne"].values)
+    assert rows[0][:4] == ("#", "Test", "Test Step", "Status")
+    assert [row[3] for row in rows[1:]] == ["PASSED"] * 4 + ["FAILED", "Pending"]
+    assert list(wb["Summary"].values)[-1] == ("TOTAL", 3, 9, 7, 1, 1)
+
+
+def test_junit_and_summary_read_same_log(tmp_path):
+    log = tmp_path / "events.jsonl"
+    _record(log, "t.py::test_one")
+    _record(log, "t.py::test_two", fail_at=3)
+    events = list(read_events(log))
+
+    render_junit(events, tmp_path / "junit.xml")
+    suite = ET.parse(tmp_path / "junit.xml").getroot()
+    assert suite.get("tests") == "2"
+    assert suite.get("failures") == "1"
+
+    summary = summarize(events)
+    assert (summary["passed"], summary["failed"], summary["pending"]) == (5, 1, 0)
+
+
+def test_opening_the_report_never_fails_the_run(monkeypatch):
+    def no_opener(argv):
+        raise FileNotFoundError(argv[0])
+
+    monkeypatch.setattr(excel_reporter.sys, "platform", "linux")
+    monkeypatch.setattr(excel_reporter.subprocess, "Popen", no_opener)
+    assert excel_reporter.open_in_default_app("test_report.xlsx") is False
+
+
+def test_sink_without_emit_cannot_be_created():
+    class Incomplete(ResultSink):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,99 @@
+import json
+import os
+import time
+from types import SimpleNamespace
+
+from soak import SoakMonitor, process_rss, slope_per_hour
+
+
+class MetricsDriver:
+    """Reports a JS heap that grows by *step* MB per sample."""
+
+    def __init__(self, heap_mb=10, step=0):
+        self.heap_mb = heap_mb
+        self.step = step
+        self.service = SimpleNamespace(process=SimpleNamespace(pid=os.getpid()))
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd != "Performance.getMetrics":
+            return {}
+        self.heap_mb += self.step
+        return {"metrics": [
+            {"name": "JSHeapUsedSize", "value": self.heap_mb * 2**20},
+            {"name": "Nodes", "value": 1200},
+            {"name": "JSEventListeners", "value": 300},
+            {"name": "Documents", "value": 4},
+        ]}
+
+
+def test_slope_is_per_hour():
+    assert slope_per_hour([(0, 100), (1800, 150), (3600, 200)]) == 100
+    assert slope_per_hour([(5, 1), (5, 3)]) == 0.0
+
+
+def test_process_rss_reads_own_process():
+    rss = process_rss(os.getpid())
+    assert rss["driver_rss_mb"] > 0 and rss["browser_rss_mb"] >= 0
+    assert process_rss(-1) == {}
+
+
+def test_iterations_logged_and_browser_recycled_over_heap_limit(tmp_path):
+    monitor = SoakMonitor(tmp_path / "soak.jsonl", limits={"js_heap_mb": 40})
+    driver = MetricsDriver(heap_mb=10, step=10)
+
+    reasons = []
+    for iteration in range(1, 5):
+        monitor.begin(iteration)
+        reasons.append(monitor.sample(driver))
+        monitor.end(1.5, failed=iteration == 2)
+
+    assert reasons == [None, None, None, "js_heap_mb 50.0 > 40"]
+    lines = [json.loads(l) for l in (tmp_path / "soak.jsonl").read_text().splitlines()]
+    assert [l["js_heap_mb"] for l in lines] == [20.0, 30.0, 40.0, 50.0]
+    assert lines[0]["dom_nodes"] == 1200 and lines[0]["rss_mb"] > 0
+    summary = monitor.summary()
+    assert (summary["iterations"], summary["failures"], summary["recycles"]) == (4, 1, 1)
+
+
+def test_browser_recycled_when_memory_keeps_growing(tmp_path, monkeypatch):
+    clock = {"now": 0.0}
+    monkeypatch.setattr("soak.time", SimpleNamespace(
+        monotonic=lambda: clock["now"], strftime=time.strftime,
+    ))
+    monitor = SoakMonitor(tmp_path / "soak.jsonl")
+    driver = MetricsDriver()
+
+    growth, reasons = [], []
+    for minute in range(6):
+        clock["now"] = minute * 60.0
+        # 10 MB more every minute: 600 MB/h, over the 300 MB/h default.
+        monkeypatch.setattr("soak.process_rss", lambda pid, m=minute: {
+            "driver_rss_mb": 20.0, "browser_rss_mb": 480.0 + m * 10,
+        })
+        monitor.begin(minute + 1)
+        reasons.append(monitor.sample(driver))
+        growth.append(monitor.end(60.0, failed=False)["growth_mb_per_hour"])
+
+    assert growth[:4] == [None] * 4 and growth[4] == 600.0
+    assert reasons[4] == "growth_mb_per_hour 600.0 > 300"
+    # The replacement browser starts a new trend.
+    assert growth[5] is None and monitor.recycles == 1
+
+
+def test_trend_restarts_when_the_pool_replaces_the_browser(tmp_path, monkeypatch):
+    monkeypatch.setattr("soak.process_rss", lambda pid: {
+        "driver_rss_mb": 20.0, "browser_rss_mb": 480.0,
+    })
+    monitor = SoakMonitor(tmp_path / "soak.jsonl")
+    first, second = MetricsDriver(), MetricsDriver()
+    second.service = SimpleNamespace(process=SimpleNamespace(pid=os.getpid() + 1))
+
+    for driver in [first] * 5 + [second]:
+        monitor.begin(len(monitor.samples) + 1)
+        monitor.sample(driver)
+        monitor.end(1.0, failed=False)
+
+    growth = [s["growth_mb_per_hour"] for s in monitor.samples]
+    assert growth[4] is not None and growth[5] is None
+    assert monitor.recycles == 0
+    assert monitor.test_name("tests/test_insider.py::t") == "tests/test_insider.py::t [soak 6]"
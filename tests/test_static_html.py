@@ -0,0 +1,87 @@
+import pytest
+
+from http_archive import HttpArchive
+from local_server import serve
+from pages.base_page import BasePage
+from pages.careers_page import CareersPage
+from pages.home_page import HomePage
+from static_html import StaticHtml
+
+
+HOME = """<html><head><title>
+  Insider | AI-native platform </title></head>
+<body>
+  <nav id="navigation"><a href="/careers/">Careers</a></nav>
+  <section class="homepage-hero" style="display: none">Hero</section>
+  <footer>Footer</footer>
+</body></html>"""
+
+CAREERS = """<html><body>
+  <template><a href="/careers/open-positions/">See all QA jobs</a></template>
+  <a href="/careers/open-positions/?department=qualityassurance">
+    See all QA jobs
+  </a>
+</body></html>"""
+
+
+class TitleDriver:
+    title = "Insider (browser)"
+
+
+def test_checks_use_browser_without_backend(monkeypatch):
+    monkeypatch.setattr(StaticHtml, "active", None)
+    page = HomePage(TitleDriver())
+
+    assert page.static_document() is None
+    assert page.get_page_title(static=True) == "Insider (browser)"
+
+
+def test_pages_opt_in_to_static_checks():
+    assert HomePage.STATIC_HTML and CareersPage.STATIC_HTML
+    assert not BasePage.STATIC_HTML
+
+
+def test_locators_evaluated_against_server_html(monkeypatch):
+    pytest.importorskip("lxml.html")
+    pytest.importorskip("cssselect")
+    routes = {
+        "/": ("text/html", HOME),
+        "/careers/quality-assurance/": ("text/html", CAREERS),
+    }
+    with serve(routes) as base:
+        backend = StaticHtml()
+        monkeypatch.setattr(StaticHtml, "active", backend)
+        monkeypatch.setattr(HomePage, "URL", base + "/")
+        monkeypatch.setattr(CareersPage, "URL", base + "/careers/quality-assurance/")
+        home, careers = HomePage(None), CareersPage(None)
+
+        assert home.get_page_title(static=True) == "Insider | AI-native platform"
+        assert home.is_navbar_displayed(static=True)
+        assert home.is_footer_displayed(static=True)
+        assert not home.is_displayed(HomePage.HERO_SECTION, static=True)
+        assert careers.get_see_all_qa_jobs_href(static=True) == (
+            base + "/careers/open-positions/?department=qualityassurance"
+        )
+        assert backend.fetches == 2 and backend.failures == 0
+
+        monkeypatch.setattr(HomePage, "URL", base + "/missing")
+        assert HomePage(None).static_document() is None
+        assert backend.failures == 1
+
+
+def test_recorded_documents_keep_the_browsers_entry(tmp_path):
+    pytest.importorskip("lxml.html")
+    pytest.importorskip("cssselect")
+    archive = HttpArchive(tmp_path / "har")
+    with serve({"/": ("text/html", HOME)}) as base:
+        archive.add("GET", base + "/", 200, {}, b"<title>Browser</title>")
+        StaticHtml(archive=archive).document(base + "/")
+        assert archive.lookup("GET", base + "/")[2] == b"<title>Browser</title>"
+
+        replayed = StaticHtml(archive=archive, replay=True).document(base + "/")
+        assert replayed.title == "Insider | AI-native platform"
+        assert archive.misses == []
+
+        browser_only = base + "/careers/"
+        archive.add("GET", browser_only, 200, {}, b"<title>Careers</title>")
+        assert StaticHtml(archive=archive, replay=True).document(browser_only).title == "Careers"
@@ -0,0 +1,63 @@
+import json
+
+from wait_policy import (
+    MIN_SAMPLES, OPTIONAL_FLOOR, PROBE_EVERY, REQUIRED_FLOOR, WaitPolicy,
+)
+
+
+def test_coded_timeout_until_enough_history(tmp_path):
+    policy = WaitPolicy(tmp_path / "stats.json")
+    for _ in range(MIN_SAMPLES - 1):
+        policy.record("HomePage.NAVBAR", 0.4, False, 15)
+
+    assert policy.plan("HomePage.NAVBAR", 15) == (15, 0.5)
+
+
+def test_learned_timeouts_for_required_and_optional_waits(tmp_path):
+    policy = WaitPolicy(tmp_path / "stats.json")
+    for seconds in (0.2, 0.3, 0.4, 0.5, 1.0):
+        policy.record("HomePage.NAVBAR", seconds, False, 15)
+        policy.record("HomePage.COOKIE_ACCEPT_BTN", seconds, False, 5)
+    for _ in range(MIN_SAMPLES):
+        policy.record("OpenPositionsPage.new_tab", 5.0, True, 5)
+
+    assert policy.plan("HomePage.NAVBAR", 15) == (REQUIRED_FLOOR, 0.05)
+    assert policy.plan("HomePage.COOKIE_ACCEPT_BTN", 5, optional=True) == (2.0, 0.05)
+    assert policy.plan("OpenPositionsPage.new_tab", 5, optional=True)[0] == OPTIONAL_FLOOR
+    assert policy.plan("OpenPositionsPage.new_tab", 5)[0] == 5
+    assert WaitPolicy(adaptive=False).plan("HomePage.NAVBAR", 15) == (15, 0.5)
+
+    assert policy.session["timeouts"] == MIN_SAMPLES
+    assert policy.session["wasted"] == 5.0 * MIN_SAMPLES
+
+
+def test_timeouts_under_a_learned_timeout_are_censored_and_probed(tmp_path):
+    policy = WaitPolicy(tmp_path / "stats.json")
+    key = "HomePage.COOKIE_ACCEPT_BTN"
+    for _ in range(MIN_SAMPLES):
+        policy.record(key, 5.0, True, 5)
+    assert policy.plan(key, 5, optional=True)[0] == OPTIONAL_FLOOR
+
+    for _ in range(PROBE_EVERY - 1):
+        planned, _ = policy.plan(key, 5, optional=True)
+        policy.record(key, planned, True, 5, planned)
+    assert policy.history[key][-1] == -OPTIONAL_FLOOR
+    assert policy.plan(key, 5, optional=True)[0] == OPTIONAL_FLOOR
+
+    policy.record(key, OPTIONAL_FLOOR, True, 5, OPTIONAL_FLOOR)
+    # Probe with the coded timeout; the banner is back and the key recovers.
+    assert policy.plan(key, 5, optional=True)[0] == 5
+    policy.record(key, 1.5, False, 5, 5)
+    assert policy.plan(key, 5, optional=True)[0] == 3.0
+
+
+def test_save_merges_with_samples_written_by_other_workers(tmp_path):
+    path = tmp_path / "stats.json"
+    first, second = WaitPolicy.load(path), WaitPolicy.load(path)
+    first.record("HomePage.NAVBAR", 0.1, False, 15)
+    second.record("HomePage.NAVBAR", 0.2, True, 15)
+    first.save()
+    second.save()
+
+    assert json.loads(path.read_text()) == {"HomePage.NAVBAR": [0.1, None]}
+    assert WaitPolicy.load(path).history["HomePage.NAVBAR"] == [0.1, None]
@@ -0,0 +1,139 @@
+"""Wait timeouts and poll intervals learned from earlier runs.
+
+Every keyed wait of the page objects (see ``BasePage._wait``) reports how
+long it took, or that it timed out, to the active :class:`WaitPolicy`. The
+policy keeps the last ``HISTORY`` outcomes per key in ``.wait_stats.json``.
+Once a key has ``MIN_SAMPLES`` outcomes, the next run derives its settings
+from them:
+
+* required waits keep a wide margin: ``REQUIRED_MARGIN`` x p99, never
+  below ``REQUIRED_FLOOR`` and never above the coded timeout;
+* optional waits, where a timeout is a normal outcome (e.g. the cookie
+  banner), get ``OPTIONAL_MARGIN`` x p95. If the element never showed up
+  recently, they get ``OPTIONAL_FLOOR``;
+* the poll interval is a tenth of the median, within ``POLL_RANGE``.
+
+A wait that timed out under a learned timeout shorter than the coded one
+says nothing about whether the element would have shown up later. It is
+stored as censored, ``-timeout``, rather than as a miss (``None``). After
+``PROBE_EVERY`` censored outcomes in a row the key waits its full coded
+timeout once, so an optional wait stuck at ``OPTIONAL_FLOOR`` recovers when
+the element starts appearing again.
+
+Time spent in waits that timed out is reported as wasted at session end,
+together with what the learned timeouts saved against the coded ones.
+"""
+import json
+import os
+import threading
+
+from instrumentation import percentile
+
+
+HISTORY = 50
+MIN_SAMPLES = 5
+REQUIRED_MARGIN = 4
+REQUIRED_FLOOR = 5.0
+OPTIONAL_MARGIN = 2
+OPTIONAL_FLOOR = 0.5
+PROBE_EVERY = 10
+POLL_RANGE = (0.05, 0.5)
+DEFAULT_POLL = 0.5
+
+
+class WaitPolicy:
+    """Per-key wait history and the timeouts derived from it."""
+
+    # The session's policy, installed by conftest; None leaves waits as coded.
+    active = None
+
+    def __init__(self, path=".wait_stats.json", adaptive=True):
+        self.path = path
+        self.adaptive = adaptive
+        self.history = {}
+        self.session = {"waits": 0, "timeouts": 0, "wasted": 0.0, "saved": 0.0}
+        self.wasted_by_key = {}
+        self._new = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=".wait_stats.json", adaptive=True):
+        policy = cls(path, adaptive)
+        policy.history = _read(path)
+        return policy
+
+    def plan(self, key, timeout, optional=False):
+        """Return ``(timeout, poll_interval)`` for the wait *key*."""
+        samples = self.history.get(key, [])
+        if not self.adaptive or len(samples) < MIN_SAMPLES:
+            return timeout, DEFAULT_POLL
+        if _censored_streak(samples) >= PROBE_EVERY:
+            return timeout, DEFAULT_POLL
+        found = [s for s in samples if s is not None and s >= 0]
+        if not found:
+            return (min(OPTIONAL_FLOOR, timeout), DEFAULT_POLL) if optional \
+                else (timeout, DEFAULT_POLL)
+        if optional:
+            learned = max(OPTIONAL_FLOOR, percentile(found, 95) * OPTIONAL_MARGIN)
+        else:
+            learned = max(REQUIRED_FLOOR, percentile(found, 99) * REQUIRED_MARGIN)
+        poll = min(max(percentile(found, 50) / 10, POLL_RANGE[0]), POLL_RANGE[1])
+        return min(learned, timeout), poll
+
+    def record(self, key, seconds, timed_out, coded_timeout, timeout=None):
+        """Store one outcome.
+
+        *coded_timeout* is what the call site asked for, *timeout* what the
+        wait actually used (the planned one; defaults to the coded one).
+        """
+        timeout = coded_timeout if timeout is None else timeout
+        with self._lock:
+            self.session["waits"] += 1
+            if not timed_out:
+                sample = round(seconds, 3)
+            elif timeout < coded_timeout:
+                sample = -round(timeout, 3)
+            else:
+                sample = None
+            self._new.setdefault(key, []).append(sample)
+            self.history[key] = (self.history.get(key, []) + [sample])[-HISTORY:]
+            if timed_out:
+                self.session["timeouts"] += 1
+                self.session["wasted"] += seconds
+                self.session["saved"] += max(0.0, coded_timeout - seconds)
+                self.wasted_by_key[key] = self.wasted_by_key.get(key, 0.0) + seconds
+
+    def save(self):
+        """Merge this session's outcomes into the stats file.
+
+        The file is re-read first, so parallel workers do not drop each
+        other's samples.
+        """
+        if not self._new:
+            return
+        merged = _read(self.path)
+        for key, samples in self._new.items():
+            merged[key] = (merged.get(key, []) + samples)[-HISTORY:]
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(merged, fh, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+        self._new = {}
+
+
+def _censored_streak(samples):
+    """Number of censored timeouts at the end of *samples*."""
+    streak = 0
+    for sample in reversed(samples):
+        if sample is None or sample >= 0:
+            break
+        streak += 1
+    return streak
+
+
+def _read(path):
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}